@@ -1,13 +1,31 @@
 import sqlite3
 import json
 import os
+import sys
+import time
+import argparse
 from datetime import datetime
 
-def create_enhanced_mmel_database():
+# The MMEL JSON files loaded into the database
+MMEL_JSON_FILES = [
+    'A320MMEL.json',
+    'A330MMEL.json', 
+    'A350MMEL.json',
+    'A380MMEL.json',
+    'B38MMMEL.json',
+    'B737MMEL.json',
+    'B748MMEL.json',
+    'B74FMMEL.json',
+    'B767MMEL.json',
+    'B777MMEL.json',
+    'B787MMEL.json'
+]
+
+def create_enhanced_mmel_database(db_path='mmel_db.db', create_indexes=True):
     """Create enhanced SQLite database that preserves all MMEL entries including duplicates"""
     
     # Create database connection
-    conn = sqlite3.connect('mmel_db.db')
+    conn = sqlite3.connect(db_path)
     cursor = conn.cursor()
     
     # Create main MMEL items table with sequence number to handle duplicates
@@ -82,15 +100,26 @@ def create_enhanced_mmel_database():
         )
     ''')
     
-    # Create indexes for better performance
+    # Create indexes for better performance (bulk loads create them afterwards)
+    if create_indexes:
+        create_mmel_indexes(conn)
+    
+    conn.commit()
+    return conn
+
+def create_mmel_indexes(conn):
+    """Create the lookup indexes on mmel_items and the item id indexes on its child tables"""
+    
+    cursor = conn.cursor()
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_aircraft_type ON mmel_items (aircraft_type)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_ata_chapter ON mmel_items (ata_chapter)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_item_number ON mmel_items (item_number)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_deferral_category ON mmel_items (deferral_category)')
     cursor.execute('CREATE INDEX IF NOT EXISTS idx_aircraft_item ON mmel_items (aircraft_type, item_number)')
-    
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_maintenance_item ON maintenance_procedures (mmel_item_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_operational_item ON operational_procedures (mmel_item_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_steps_item ON remarks_steps (mmel_item_id)')
     conn.commit()
-    return conn
 
 def insert_enhanced_mmel_data(conn, json_file_path):
     """Insert MMEL data preserving all entries including duplicates"""
@@ -183,115 +212,481 @@ def insert_enhanced_mmel_data(conn, json_file_path):
         print(f"Error processing {json_file_path}: {e}")
         return 0
 
-def update_enhanced_aircraft_summary(conn):
-    """Update enhanced aircraft summary statistics"""
-    
-    cursor = conn.cursor()
+def _next_autoincrement_id(cursor, table):
+    """Next id SQLite would assign to an AUTOINCREMENT table"""
+    cursor.execute('SELECT seq FROM sqlite_sequence WHERE name = ?', (table,))
+    row = cursor.fetchone()
+    cursor.execute(f'SELECT COALESCE(MAX(id), 0) FROM {table}')
+    return max(row[0] if row else 0, cursor.fetchone()[0]) + 1
+
+def _bulk_insert_batch(cursor, mmel_data, json_file_path, sequence_numbers, known_types):
+    """Insert a batch of entries with executemany in one transaction.
     
-    # Get all aircraft types
-    cursor.execute('SELECT DISTINCT aircraft_type FROM mmel_items')
-    aircraft_types = [row[0] for row in cursor.fetchall()]
+    sequence_numbers holds the highest sequence number per (aircraft_type,
+    item_number) and is read from the database for types not in known_types
+    yet. Returns (items inserted, rows inserted).
+    """
     
+    # Current highest sequence number per (aircraft_type, item_number)
+    aircraft_types = sorted({item.get('aircraftType', '') for item in mmel_data} - known_types, key=str)
     for aircraft_type in aircraft_types:
-        # Count total items
-        cursor.execute('SELECT COUNT(*) FROM mmel_items WHERE aircraft_type = ?', (aircraft_type,))
-        total_items = cursor.fetchone()[0]
-        
-        # Count unique item numbers
-        cursor.execute('SELECT COUNT(DISTINCT item_number) FROM mmel_items WHERE aircraft_type = ?', (aircraft_type,))
-        unique_items = cursor.fetchone()[0]
-        
-        # Count by category
-        cursor.execute('SELECT COUNT(*) FROM mmel_items WHERE aircraft_type = ? AND deferral_category = ?', (aircraft_type, 'A'))
-        category_a = cursor.fetchone()[0]
-        
-        cursor.execute('SELECT COUNT(*) FROM mmel_items WHERE aircraft_type = ? AND deferral_category = ?', (aircraft_type, 'B'))
-        category_b = cursor.fetchone()[0]
+        cursor.execute('''
+            SELECT item_number, MAX(sequence_number)
+            FROM mmel_items
+            WHERE aircraft_type = ?
+            GROUP BY item_number
+        ''', (aircraft_type,))
+        for item_number, sequence_number in cursor.fetchall():
+            sequence_numbers[(aircraft_type, item_number)] = sequence_number
+        known_types.add(aircraft_type)
+    
+    mmel_item_id = _next_autoincrement_id(cursor, 'mmel_items')
+    item_rows = []
+    maintenance_rows = []
+    operational_rows = []
+    steps_rows = []
+    items_inserted = 0
+    
+    for item in mmel_data:
+        aircraft_type = item.get('aircraftType', '')
+        item_number = item.get('itemNumber', '')
+        item_row = (
+            mmel_item_id,
+            aircraft_type,
+            item.get('ataChapter', ''),
+            item_number,
+            sequence_numbers.get((aircraft_type, item_number), 0) + 1,
+            item.get('title', ''),
+            item.get('deferralCategory', ''),
+            item.get('quantityInstalled', 0),
+            item.get('quantityRequired', 0),
+            item.get('remarks', {}).get('summary', ''),
+            json_file_path
+        )
         
-        cursor.execute('SELECT COUNT(*) FROM mmel_items WHERE aircraft_type = ? AND deferral_category = ?', (aircraft_type, 'C'))
-        category_c = cursor.fetchone()[0]
+        # Rows the NOT NULL constraints would reject are skipped, as the
+        # row-by-row path does when its INSERT fails
+        if None in (item_row[1], item_row[2], item_row[3], item_row[5]):
+            print(f"Error inserting item {item.get('itemNumber', 'unknown')}: NOT NULL constraint failed")
+            continue
         
-        cursor.execute('SELECT COUNT(*) FROM mmel_items WHERE aircraft_type = ? AND deferral_category = ?', (aircraft_type, 'D'))
-        category_d = cursor.fetchone()[0]
+        item_rows.append(item_row)
+        sequence_numbers[(aircraft_type, item_number)] = item_row[4]
         
-        cursor.execute('SELECT COUNT(*) FROM mmel_items WHERE aircraft_type = ? AND (deferral_category = "" OR deferral_category IS NULL)', (aircraft_type,))
-        empty_category = cursor.fetchone()[0]
+        try:
+            for rows, procedures in (
+                (maintenance_rows, item.get('maintenanceProcedures', [])),
+                (operational_rows, item.get('operationalProcedures', [])),
+                (steps_rows, item.get('remarks', {}).get('steps', []))
+            ):
+                for i, procedure in enumerate(procedures):
+                    if procedure is None:
+                        raise sqlite3.IntegrityError("NOT NULL constraint failed")
+                    rows.append((mmel_item_id, procedure, i + 1))
+            items_inserted += 1
+        except Exception as e:
+            print(f"Error inserting item {item.get('itemNumber', 'unknown')}: {e}")
         
-        # Count items with procedures
-        cursor.execute('SELECT COUNT(DISTINCT mmel_item_id) FROM maintenance_procedures mp JOIN mmel_items mi ON mp.mmel_item_id = mi.id WHERE mi.aircraft_type = ?', (aircraft_type,))
-        items_with_maintenance = cursor.fetchone()[0]
+        mmel_item_id += 1
+    
+    with cursor.connection:
+        cursor.executemany('''
+            INSERT INTO mmel_items (
+                id, aircraft_type, ata_chapter, item_number, sequence_number, title, 
+                deferral_category, quantity_installed, quantity_required, 
+                remarks_summary, source_file
+            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+        ''', item_rows)
+        cursor.executemany('''
+            INSERT INTO maintenance_procedures (mmel_item_id, procedure_text, sequence_order)
+            VALUES (?, ?, ?)
+        ''', maintenance_rows)
+        cursor.executemany('''
+            INSERT INTO operational_procedures (mmel_item_id, procedure_text, sequence_order)
+            VALUES (?, ?, ?)
+        ''', operational_rows)
+        cursor.executemany('''
+            INSERT INTO remarks_steps (mmel_item_id, step_text, sequence_order)
+            VALUES (?, ?, ?)
+        ''', steps_rows)
+    
+    total_rows = len(item_rows) + len(maintenance_rows) + len(operational_rows) + len(steps_rows)
+    return items_inserted, total_rows
+
+def bulk_insert_enhanced_mmel_data(conn, json_file_path):
+    """Insert MMEL data with executemany batches in a single transaction.
+    
+    Produces the same rows and ids as insert_enhanced_mmel_data: sequence
+    numbers are continued from the database in memory and row ids are
+    assigned in the same order the row-by-row path would get them.
+    Returns (items inserted, rows inserted).
+    """
+    
+    cursor = conn.cursor()
+    
+    try:
+        with open(json_file_path, 'r', encoding='utf-8') as f:
+            mmel_data = json.load(f)
         
-        cursor.execute('SELECT COUNT(DISTINCT mmel_item_id) FROM operational_procedures op JOIN mmel_items mi ON op.mmel_item_id = mi.id WHERE mi.aircraft_type = ?', (aircraft_type,))
-        items_with_operational = cursor.fetchone()[0]
+        print(f"Processing {json_file_path}: {len(mmel_data)} items")
         
-        cursor.execute('SELECT COUNT(*) FROM mmel_items WHERE aircraft_type = ? AND remarks_summary != ""', (aircraft_type,))
-        items_with_remarks = cursor.fetchone()[0]
+        if not mmel_data:
+            print(f"Warning: {json_file_path} is empty")
+            return 0, 0
         
-        # Get source file
-        cursor.execute('SELECT source_file FROM mmel_items WHERE aircraft_type = ? LIMIT 1', (aircraft_type,))
-        source_file = cursor.fetchone()[0]
+        return _bulk_insert_batch(cursor, mmel_data, json_file_path, {}, set())
         
-        # Insert or update summary
-        cursor.execute('''
-            INSERT OR REPLACE INTO aircraft_summary (
-                aircraft_type, total_items, unique_item_numbers, total_category_a, 
-                total_category_b, total_category_c, total_category_d, total_empty_category,
-                items_with_maintenance_procedures, items_with_operational_procedures,
-                items_with_remarks, source_file, last_updated
-            ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CURRENT_TIMESTAMP)
-        ''', (
-            aircraft_type, total_items, unique_items, category_a, category_b, category_c, category_d,
-            empty_category, items_with_maintenance, items_with_operational, items_with_remarks, source_file
-        ))
+    except Exception as e:
+        print(f"Error processing {json_file_path}: {e}")
+        return 0, 0
+
+def insert_mmel_batches(conn, batches, source_file):
+    """Insert an iterable of entry batches (lists of entry dicts) as they arrive.
+
+    Each batch is one executemany transaction; sequence numbers continue
+    across batches and from the database as in stream_insert_mmel_jsonl.
+    Returns (items inserted, rows inserted).
+    """
+
+    cursor = conn.cursor()
+    sequence_numbers = {}
+    known_types = set()
+    items_inserted = 0
+    total_rows = 0
+    for batch in batches:
+        if batch:
+            items, rows = _bulk_insert_batch(cursor, batch, source_file, sequence_numbers, known_types)
+            items_inserted += items
+            total_rows += rows
+    return items_inserted, total_rows
+
+def stream_insert_mmel_jsonl(conn, jsonl_file_path, batch_size=1000):
+    """Insert MMEL data from a JSON Lines file (or '-' for stdin) incrementally.
     
-    conn.commit()
+    Entries are read line by line and inserted in executemany batches of
+    batch_size, one transaction each, so memory stays bounded by the batch
+    and ingestion can follow a parser writing to a pipe. Rows and ids match
+    the other loaders. Returns (items inserted, rows inserted).
+    """
+    
+    cursor = conn.cursor()
+    source_file = 'stdin' if jsonl_file_path == '-' else jsonl_file_path
+    sequence_numbers = {}
+    known_types = set()
+    items_inserted = 0
+    total_rows = 0
+    lines_read = 0
+    batch = []
+    
+    print(f"Processing {source_file}: streaming JSON Lines")
+    
+    f = sys.stdin if jsonl_file_path == '-' else open(jsonl_file_path, 'r', encoding='utf-8')
+    try:
+        for line_number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            lines_read += 1
+            try:
+                batch.append(json.loads(line))
+            except json.JSONDecodeError as e:
+                print(f"Error reading {source_file} line {line_number}: {e}")
+                continue
+            if len(batch) >= batch_size:
+                items, rows = _bulk_insert_batch(cursor, batch, source_file, sequence_numbers, known_types)
+                items_inserted += items
+                total_rows += rows
+                batch = []
+        if batch:
+            items, rows = _bulk_insert_batch(cursor, batch, source_file, sequence_numbers, known_types)
+            items_inserted += items
+            total_rows += rows
+    except Exception as e:
+        print(f"Error processing {source_file}: {e}")
+    finally:
+        if f is not sys.stdin:
+            f.close()
+    
+    if not lines_read:
+        print(f"Warning: {source_file} is empty")
+    return items_inserted, total_rows
 
-def main():
-    """Main function to process all MMEL JSON files with enhanced database"""
-    
-    # Find all MMEL JSON files
-    json_files = [
-        'A320MMEL.json',
-        'A330MMEL.json', 
-        'A350MMEL.json',
-        'A380MMEL.json',
-        'B38MMMEL.json',
-        'B737MMEL.json',
-        'B748MMEL.json',
-        'B74FMMEL.json',
-        'B767MMEL.json',
-        'B777MMEL.json',
-        'B787MMEL.json'
-    ]
+def update_enhanced_aircraft_summary(conn):
+    """Update enhanced aircraft summary statistics in one grouped pass over mmel_items"""
     
-    # Create enhanced database
-    print("Creating enhanced MMEL database...")
-    conn = create_enhanced_mmel_database()
+    cursor = conn.cursor()
     
-    total_items = 0
-    processed_files = 0
+    # Procedure item ids are collected once per table and probed per row;
+    # source_file is that of the first item inserted for the type
+    cursor.execute('''
+        INSERT OR REPLACE INTO aircraft_summary (
+            aircraft_type, total_items, unique_item_numbers, total_category_a, 
+            total_category_b, total_category_c, total_category_d, total_empty_category,
+            items_with_maintenance_procedures, items_with_operational_procedures,
+            items_with_remarks, source_file, last_updated
+        )
+        SELECT
+            mi.aircraft_type,
+            COUNT(*),
+            COUNT(DISTINCT mi.item_number),
+            SUM(CASE WHEN mi.deferral_category = 'A' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN mi.deferral_category = 'B' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN mi.deferral_category = 'C' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN mi.deferral_category = 'D' THEN 1 ELSE 0 END),
+            SUM(CASE WHEN mi.deferral_category = '' OR mi.deferral_category IS NULL THEN 1 ELSE 0 END),
+            SUM(CASE WHEN mi.id IN (SELECT mmel_item_id FROM maintenance_procedures) THEN 1 ELSE 0 END),
+            SUM(CASE WHEN mi.id IN (SELECT mmel_item_id FROM operational_procedures) THEN 1 ELSE 0 END),
+            SUM(CASE WHEN mi.remarks_summary != '' THEN 1 ELSE 0 END),
+            (SELECT first.source_file FROM mmel_items first
+             WHERE first.aircraft_type = mi.aircraft_type ORDER BY first.id LIMIT 1),
+            CURRENT_TIMESTAMP
+        FROM mmel_items mi
+        GROUP BY mi.aircraft_type
+        ORDER BY mi.aircraft_type
+    ''')
     
-    # Process each JSON file
-    for json_file in json_files:
-        if os.path.exists(json_file):
-            items_count = insert_enhanced_mmel_data(conn, json_file)
-            total_items += items_count
-            processed_files += 1
-            print(f"✅ {json_file}: {items_count} items inserted")
-        else:
-            print(f"❌ {json_file}: File not found")
+    conn.commit()
+
+# Triggers keeping aircraft_summary current as rows are inserted or deleted.
+# Procedure tables only count an item when its first procedure arrives or
+# its last one goes, which the per-table mmel_item_id index keeps cheap.
+SUMMARY_TRIGGERS = ('''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_item_insert AFTER INSERT ON mmel_items
+    BEGIN
+        INSERT OR IGNORE INTO aircraft_summary (aircraft_type, total_items, unique_item_numbers, source_file)
+        VALUES (NEW.aircraft_type, 0, 0, NEW.source_file);
+        UPDATE aircraft_summary SET
+            total_items = total_items + 1,
+            unique_item_numbers = unique_item_numbers + NOT EXISTS (
+                SELECT 1 FROM mmel_items WHERE aircraft_type = NEW.aircraft_type
+                AND item_number = NEW.item_number AND id != NEW.id),
+            total_category_a = total_category_a + (CASE WHEN NEW.deferral_category = 'A' THEN 1 ELSE 0 END),
+            total_category_b = total_category_b + (CASE WHEN NEW.deferral_category = 'B' THEN 1 ELSE 0 END),
+            total_category_c = total_category_c + (CASE WHEN NEW.deferral_category = 'C' THEN 1 ELSE 0 END),
+            total_category_d = total_category_d + (CASE WHEN NEW.deferral_category = 'D' THEN 1 ELSE 0 END),
+            total_empty_category = total_empty_category + (CASE WHEN NEW.deferral_category = '' OR NEW.deferral_category IS NULL THEN 1 ELSE 0 END),
+            items_with_maintenance_procedures = items_with_maintenance_procedures + EXISTS (
+                SELECT 1 FROM maintenance_procedures WHERE mmel_item_id = NEW.id),
+            items_with_operational_procedures = items_with_operational_procedures + EXISTS (
+                SELECT 1 FROM operational_procedures WHERE mmel_item_id = NEW.id),
+            items_with_remarks = items_with_remarks + (CASE WHEN NEW.remarks_summary != '' THEN 1 ELSE 0 END),
+            last_updated = CURRENT_TIMESTAMP
+        WHERE aircraft_type = NEW.aircraft_type;
+    END
+''', '''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_item_delete AFTER DELETE ON mmel_items
+    BEGIN
+        UPDATE aircraft_summary SET
+            total_items = total_items - 1,
+            unique_item_numbers = unique_item_numbers - NOT EXISTS (
+                SELECT 1 FROM mmel_items WHERE aircraft_type = OLD.aircraft_type
+                AND item_number = OLD.item_number),
+            total_category_a = total_category_a - (CASE WHEN OLD.deferral_category = 'A' THEN 1 ELSE 0 END),
+            total_category_b = total_category_b - (CASE WHEN OLD.deferral_category = 'B' THEN 1 ELSE 0 END),
+            total_category_c = total_category_c - (CASE WHEN OLD.deferral_category = 'C' THEN 1 ELSE 0 END),
+            total_category_d = total_category_d - (CASE WHEN OLD.deferral_category = 'D' THEN 1 ELSE 0 END),
+            total_empty_category = total_empty_category - (CASE WHEN OLD.deferral_category = '' OR OLD.deferral_category IS NULL THEN 1 ELSE 0 END),
+            items_with_maintenance_procedures = items_with_maintenance_procedures - EXISTS (
+                SELECT 1 FROM maintenance_procedures WHERE mmel_item_id = OLD.id),
+            items_with_operational_procedures = items_with_operational_procedures - EXISTS (
+                SELECT 1 FROM operational_procedures WHERE mmel_item_id = OLD.id),
+            items_with_remarks = items_with_remarks - (CASE WHEN OLD.remarks_summary != '' THEN 1 ELSE 0 END),
+            source_file = (SELECT source_file FROM mmel_items WHERE aircraft_type = OLD.aircraft_type
+                           ORDER BY id LIMIT 1),
+            last_updated = CURRENT_TIMESTAMP
+        WHERE aircraft_type = OLD.aircraft_type;
+        DELETE FROM aircraft_summary WHERE aircraft_type = OLD.aircraft_type AND total_items <= 0;
+    END
+''', '''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_item_update
+    AFTER UPDATE OF id, aircraft_type, item_number, deferral_category, remarks_summary ON mmel_items
+    BEGIN
+        UPDATE aircraft_summary SET
+            total_items = total_items - 1,
+            unique_item_numbers = unique_item_numbers - NOT EXISTS (
+                SELECT 1 FROM mmel_items WHERE aircraft_type = OLD.aircraft_type
+                AND item_number = OLD.item_number AND id != NEW.id),
+            total_category_a = total_category_a - (CASE WHEN OLD.deferral_category = 'A' THEN 1 ELSE 0 END),
+            total_category_b = total_category_b - (CASE WHEN OLD.deferral_category = 'B' THEN 1 ELSE 0 END),
+            total_category_c = total_category_c - (CASE WHEN OLD.deferral_category = 'C' THEN 1 ELSE 0 END),
+            total_category_d = total_category_d - (CASE WHEN OLD.deferral_category = 'D' THEN 1 ELSE 0 END),
+            total_empty_category = total_empty_category - (CASE WHEN OLD.deferral_category = '' OR OLD.deferral_category IS NULL THEN 1 ELSE 0 END),
+            items_with_maintenance_procedures = items_with_maintenance_procedures - EXISTS (
+                SELECT 1 FROM maintenance_procedures WHERE mmel_item_id = OLD.id),
+            items_with_operational_procedures = items_with_operational_procedures - EXISTS (
+                SELECT 1 FROM operational_procedures WHERE mmel_item_id = OLD.id),
+            items_with_remarks = items_with_remarks - (CASE WHEN OLD.remarks_summary != '' THEN 1 ELSE 0 END),
+            last_updated = CURRENT_TIMESTAMP
+        WHERE aircraft_type = OLD.aircraft_type;
+        INSERT OR IGNORE INTO aircraft_summary (aircraft_type, total_items, unique_item_numbers, source_file)
+        VALUES (NEW.aircraft_type, 0, 0, NEW.source_file);
+        UPDATE aircraft_summary SET
+            total_items = total_items + 1,
+            unique_item_numbers = unique_item_numbers + NOT EXISTS (
+                SELECT 1 FROM mmel_items WHERE aircraft_type = NEW.aircraft_type
+                AND item_number = NEW.item_number AND id != NEW.id),
+            total_category_a = total_category_a + (CASE WHEN NEW.deferral_category = 'A' THEN 1 ELSE 0 END),
+            total_category_b = total_category_b + (CASE WHEN NEW.deferral_category = 'B' THEN 1 ELSE 0 END),
+            total_category_c = total_category_c + (CASE WHEN NEW.deferral_category = 'C' THEN 1 ELSE 0 END),
+            total_category_d = total_category_d + (CASE WHEN NEW.deferral_category = 'D' THEN 1 ELSE 0 END),
+            total_empty_category = total_empty_category + (CASE WHEN NEW.deferral_category = '' OR NEW.deferral_category IS NULL THEN 1 ELSE 0 END),
+            items_with_maintenance_procedures = items_with_maintenance_procedures + EXISTS (
+                SELECT 1 FROM maintenance_procedures WHERE mmel_item_id = NEW.id),
+            items_with_operational_procedures = items_with_operational_procedures + EXISTS (
+                SELECT 1 FROM operational_procedures WHERE mmel_item_id = NEW.id),
+            items_with_remarks = items_with_remarks + (CASE WHEN NEW.remarks_summary != '' THEN 1 ELSE 0 END),
+            last_updated = CURRENT_TIMESTAMP
+        WHERE aircraft_type = NEW.aircraft_type;
+        UPDATE aircraft_summary SET
+            source_file = (SELECT source_file FROM mmel_items WHERE aircraft_type = OLD.aircraft_type
+                           ORDER BY id LIMIT 1)
+        WHERE aircraft_type = OLD.aircraft_type AND OLD.aircraft_type != NEW.aircraft_type;
+        DELETE FROM aircraft_summary WHERE aircraft_type = OLD.aircraft_type AND total_items <= 0;
+    END
+''') + tuple(
+    statement
+    for table, column in (('maintenance_procedures', 'items_with_maintenance_procedures'),
+                          ('operational_procedures', 'items_with_operational_procedures'))
+    for statement in (f'''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_{table}_insert AFTER INSERT ON {table}
+    WHEN NOT EXISTS (SELECT 1 FROM {table} WHERE mmel_item_id = NEW.mmel_item_id AND id != NEW.id)
+    BEGIN
+        UPDATE aircraft_summary SET
+            {column} = {column} + 1,
+            last_updated = CURRENT_TIMESTAMP
+        WHERE aircraft_type = (SELECT aircraft_type FROM mmel_items WHERE id = NEW.mmel_item_id);
+    END
+''', f'''
+    CREATE TRIGGER IF NOT EXISTS trg_summary_{table}_delete AFTER DELETE ON {table}
+    WHEN NOT EXISTS (SELECT 1 FROM {table} WHERE mmel_item_id = OLD.mmel_item_id)
+    BEGIN
+        UPDATE aircraft_summary SET
+            {column} = {column} - 1,
+            last_updated = CURRENT_TIMESTAMP
+        WHERE aircraft_type = (SELECT aircraft_type FROM mmel_items WHERE id = OLD.mmel_item_id);
+    END
+''')
+)
+
+def install_summary_triggers(conn):
+    """Keep aircraft_summary current from triggers instead of recomputing it.
     
-    # Update aircraft summary statistics
-    print("\nUpdating aircraft summary statistics...")
+    The summary is rebuilt once from the existing rows, then every insert
+    or delete on mmel_items and the procedure tables, and every update of
+    the counted mmel_items columns, adjusts its counters.
+    """
+    
+    cursor = conn.cursor()
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_aircraft_item ON mmel_items (aircraft_type, item_number)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_maintenance_item ON maintenance_procedures (mmel_item_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_operational_item ON operational_procedures (mmel_item_id)')
     update_enhanced_aircraft_summary(conn)
+    for statement in SUMMARY_TRIGGERS:
+        cursor.execute(statement)
+    conn.commit()
+
+def drop_summary_triggers(conn):
+    """Return to recomputing aircraft_summary with update_enhanced_aircraft_summary"""
     
-    # Display summary
-    print(f"\n🎯 ENHANCED DATABASE CREATION COMPLETE!")
-    print(f"📁 Processed files: {processed_files}")
-    print(f"📊 Total MMEL items inserted: {total_items:,}")
+    for name in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_summary_%'").fetchall():
+        conn.execute(f'DROP TRIGGER {name[0]}')
+    conn.commit()
+
+def has_summary_triggers(conn):
+    cursor = conn.execute("SELECT COUNT(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_summary_%'")
+    return cursor.fetchone()[0] == len(SUMMARY_TRIGGERS)
+
+# Full-text search over title, remarks summary and procedure text. Row ids
+# are mmel_items ids; aircraft type and ATA chapter are stored unindexed so
+# matches can be filtered without touching mmel_items.
+SEARCH_ITEM_SELECT = '''
+    SELECT mi.id, mi.title, COALESCE(mi.remarks_summary, ''),
+        COALESCE((SELECT group_concat(procedure_text, char(10)) FROM (
+            SELECT procedure_text FROM maintenance_procedures
+            WHERE mmel_item_id = mi.id ORDER BY sequence_order, id)), '') || char(10) ||
+        COALESCE((SELECT group_concat(procedure_text, char(10)) FROM (
+            SELECT procedure_text FROM operational_procedures
+            WHERE mmel_item_id = mi.id ORDER BY sequence_order, id)), ''),
+        mi.aircraft_type, mi.ata_chapter
+    FROM mmel_items mi
+'''
+
+def _search_refresh(item_id):
+    """Statements re-indexing one item, for use inside a trigger body"""
+    return f'''
+        DELETE FROM mmel_search WHERE rowid = {item_id};
+        INSERT INTO mmel_search (rowid, title, remarks, procedures, aircraft_type, ata_chapter)
+        {SEARCH_ITEM_SELECT} WHERE mi.id = {item_id};
+    '''
+
+SEARCH_TRIGGERS = (f'''
+    CREATE TRIGGER IF NOT EXISTS trg_search_item_insert AFTER INSERT ON mmel_items
+    BEGIN {_search_refresh('NEW.id')} END
+''', f'''
+    CREATE TRIGGER IF NOT EXISTS trg_search_item_update AFTER UPDATE ON mmel_items
+    BEGIN
+        DELETE FROM mmel_search WHERE rowid = OLD.id;
+        {_search_refresh('NEW.id')}
+    END
+''', '''
+    CREATE TRIGGER IF NOT EXISTS trg_search_item_delete AFTER DELETE ON mmel_items
+    BEGIN
+        DELETE FROM mmel_search WHERE rowid = OLD.id;
+    END
+''') + tuple(
+    f'''
+    CREATE TRIGGER IF NOT EXISTS trg_search_{table}_{event.lower()} AFTER {event} ON {table}
+    BEGIN {''.join(_search_refresh(item_id) for item_id in item_ids)} END
+'''
+    for table in ('maintenance_procedures', 'operational_procedures')
+    for event, item_ids in (('INSERT', ('NEW.mmel_item_id',)),
+                            ('DELETE', ('OLD.mmel_item_id',)),
+                            ('UPDATE', ('OLD.mmel_item_id', 'NEW.mmel_item_id')))
+)
+
+def create_search_index(conn):
+    """(Re)build the mmel_search FTS5 index and the triggers keeping it in sync"""
     
-    # Show aircraft summary
     cursor = conn.cursor()
+    cursor.execute('''
+        CREATE VIRTUAL TABLE IF NOT EXISTS mmel_search USING fts5 (
+            title, remarks, procedures,
+            aircraft_type UNINDEXED, ata_chapter UNINDEXED,
+            tokenize = 'porter unicode61'
+        )
+    ''')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_maintenance_item ON maintenance_procedures (mmel_item_id)')
+    cursor.execute('CREATE INDEX IF NOT EXISTS idx_operational_item ON operational_procedures (mmel_item_id)')
+    cursor.execute('DELETE FROM mmel_search')
+    cursor.execute(f'''
+        INSERT INTO mmel_search (rowid, title, remarks, procedures, aircraft_type, ata_chapter)
+        {SEARCH_ITEM_SELECT} ORDER BY mi.id
+    ''')
+    cursor.execute("INSERT INTO mmel_search (mmel_search) VALUES ('optimize')")
+    for statement in SEARCH_TRIGGERS:
+        cursor.execute(statement)
+    conn.commit()
+
+def drop_search_triggers(conn):
+    """Stop per-row index maintenance, e.g. before a load followed by create_search_index"""
+    
+    for name in conn.execute("SELECT name FROM sqlite_master WHERE type = 'trigger' AND name LIKE 'trg_search_%'").fetchall():
+        conn.execute(f'DROP TRIGGER {name[0]}')
+    conn.commit()
+
+def set_bulk_load_pragmas(conn, enabled):
+    """Trade durability for speed while loading; restore SQLite defaults afterwards"""
+    
+    if enabled:
+        conn.execute('PRAGMA journal_mode = MEMORY')
+        conn.execute('PRAGMA synchronous = OFF')
+        conn.execute('PRAGMA cache_size = -65536')
+    else:
+        conn.execute('PRAGMA journal_mode = DELETE')
+        conn.execute('PRAGMA synchronous = FULL')
+
+def print_aircraft_summary(cursor):
+    """Print the aircraft_summary table"""
+    
     cursor.execute('SELECT * FROM aircraft_summary ORDER BY aircraft_type')
     summaries = cursor.fetchall()
     
@@ -313,8 +708,10 @@ def main():
         remarks = summary[11]
         
         print(f"{aircraft_type:>8} | {total:>5} | {unique:>6} | {cat_a:>5} | {cat_b:>5} | {cat_c:>5} | {cat_d:>5} | {empty:>5} | {maint:>5} | {ops:>3} | {remarks:>7}")
+
+def print_duplicate_statistics(cursor):
+    """Print the item numbers with the most entries"""
     
-    # Show duplicate statistics
     print(f"\n📊 DUPLICATE STATISTICS:")
     cursor.execute('''
         SELECT aircraft_type, item_number, COUNT(*) as count
@@ -330,6 +727,92 @@ def main():
         print("Top items with multiple entries:")
         for aircraft, item_num, count in duplicates:
             print(f"  {aircraft} - {item_num}: {count} entries")
+
+def main(bulk=False, summary_triggers=False, jsonl_files=None):
+    """Main function to process all MMEL JSON files with enhanced database.
+    
+    jsonl_files, when given, are streamed in instead of the JSON files.
+    """
+    
+    json_files = MMEL_JSON_FILES
+    
+    # Create enhanced database
+    print("Creating enhanced MMEL database...")
+    conn = create_enhanced_mmel_database(create_indexes=not bulk)
+    
+    if summary_triggers:
+        install_summary_triggers(conn)
+        print("🔁 aircraft_summary is maintained by triggers")
+    
+    # The search index is rebuilt once after the load rather than per row
+    drop_search_triggers(conn)
+    
+    total_items = 0
+    total_rows = 0
+    processed_files = 0
+    load_start = time.perf_counter()
+    
+    if bulk:
+        set_bulk_load_pragmas(conn, True)
+    
+    # Process each JSON file
+    for json_file in jsonl_files or json_files:
+        if jsonl_files:
+            if json_file != '-' and not os.path.exists(json_file):
+                print(f"❌ {json_file}: File not found")
+                continue
+            file_start = time.perf_counter()
+            items_count, rows_count = stream_insert_mmel_jsonl(conn, json_file)
+            elapsed = time.perf_counter() - file_start
+            total_rows += rows_count
+            print(f"✅ {json_file}: {items_count} items inserted "
+                  f"({rows_count:,} rows, {rows_count / max(elapsed, 1e-9):,.0f} rows/sec)")
+            total_items += items_count
+            processed_files += 1
+        elif os.path.exists(json_file):
+            if bulk:
+                file_start = time.perf_counter()
+                items_count, rows_count = bulk_insert_enhanced_mmel_data(conn, json_file)
+                elapsed = time.perf_counter() - file_start
+                total_rows += rows_count
+                print(f"✅ {json_file}: {items_count} items inserted "
+                      f"({rows_count:,} rows, {rows_count / max(elapsed, 1e-9):,.0f} rows/sec)")
+            else:
+                items_count = insert_enhanced_mmel_data(conn, json_file)
+                print(f"✅ {json_file}: {items_count} items inserted")
+            total_items += items_count
+            processed_files += 1
+        else:
+            print(f"❌ {json_file}: File not found")
+    
+    if bulk:
+        # Building indexes once over the loaded table beats maintaining them per row
+        create_mmel_indexes(conn)
+        set_bulk_load_pragmas(conn, False)
+        load_elapsed = time.perf_counter() - load_start
+        print(f"⚡ Bulk load: {total_rows:,} rows in {load_elapsed:.2f}s "
+              f"({total_rows / max(load_elapsed, 1e-9):,.0f} rows/sec)")
+    
+    # Update aircraft summary statistics (already current when triggers maintain it)
+    if not has_summary_triggers(conn):
+        print("\nUpdating aircraft summary statistics...")
+        update_enhanced_aircraft_summary(conn)
+    
+    # Rebuild the full-text search index
+    print("Building full-text search index...")
+    search_start = time.perf_counter()
+    create_search_index(conn)
+    indexed = conn.execute('SELECT COUNT(*) FROM mmel_search').fetchone()[0]
+    print(f"🔎 Indexed {indexed:,} items for search in {time.perf_counter() - search_start:.2f}s")
+    
+    # Display summary
+    print(f"\n🎯 ENHANCED DATABASE CREATION COMPLETE!")
+    print(f"📁 Processed files: {processed_files}")
+    print(f"📊 Total MMEL items inserted: {total_items:,}")
+    
+    cursor = conn.cursor()
+    print_aircraft_summary(cursor)
+    print_duplicate_statistics(cursor)
     
     # Close database connection
     conn.close()
@@ -339,4 +822,16 @@ def main():
     print(f"🔍 Use sequence_number column to distinguish between duplicate item numbers")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Build mmel_db.db from the MMEL JSON files")
+    parser.add_argument("--bulk", action="store_true",
+                        help="load with executemany batches, one transaction per file and "
+                             "indexes built after the load")
+    parser.add_argument("--summary-triggers", action="store_true",
+                        help="install triggers that keep aircraft_summary current on every "
+                             "insert and delete instead of recomputing it after the load")
+    parser.add_argument("--jsonl", nargs="+", metavar="FILE",
+                        help="stream these JSON Lines files instead of the MMEL JSON files, in "
+                             "bounded batches; '-' reads stdin, e.g. from mmel_parser.py --jsonl")
+    args = parser.parse_args()
+    
+    main(bulk=args.bulk, summary_triggers=args.summary_triggers, jsonl_files=args.jsonl)
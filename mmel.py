@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""Single entry point for the MMEL tools: `mmel <command> [options]`.
+
+Each command runs one of the scripts as if it had been started directly
+(`mmel query ...` is `python search_mmel.py ...`, with the same options and
+--help). Nothing is imported until the command is known, and then only that
+script's module: `mmel query` never loads PyMuPDF and starts in tens of
+milliseconds, while `mmel parse` pays for it as before.
+"""
+import os
+import runpy
+import sys
+
+# Command words -> (module, description); run with `mmel <command> --help` for options
+COMMANDS = {
+    ("parse",): ("mmel_parser", "parse one MMEL PDF into JSON"),
+    ("pipeline",): ("mmel_pipeline", "parse one PDF with extraction, parsing and writing overlapped"),
+    ("batch",): ("mmel_batch", "parse a directory or manifest of PDFs concurrently"),
+    ("sniff",): ("mmel_sniff", "detect the format and aircraft type of PDFs"),
+    ("revision",): ("mmel_revision", "re-parse only the chapters changed in a new revision"),
+    ("db", "build"): ("create_enhanced_database", "build mmel_db.db from the MMEL JSON files"),
+    ("db", "verify"): ("verify_enhanced_database", "check the contents of mmel_db.db"),
+    ("db", "shards"): ("mmel_shards", "build per-aircraft shard databases and query them as one"),
+    ("query",): ("search_mmel", "full-text search over mmel_db.db"),
+    ("equivalents",): ("mmel_equivalents", "build or show equivalent items across aircraft types"),
+    ("catalog",): ("mmel_catalog", "load the JSON outputs into memory and query them"),
+    ("serve",): ("mmel_service", "serve mmel_db.db over HTTP/JSON"),
+    ("bench",): ("mmel_benchmark", "benchmark the corpus against the golden outputs"),
+}
+
+
+def usage() -> str:
+    lines = ["usage: mmel <command> [options]", "", "commands:"]
+    for words, (_, description) in COMMANDS.items():
+        lines.append(f"  {' '.join(words):<14}{description}")
+    lines += ["", "Run `mmel <command> --help` for the options of a command."]
+    return "\n".join(lines)
+
+
+def find_command(argv):
+    """(command words, module) for the longest command argv starts with"""
+    for length in (2, 1):
+        words = tuple(argv[:length])
+        if words in COMMANDS:
+            return words, COMMANDS[words][0]
+    return None, None
+
+
+def main(argv=None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return 0
+    words, module = find_command(argv)
+    if module is None:
+        print(usage(), file=sys.stderr)
+        print(f"\nmmel: unknown command {' '.join(argv[:2])!r}", file=sys.stderr)
+        return 2
+
+    # The scripts import each other as top-level modules
+    here = os.path.dirname(os.path.realpath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+    # alter_sys makes the script __main__ for the run (argv[0] becomes its
+    # path), so process pools started by it can find its functions
+    sys.argv = [module] + argv[len(words):]
+    runpy.run_module(module, run_name="__main__", alter_sys=True)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
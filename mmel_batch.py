@@ -0,0 +1,255 @@
+"""Parse a whole corpus of MMEL PDFs concurrently.
+
+The corpus is either a manifest (a JSON list of {"pdf", "aircraft_type",
+"output"} objects, paths relative to the manifest) or a directory. A
+directory uses its mmel_manifest.json when present; otherwise every PDF in
+it is matched to an ICAO type from its file name, or from its first item
+pages (mmel_sniff), and written to <TYPE>MMEL.json, or to <PDF name>_MMEL.json
+when several PDFs share the type. A manifest type of "auto" is detected the
+same way. Jobs that would write the same output are rejected.
+
+Files are spread over a process pool, largest first, so regenerating the
+fleet takes about as long as the slowest manual. Each PDF is checked
+against its aircraft type's format before the full parse.
+"""
+import argparse
+import json
+import os
+import re
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from mmel_cache import CACHE_DIR_ENV_VAR, DEFAULT_MAX_BYTES, MMELCache
+from mmel_filters import load_filter_profiles
+from mmel_parser import convert_pdf
+from mmel_sniff import check_aircraft_type, detect_aircraft_type
+
+MANIFEST_NAME = "mmel_manifest.json"
+
+# File name patterns for directories without a manifest, checked in order
+AIRCRAFT_TYPE_PATTERNS = [
+    (re.compile(r"A-?320", re.IGNORECASE), "A320"),
+    (re.compile(r"A-?330", re.IGNORECASE), "A330"),
+    (re.compile(r"A-?350", re.IGNORECASE), "A350"),
+    (re.compile(r"A-?380", re.IGNORECASE), "A380"),
+    (re.compile(r"B-?737.*MAX", re.IGNORECASE), "B38M"),
+    (re.compile(r"B-?737", re.IGNORECASE), "B737"),
+    (re.compile(r"B-?747-8", re.IGNORECASE), "B748"),
+    (re.compile(r"B-?747-400", re.IGNORECASE), "B747-400"),
+    (re.compile(r"B-?767", re.IGNORECASE), "B767"),
+    (re.compile(r"B-?777", re.IGNORECASE), "B777"),
+    (re.compile(r"B-?787", re.IGNORECASE), "B787"),
+]
+
+
+def infer_aircraft_type(pdf_name: str) -> Optional[str]:
+    for pattern, aircraft_type in AIRCRAFT_TYPE_PATTERNS:
+        if pattern.search(pdf_name):
+            return aircraft_type
+    return None
+
+
+def _default_outputs(jobs: List[Dict], directory: Path):
+    """Fill in <TYPE>MMEL.json outputs; PDFs sharing a type (the B-747-400
+    passenger and LCF manuals) are named after the PDF instead"""
+    types = Counter(job["aircraft_type"] for job in jobs if not job["output"])
+    for job in jobs:
+        if not job["output"]:
+            name = (f"{job['aircraft_type']}MMEL.json" if types[job["aircraft_type"]] == 1
+                    else f"{Path(job['pdf']).stem}_MMEL.json")
+            job["output"] = str(directory / name)
+
+
+def check_outputs(jobs: List[Dict]):
+    """Raise ValueError when two jobs would write the same output file"""
+    writers: Dict[str, str] = {}
+    for job in jobs:
+        if job.get("error"):
+            continue
+        output = os.path.abspath(job["output"])
+        if output in writers:
+            raise ValueError(f"{Path(writers[output]).name} and {Path(job['pdf']).name} would both write "
+                             f"{job['output']}; give them different outputs in the manifest")
+        writers[output] = job["pdf"]
+
+
+def load_manifest(manifest_path: str) -> List[Dict]:
+    """Read a manifest and resolve its paths relative to the manifest file.
+
+    An "auto" type that cannot be detected fails that job only: it keeps
+    the type "auto" and carries the reason in "error".
+    """
+    base = Path(manifest_path).parent
+    with open(manifest_path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+
+    jobs = []
+    for entry in entries:
+        aircraft_type = entry.get("aircraft_type", "auto")
+        error = ""
+        if aircraft_type == "auto":
+            try:
+                aircraft_type = detect_aircraft_type(str(base / entry["pdf"]))["aircraft_type"]
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+        jobs.append({
+            "pdf": str(base / entry["pdf"]),
+            "aircraft_type": aircraft_type,
+            "output": str(base / entry["output"]) if entry.get("output") else "",
+            "error": error,
+        })
+    _default_outputs(jobs, base)
+    check_outputs(jobs)
+    return jobs
+
+
+def discover_jobs(directory: str) -> List[Dict]:
+    """Jobs for every PDF in a directory whose type can be inferred"""
+    manifest = Path(directory) / MANIFEST_NAME
+    if manifest.exists():
+        return load_manifest(str(manifest))
+
+    jobs = []
+    for pdf in sorted(Path(directory).glob("*.pdf")):
+        aircraft_type = infer_aircraft_type(pdf.name)
+        if aircraft_type is None:
+            # Not in the file name: read it from the first item pages
+            try:
+                aircraft_type = detect_aircraft_type(str(pdf))["aircraft_type"]
+            except ValueError as e:
+                print(f"Skipping {pdf.name}: {e}; add it to {MANIFEST_NAME}")
+                continue
+        jobs.append({
+            "pdf": str(pdf),
+            "aircraft_type": aircraft_type,
+            "output": "",
+        })
+    _default_outputs(jobs, Path(directory))
+    check_outputs(jobs)
+    return jobs
+
+
+_worker_cache: Optional[MMELCache] = None
+_worker_check_types = True
+
+
+def _init_worker(profile_files: List[str], cache_dir: Optional[str], check_types: bool = True,
+                 cache_bytes: int = DEFAULT_MAX_BYTES):
+    global _worker_cache, _worker_check_types
+    for profiles_file in profile_files:
+        load_filter_profiles(profiles_file)
+    if cache_dir:
+        _worker_cache = MMELCache(cache_dir, cache_bytes)
+    _worker_check_types = check_types
+
+
+def _run_job(job: Dict) -> Dict:
+    """Worker: convert one PDF and report its item count and timing.
+
+    The type is checked against the PDF's first item pages first, so a
+    wrong type fails in a fraction of a second instead of after a full parse.
+    """
+    result = dict(job, items=0, seconds=0.0, error=job.get("error", ""))
+    if result["error"]:
+        # Failed before it reached the pool (type detection)
+        return result
+    start = time.perf_counter()
+    try:
+        if _worker_check_types:
+            mismatch = check_aircraft_type(job["pdf"], job["aircraft_type"])
+            if mismatch:
+                raise ValueError(mismatch)
+        result["items"] = convert_pdf(job["pdf"], job["output"], job["aircraft_type"],
+                                      cache=_worker_cache)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["seconds"] = time.perf_counter() - start
+    return result
+
+
+def run_batch(jobs: List[Dict], workers: Optional[int] = None,
+              profile_files: Optional[List[str]] = None,
+              cache_dir: Optional[str] = None, check_types: bool = True,
+              cache_bytes: int = DEFAULT_MAX_BYTES) -> List[Dict]:
+    """Convert all jobs on a process pool and return results in job order"""
+    if not jobs:
+        return []
+    workers = workers or os.cpu_count() or 1
+    profile_files = profile_files or []
+
+    # Largest manuals first so the slowest one is not scheduled last
+    order = sorted(range(len(jobs)), key=lambda n: os.path.getsize(jobs[n]["pdf"])
+                   if os.path.exists(jobs[n]["pdf"]) else 0, reverse=True)
+    results: List[Optional[Dict]] = [None] * len(jobs)
+    with ProcessPoolExecutor(max_workers=min(workers, len(jobs)), initializer=_init_worker,
+                             initargs=(profile_files, cache_dir, check_types, cache_bytes)) as pool:
+        futures = {pool.submit(_run_job, jobs[n]): n for n in order}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+    return results
+
+
+def print_report(results: List[Dict], wall_seconds: float):
+    name_width = max([len(Path(r["pdf"]).name) for r in results] + [4])
+    print(f"{'File':<{name_width}} | Type     | Items | Time (s) | Output")
+    print("-" * (name_width + 45))
+    for r in results:
+        status = r["error"] or Path(r["output"]).name
+        print(f"{Path(r['pdf']).name:<{name_width}} | {r['aircraft_type']:<8} | "
+              f"{r['items']:>5} | {r['seconds']:>8.2f} | {status}")
+    print("-" * (name_width + 45))
+    total_items = sum(r["items"] for r in results)
+    cpu_seconds = sum(r["seconds"] for r in results)
+    failed = sum(1 for r in results if r["error"])
+    print(f"{len(results)} files, {total_items} items, {failed} failed; "
+          f"wall {wall_seconds:.2f}s vs {cpu_seconds:.2f}s sequential")
+
+
+def main(corpus: str, workers: Optional[int] = None, profile_files: Optional[List[str]] = None,
+         cache_dir: Optional[str] = None, check_types: bool = True,
+         cache_bytes: int = DEFAULT_MAX_BYTES) -> int:
+    try:
+        jobs = discover_jobs(corpus) if os.path.isdir(corpus) else load_manifest(corpus)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return 1
+    if not jobs:
+        print(f"No MMEL PDFs found in {corpus}")
+        return 1
+
+    print(f"Parsing {len(jobs)} MMEL PDFs with {workers or os.cpu_count()} workers")
+    start = time.perf_counter()
+    results = run_batch(jobs, workers=workers, profile_files=profile_files, cache_dir=cache_dir,
+                        check_types=check_types, cache_bytes=cache_bytes)
+    print_report(results, time.perf_counter() - start)
+    return 1 if any(r["error"] for r in results) else 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Parse a directory or manifest of MMEL PDFs concurrently",
+        epilog="Example: python mmel_batch.py mmel_manifest.json --workers 4")
+    parser.add_argument("corpus", help="directory of PDFs or manifest JSON file")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="number of files parsed in parallel (default: CPU count)")
+    parser.add_argument("--filter-profiles", metavar="FILE", action="append", default=[],
+                        help="extra filter profile JSON file layered over filter_profiles.json")
+    parser.add_argument("--cache-dir", default=os.environ.get(CACHE_DIR_ENV_VAR),
+                        help=f"reuse extracted text and parse results from this cache "
+                             f"(default: ${CACHE_DIR_ENV_VAR}, unset disables caching)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        metavar="MB", help="cache size cap before LRU eviction, applied by every worker "
+                                           "(default: %(default)s)")
+    parser.add_argument("--no-type-check", action="store_true",
+                        help="skip checking each PDF's first item pages against its aircraft type")
+    args = parser.parse_args()
+
+    for profiles_file in args.filter_profiles:
+        load_filter_profiles(profiles_file)
+
+    raise SystemExit(main(args.corpus, workers=args.workers, profile_files=args.filter_profiles,
+                          cache_dir=args.cache_dir, check_types=not args.no_type_check,
+                          cache_bytes=args.cache_size * 1024 * 1024))
@@ -0,0 +1,333 @@
+"""Corpus benchmark: extraction, parsing and database build throughput.
+
+Every manual of a manifest (mmel_manifest.json lists the bundled corpus) is
+timed through text extraction (pages/sec, lines/sec) and its format's
+parser (parse_mmel_entries, parse_a380_mmel_entries or
+parse_b747_400_mmel_entries; lines/sec, entries/sec), and the parsed
+entries are diffed against the manifest output, which is the golden JSON.
+The database build bulk-loads the golden files into a scratch database and
+reports entries/sec. Each stage runs in a fresh process, so the peak RSS
+reported is that stage's own.
+
+Runs are appended to a JSON Lines history. A throughput that falls more
+than --threshold below the median of the last --baseline-runs runs fails
+the benchmark, as does any difference from a golden file.
+"""
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+import fitz  # PyMuPDF
+
+from mmel_batch import MANIFEST_NAME, discover_jobs, load_manifest
+from mmel_entry import to_dicts
+from mmel_filters import load_filter_profiles
+from mmel_parser import extract_text_from_pdf, extraction_options, select_parser
+from mmel_revision import diff_entries
+
+HISTORY_FILE = "benchmark_history.jsonl"
+
+# Throughputs checked for regressions, per manual and for the database build
+FILE_METRICS = ("pages_per_sec", "lines_per_sec", "parse_lines_per_sec", "entries_per_sec")
+DATABASE_METRICS = ("entries_per_sec",)
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process in MB (0 where unsupported)"""
+    if resource is None:
+        return 0.0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KB, macOS bytes
+    return peak / (1024 * 1024 if platform.system() == "Darwin" else 1024)
+
+
+def _best_of(fn, repeat: int):
+    """(best seconds, last result) of repeat calls"""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+def _init_worker(profile_files: List[str]):
+    for profiles_file in profile_files:
+        load_filter_profiles(profiles_file)
+
+
+def bench_file(job: Dict, repeat: int = 3) -> Dict:
+    """Extraction and parse timings of one manual, diffed against its golden output"""
+    pdf_path, aircraft_type = job["pdf"], job["aircraft_type"]
+    result = {"pdf": Path(pdf_path).name, "aircraft_type": aircraft_type, "error": job.get("error", "")}
+    if result["error"]:
+        # Failed before it was benchmarked (type detection)
+        return result
+    try:
+        with fitz.open(pdf_path) as doc:
+            pages = doc.page_count
+        options = extraction_options(aircraft_type)
+        extract_seconds, text = _best_of(lambda: extract_text_from_pdf(pdf_path, options=options), repeat)
+        lines = len(text.splitlines())
+        parser = select_parser(aircraft_type)
+        parse_seconds, entries = _best_of(lambda: parser(text, aircraft_type), repeat)
+    except Exception as e:
+        result["error"] = f"{type(e).__name__}: {e}"
+        return result
+
+    result.update({
+        "parser": parser.__name__,
+        "pages": pages,
+        "lines": lines,
+        "entries": len(entries),
+        "extract_seconds": extract_seconds,
+        "parse_seconds": parse_seconds,
+        "pages_per_sec": pages / extract_seconds,
+        "lines_per_sec": lines / extract_seconds,
+        "parse_lines_per_sec": lines / parse_seconds,
+        "entries_per_sec": len(entries) / parse_seconds,
+        "peak_rss_mb": peak_rss_mb(),
+        "golden": None,
+    })
+
+    golden_path = job["output"]
+    if os.path.exists(golden_path):
+        with open(golden_path, "r", encoding="utf-8") as f:
+            golden = json.load(f)
+        diff = diff_entries(golden, to_dicts(entries))
+        result["golden"] = {"file": Path(golden_path).name,
+                            "added": sorted(diff["added"]), "removed": sorted(diff["removed"]),
+                            "changed": sorted(diff["changed"])}
+    return result
+
+
+def bench_database(golden_paths: List[str]) -> Dict:
+    """Bulk-load the golden outputs into a scratch database, as
+    create_enhanced_database.py --bulk does"""
+    from create_enhanced_database import (bulk_insert_enhanced_mmel_data, create_enhanced_mmel_database,
+                                          create_mmel_indexes, create_search_index, drop_search_triggers,
+                                          set_bulk_load_pragmas, update_enhanced_aircraft_summary)
+
+    with tempfile.TemporaryDirectory() as scratch:
+        conn = create_enhanced_mmel_database(os.path.join(scratch, "mmel_db.db"), create_indexes=False)
+        drop_search_triggers(conn)
+        items = rows = 0
+        start = time.perf_counter()
+        # The loader reports every file; only the timing is of interest here
+        with contextlib.redirect_stdout(io.StringIO()):
+            set_bulk_load_pragmas(conn, True)
+            for path in golden_paths:
+                file_items, file_rows = bulk_insert_enhanced_mmel_data(conn, path)
+                items += file_items
+                rows += file_rows
+            create_mmel_indexes(conn)
+            set_bulk_load_pragmas(conn, False)
+            update_enhanced_aircraft_summary(conn)
+            create_search_index(conn)
+        seconds = time.perf_counter() - start
+        conn.close()
+    return {"files": len(golden_paths), "entries": items, "rows": rows, "seconds": seconds,
+            "entries_per_sec": items / seconds, "peak_rss_mb": peak_rss_mb()}
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=Path(__file__).parent, check=True).stdout.strip() or None
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def load_history(path: str) -> List[Dict]:
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def append_history(path: str, record: Dict):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+
+def find_regressions(record: Dict, history: List[Dict], threshold: float,
+                     baseline_runs: int = 5) -> List[str]:
+    """Metrics more than threshold (a fraction) below the median of the
+    same metric over the last baseline_runs runs"""
+    def baseline(values: List[float]) -> Optional[float]:
+        values = values[-baseline_runs:]
+        return statistics.median(values) if values else None
+
+    def check(label: str, current: Dict, previous: List[Dict], metrics):
+        for metric in metrics:
+            median = baseline([p[metric] for p in previous if p.get(metric)])
+            if median and current.get(metric) is not None and current[metric] < median * (1 - threshold):
+                regressions.append(f"{label} {metric}: {current[metric]:,.0f} vs median "
+                                   f"{median:,.0f} ({current[metric] / median - 1:+.0%})")
+
+    regressions: List[str] = []
+    for current in record["files"]:
+        if current["error"]:
+            continue
+        previous = [f for run in history for f in run.get("files", [])
+                    if f["pdf"] == current["pdf"] and not f["error"]]
+        check(current["pdf"], current, previous, FILE_METRICS)
+    if record.get("database"):
+        check("database", record["database"],
+              [run["database"] for run in history if run.get("database")], DATABASE_METRICS)
+    return regressions
+
+
+def run_benchmark(jobs: List[Dict], repeat: int = 3, database: bool = True,
+                  profile_files: Optional[List[str]] = None) -> Dict:
+    """Benchmark every job, one fresh process per manual, and the database build"""
+    # spawn: forked workers would inherit the parent's peak RSS
+    context = multiprocessing.get_context("spawn")
+    with context.Pool(1, initializer=_init_worker, initargs=(profile_files or [],),
+                      maxtasksperchild=1) as pool:
+        files = []
+        for job in jobs:
+            result = pool.apply(bench_file, (job, repeat))
+            files.append(result)
+            if result["error"]:
+                print(f"❌ {result['pdf']}: {result['error']}")
+            else:
+                print(f"⏱️  {result['pdf']}: {result['entries']:,} entries, "
+                      f"extract {result['extract_seconds']:.2f}s, parse {result['parse_seconds']:.2f}s")
+        goldens = [job["output"] for job in jobs if not job.get("error") and os.path.exists(job["output"])]
+        db = pool.apply(bench_database, (goldens,)) if database and goldens else None
+
+    return {
+        "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "commit": _git_commit(),
+        "python": platform.python_version(),
+        "fitz": fitz.VersionBind,
+        "machine": platform.node(),
+        "repeat": repeat,
+        "files": files,
+        "database": db,
+    }
+
+
+def print_results(record: Dict):
+    files = record["files"]
+    name_width = max([len(f["pdf"]) for f in files] + [4])
+    print(f"\n{'File':<{name_width}} | Type     | Pages/s | Lines/s | Parse lines/s | Entries/s | "
+          f"Peak MB | Golden")
+    print("-" * (name_width + 87))
+    for f in files:
+        if f["error"]:
+            print(f"{f['pdf']:<{name_width}} | {f['aircraft_type']:<8} | {f['error']}")
+            continue
+        golden = f["golden"]
+        if golden is None:
+            status = "no golden"
+        elif golden["added"] or golden["removed"] or golden["changed"]:
+            status = (f"❌ +{len(golden['added'])} -{len(golden['removed'])} "
+                      f"~{len(golden['changed'])}")
+        else:
+            status = "✅"
+        print(f"{f['pdf']:<{name_width}} | {f['aircraft_type']:<8} | {f['pages_per_sec']:>7,.0f} | "
+              f"{f['lines_per_sec']:>7,.0f} | {f['parse_lines_per_sec']:>13,.0f} | "
+              f"{f['entries_per_sec']:>9,.0f} | {f['peak_rss_mb']:>7.0f} | {status}")
+    db = record["database"]
+    if db:
+        print(f"🗄️  Database build: {db['entries']:,} entries ({db['rows']:,} rows) from {db['files']} files in "
+              f"{db['seconds']:.2f}s ({db['entries_per_sec']:,.0f} entries/sec, "
+              f"peak {db['peak_rss_mb']:.0f} MB)")
+
+
+def golden_mismatches(record: Dict) -> List[str]:
+    mismatches = []
+    for f in record["files"]:
+        golden = f.get("golden")
+        if golden and (golden["added"] or golden["removed"] or golden["changed"]):
+            items = (golden["added"] + golden["removed"] + golden["changed"])[:5]
+            mismatches.append(f"{f['pdf']} differs from {golden['file']}: {', '.join(items)}"
+                              + (" ..." if len(items) == 5 else ""))
+    return mismatches
+
+
+def main(corpus: str = MANIFEST_NAME, repeat: int = 3, history_path: str = HISTORY_FILE,
+         threshold: float = 0.10, baseline_runs: int = 5, database: bool = True,
+         record_history: bool = True, profile_files: Optional[List[str]] = None) -> int:
+    jobs = discover_jobs(corpus) if os.path.isdir(corpus) else load_manifest(corpus)
+    missing = [job for job in jobs if not os.path.exists(job["pdf"])]
+    for job in missing:
+        print(f"Skipping {Path(job['pdf']).name}: not found")
+    jobs = [job for job in jobs if job not in missing]
+    if not jobs:
+        print(f"No MMEL PDFs found in {corpus}")
+        return 1
+
+    print(f"Benchmarking {len(jobs)} MMEL PDFs, best of {repeat}")
+    record = run_benchmark(jobs, repeat=repeat, database=database, profile_files=profile_files)
+    print_results(record)
+
+    history = load_history(history_path)
+    regressions = find_regressions(record, history, threshold, baseline_runs)
+    mismatches = golden_mismatches(record)
+    errors = [f"{f['pdf']}: {f['error']}" for f in record["files"] if f["error"]]
+    if record_history:
+        append_history(history_path, record)
+        print(f"📝 Run {len(history) + 1} recorded in {history_path}")
+
+    for problem in errors + mismatches:
+        print(f"❌ {problem}")
+    for regression in regressions:
+        print(f"📉 {regression}")
+    if errors or mismatches or regressions:
+        return 1
+    print(f"✅ Golden outputs match" + (f"; no throughput regression beyond {threshold:.0%}"
+                                        if history else ""))
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Benchmark extraction, parsing and the database build over an MMEL corpus and "
+                    "check the results against the golden JSON outputs",
+        epilog="Example: python mmel_benchmark.py mmel_manifest.json --repeat 5 --threshold 0.15")
+    parser.add_argument("corpus", nargs="?", default=MANIFEST_NAME,
+                        help=f"manifest JSON file or directory of PDFs (default: {MANIFEST_NAME}); "
+                             f"each manifest output is that manual's golden JSON")
+    parser.add_argument("--repeat", type=int, default=3,
+                        help="timing runs per stage, best is reported (default: 3)")
+    parser.add_argument("--history", default=HISTORY_FILE,
+                        help=f"JSON Lines file runs are appended to (default: {HISTORY_FILE})")
+    parser.add_argument("--no-record", action="store_true",
+                        help="compare against the history without appending this run")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="fail when a throughput drops by more than this fraction of its "
+                             "baseline (default: 0.10)")
+    parser.add_argument("--baseline-runs", type=int, default=5,
+                        help="the baseline is the median of this many previous runs (default: 5)")
+    parser.add_argument("--no-database", action="store_true", help="skip the database build")
+    parser.add_argument("--filter-profiles", metavar="FILE", action="append", default=[],
+                        help="extra filter profile JSON file layered over filter_profiles.json")
+    args = parser.parse_args()
+
+    for profiles_file in args.filter_profiles:
+        load_filter_profiles(profiles_file)
+
+    raise SystemExit(main(args.corpus, repeat=args.repeat, history_path=args.history,
+                          threshold=args.threshold, baseline_runs=args.baseline_runs,
+                          database=not args.no_database, record_history=not args.no_record,
+                          profile_files=args.filter_profiles))
@@ -0,0 +1,209 @@
+"""Content-addressed on-disk cache for extracted text and parse results.
+
+Level 1 holds the extracted text of a PDF, keyed by the PDF's SHA-256 and
+the extraction settings. Level 2 holds the serialized JSON output, keyed by
+the SHA-256 of that text, the parser version, the aircraft type and the
+filter profile. Changing parser code therefore only invalidates level 2,
+and re-running an unchanged PDF is an index lookup plus a file copy.
+
+Blobs live under <cache_dir>/objects and an SQLite index tracks their size
+and last use; the least recently used blobs are evicted once the cache
+grows past its size cap. The index is in WAL mode and waits for the lock,
+so the processes of a batch can share one cache.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Optional, Tuple
+
+DEFAULT_MAX_BYTES = 1024 * 1024 * 1024
+CACHE_DIR_ENV_VAR = "MMEL_CACHE_DIR"
+BUSY_TIMEOUT_SECONDS = 60  # wait for other processes' index writes instead of "database is locked"
+
+# Source files whose contents define the parser version
+_PARSER_SOURCES = ("mmel_parser.py", "mmel_grammar.py", "mmel_filters.py", "mmel_entry.py")
+
+
+def sha256_bytes(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def parser_version() -> str:
+    """Hash of the parser sources, so editing parse logic invalidates level 2"""
+    digest = hashlib.sha256()
+    base = Path(__file__).parent
+    for name in _PARSER_SOURCES:
+        path = base / name
+        if path.exists():
+            digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _key(*parts: str) -> str:
+    return sha256_bytes("\0".join(parts).encode("utf-8"))
+
+
+class MMELCache:
+    """Two-level LRU cache of extracted text and parsed JSON output"""
+
+    def __init__(self, cache_dir: str, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.cache_dir = Path(cache_dir)
+        self.objects_dir = self.cache_dir / "objects"
+        self.objects_dir.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self.conn = sqlite3.connect(str(self.cache_dir / "index.db"), timeout=BUSY_TIMEOUT_SECONDS)
+        # Readers do not block the writer, and writers queue on the busy timeout
+        self.conn.execute('PRAGMA journal_mode = WAL')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS blobs (
+                key TEXT PRIMARY KEY,
+                level INTEGER NOT NULL,
+                size INTEGER NOT NULL,
+                content_hash TEXT,
+                item_count INTEGER,
+                last_used REAL NOT NULL
+            )
+        ''')
+        self.conn.execute('''
+            CREATE TABLE IF NOT EXISTS file_hashes (
+                path TEXT PRIMARY KEY,
+                size INTEGER NOT NULL,
+                mtime_ns INTEGER NOT NULL,
+                sha256 TEXT NOT NULL
+            )
+        ''')
+        self.conn.execute('CREATE INDEX IF NOT EXISTS idx_blobs_last_used ON blobs (last_used)')
+        self.conn.commit()
+        self._parser_version = None
+
+    def close(self):
+        self.conn.close()
+
+    @property
+    def parser_version(self) -> str:
+        if self._parser_version is None:
+            self._parser_version = parser_version()
+        return self._parser_version
+
+    def pdf_hash(self, pdf_path: str) -> str:
+        """SHA-256 of a PDF, remembered by path, size and mtime"""
+        stat = os.stat(pdf_path)
+        path = os.path.abspath(pdf_path)
+        row = self.conn.execute('SELECT size, mtime_ns, sha256 FROM file_hashes WHERE path = ?',
+                                (path,)).fetchone()
+        if row and row[0] == stat.st_size and row[1] == stat.st_mtime_ns:
+            return row[2]
+        digest = file_sha256(pdf_path)
+        self.conn.execute('INSERT OR REPLACE INTO file_hashes (path, size, mtime_ns, sha256) VALUES (?, ?, ?, ?)',
+                          (path, stat.st_size, stat.st_mtime_ns, digest))
+        self.conn.commit()
+        return digest
+
+    # Level 1: extracted text
+
+    def text_key(self, pdf_hash: str, settings: dict) -> str:
+        return _key("text", pdf_hash, json.dumps(settings, sort_keys=True))
+
+    def get_text(self, key: str) -> Optional[Tuple[str, str]]:
+        """Return (text, text_hash) or None"""
+        row = self._touch(key)
+        if row is None:
+            return None
+        data = self._read(key)
+        if data is None:
+            return None
+        return data.decode("utf-8"), row[0]
+
+    def put_text(self, key: str, text: str) -> str:
+        """Store text and return its hash"""
+        data = text.encode("utf-8")
+        text_hash = sha256_bytes(data)
+        self._put(key, 1, data, text_hash, None)
+        return text_hash
+
+    def text_hash(self, key: str) -> Optional[str]:
+        """Hash of the cached text without reading it"""
+        row = self.conn.execute('SELECT content_hash FROM blobs WHERE key = ?', (key,)).fetchone()
+        return row[0] if row else None
+
+    # Level 2: serialized parse results
+
+    def entries_key(self, text_hash: str, aircraft_type: str, profile_fingerprint: str) -> str:
+        return _key("entries", text_hash, self.parser_version, aircraft_type, profile_fingerprint)
+
+    def get_entries(self, key: str) -> Optional[Tuple[bytes, int]]:
+        """Return (serialized JSON, item count) or None"""
+        row = self._touch(key)
+        if row is None:
+            return None
+        data = self._read(key)
+        if data is None:
+            return None
+        return data, row[1]
+
+    def put_entries(self, key: str, data: bytes, item_count: int):
+        self._put(key, 2, data, None, item_count)
+
+    # Storage
+
+    def _path(self, key: str) -> Path:
+        return self.objects_dir / key[:2] / key
+
+    def _touch(self, key: str):
+        row = self.conn.execute('SELECT content_hash, item_count FROM blobs WHERE key = ?',
+                                (key,)).fetchone()
+        if row is not None:
+            self.conn.execute('UPDATE blobs SET last_used = ? WHERE key = ?', (time.time(), key))
+            self.conn.commit()
+        return row
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            return self._path(key).read_bytes()
+        except FileNotFoundError:
+            # Blob removed behind our back: forget it
+            self.conn.execute('DELETE FROM blobs WHERE key = ?', (key,))
+            self.conn.commit()
+            return None
+
+    def _put(self, key: str, level: int, data: bytes, content_hash: Optional[str],
+             item_count: Optional[int]):
+        path = self._path(key)
+        path.parent.mkdir(exist_ok=True)
+        tmp = path.with_suffix(f".tmp{os.getpid()}")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+        self.conn.execute('''
+            INSERT OR REPLACE INTO blobs (key, level, size, content_hash, item_count, last_used)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', (key, level, len(data), content_hash, item_count, time.time()))
+        self.conn.commit()
+        self._evict()
+
+    def total_bytes(self) -> int:
+        return self.conn.execute('SELECT COALESCE(SUM(size), 0) FROM blobs').fetchone()[0]
+
+    def _evict(self):
+        """Drop least recently used blobs until the cache fits its cap"""
+        excess = self.total_bytes() - self.max_bytes
+        if excess <= 0:
+            return
+        rows = self.conn.execute('SELECT key, size FROM blobs ORDER BY last_used').fetchall()
+        for key, size in rows:
+            if excess <= 0:
+                break
+            self._path(key).unlink(missing_ok=True)
+            self.conn.execute('DELETE FROM blobs WHERE key = ?', (key,))
+            excess -= size
+        self.conn.commit()
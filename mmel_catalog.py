@@ -0,0 +1,200 @@
+"""In-memory fleet catalog over the MMEL JSON outputs.
+
+FleetCatalog loads every *MMEL.json of a directory once, as MMELEntry
+records, and indexes each aircraft type separately:
+
+- a hash index on item number: get(aircraft_type, item_number) is O(1)
+- entries sorted by (ataChapter, itemNumber): chapters(first, last) is
+  O(log n) plus the entries returned
+- lists per deferralCategory: by_category() is O(1)
+
+Entries are grouped by their aircraftType, as in mmel_db.db, so items of
+files sharing a type are kept in file order under the same item number.
+Byte-identical files (B74FMMEL.json is a copy of B748MMEL.json) are loaded
+once and listed in duplicates. reload(aircraft_type) re-reads that type's files and rebuilds
+only its indexes.
+
+Text is pooled while loading (see mmel_entry.StringPool): boilerplate
+remarks and procedures, and identical text across files loaded together,
+are held once. The pool is dropped afterwards, so a reloaded type shares
+text within itself only.
+"""
+import argparse
+import time
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from mmel_entry import MMELEntry, StringPool, load_entries, unique_files
+
+# Sorts after any item number, closing a chapter range
+_LAST = "\U0010ffff"
+
+
+class _TypeIndex:
+    """Indexes over the entries of one aircraft type"""
+
+    __slots__ = ("entries", "by_item", "ata_keys", "ata_entries", "by_category")
+
+    def __init__(self, entries: List[MMELEntry]):
+        self.entries = entries
+        self.by_item: Dict[str, List[MMELEntry]] = {}
+        self.by_category: Dict[str, List[MMELEntry]] = {}
+        for entry in entries:
+            self.by_item.setdefault(entry.item_number, []).append(entry)
+            self.by_category.setdefault(entry.deferral_category, []).append(entry)
+        # sorted() is stable, so duplicate item numbers keep file order
+        ordered = sorted(entries, key=lambda e: (e.ata_chapter, e.item_number))
+        self.ata_keys = [(e.ata_chapter, e.item_number) for e in ordered]
+        self.ata_entries = ordered
+
+    def chapters(self, first: str, last: str) -> List[MMELEntry]:
+        lo = bisect_left(self.ata_keys, (first,))
+        hi = bisect_right(self.ata_keys, (last, _LAST))
+        return self.ata_entries[lo:hi]
+
+
+class FleetCatalog:
+    """Indexed MMEL entries of a fleet; see the module docstring"""
+
+    def __init__(self):
+        self._types: Dict[str, _TypeIndex] = {}
+        self._files: Dict[str, List[str]] = {}
+        self.load_seconds: Dict[str, float] = {}
+        # Skipped file -> the identical file loaded instead
+        self.duplicates: Dict[str, str] = {}
+
+    @classmethod
+    def load(cls, directory: str = ".", pattern: str = "*MMEL.json") -> "FleetCatalog":
+        catalog = cls()
+        catalog.add_files(str(path) for path in sorted(Path(directory).glob(pattern)))
+        return catalog
+
+    def add_files(self, paths: Iterable[str]):
+        """Load JSON outputs; aircraft types they contain are replaced"""
+        grouped: Dict[str, List[MMELEntry]] = {}
+        files: Dict[str, List[str]] = {}
+        seconds: Dict[str, float] = {}
+        pool = StringPool()
+        paths, duplicates = unique_files(paths)
+        self.duplicates.update(duplicates)
+        for path in paths:
+            start = time.perf_counter()
+            entries = load_entries(path, pool)
+            elapsed = time.perf_counter() - start
+            types = {entry.aircraft_type for entry in entries}
+            for entry in entries:
+                grouped.setdefault(entry.aircraft_type, []).append(entry)
+            for aircraft_type in types:
+                files.setdefault(aircraft_type, []).append(path)
+                # A file's read time is charged to every type in it
+                seconds[aircraft_type] = seconds.get(aircraft_type, 0.0) + elapsed
+
+        for aircraft_type, entries in grouped.items():
+            start = time.perf_counter()
+            self._types[aircraft_type] = _TypeIndex(entries)
+            self._files[aircraft_type] = files[aircraft_type]
+            self.load_seconds[aircraft_type] = seconds[aircraft_type] + time.perf_counter() - start
+
+    def reload(self, aircraft_type: str):
+        """Re-read the files of one aircraft type; other types are untouched"""
+        if aircraft_type not in self._files:
+            raise KeyError(f"{aircraft_type} is not in the catalog")
+        start = time.perf_counter()
+        pool = StringPool()
+        entries = [entry for path in self._files[aircraft_type] for entry in load_entries(path, pool)
+                   if entry.aircraft_type == aircraft_type]
+        self._types[aircraft_type] = _TypeIndex(entries)
+        self.load_seconds[aircraft_type] = time.perf_counter() - start
+
+    @property
+    def aircraft_types(self) -> List[str]:
+        return sorted(self._types)
+
+    def __len__(self) -> int:
+        return sum(len(index.entries) for index in self._types.values())
+
+    def _indexes(self, aircraft_type: Optional[str]) -> List[_TypeIndex]:
+        if aircraft_type is None:
+            return [self._types[t] for t in self.aircraft_types]
+        index = self._types.get(aircraft_type)
+        return [index] if index is not None else []
+
+    def get(self, aircraft_type: str, item_number: str) -> List[MMELEntry]:
+        """Every entry with this item number (several for duplicates), O(1)"""
+        index = self._types.get(aircraft_type)
+        return index.by_item.get(item_number, []) if index is not None else []
+
+    def item(self, aircraft_type: str, item_number: str) -> Optional[MMELEntry]:
+        """First entry with this item number, or None"""
+        entries = self.get(aircraft_type, item_number)
+        return entries[0] if entries else None
+
+    def chapters(self, first: str, last: Optional[str] = None,
+                 aircraft_type: Optional[str] = None) -> List[MMELEntry]:
+        """Entries of ATA chapters first..last (inclusive) in chapter and
+        item number order, of one aircraft type or the whole fleet"""
+        last = first if last is None else last
+        return [entry for index in self._indexes(aircraft_type) for entry in index.chapters(first, last)]
+
+    def by_category(self, category: str, aircraft_type: Optional[str] = None) -> List[MMELEntry]:
+        """Entries with this deferral category ("" for none) in file order"""
+        return [entry for index in self._indexes(aircraft_type)
+                for entry in index.by_category.get(category, [])]
+
+    def stats(self) -> Dict[str, Dict]:
+        return {t: {"entries": len(self._types[t].entries), "items": len(self._types[t].by_item),
+                    "files": [Path(p).name for p in self._files[t]], "load_seconds": self.load_seconds[t]}
+                for t in self.aircraft_types}
+
+
+def _print_entries(entries: List[MMELEntry], limit: int = 20):
+    for entry in entries[:limit]:
+        print(f"  {entry.aircraft_type:<5} {entry.item_number:<12} {entry.deferral_category or '-':<2} "
+              f"{entry.quantity_installed:>3} {entry.quantity_required:>3}  {entry.title[:60]}")
+    if len(entries) > limit:
+        print(f"  ... {len(entries) - limit} more")
+
+
+def main(directory: str = ".", item: Optional[List[str]] = None, chapter: Optional[str] = None,
+         category: Optional[str] = None, aircraft_type: Optional[str] = None):
+    start = time.perf_counter()
+    catalog = FleetCatalog.load(directory)
+    print(f"📚 Loaded {len(catalog):,} entries of {len(catalog.aircraft_types)} aircraft types "
+          f"in {(time.perf_counter() - start) * 1000:.0f} ms")
+    for name, info in catalog.stats().items():
+        print(f"  {name:<5} {info['entries']:>5} entries  {info['items']:>5} items  "
+              f"{info['load_seconds'] * 1000:>6.1f} ms  {', '.join(info['files'])}")
+    for duplicate, original in catalog.duplicates.items():
+        print(f"  🪞 {Path(duplicate).name} skipped: identical to {Path(original).name}")
+
+    if item:
+        lookup_start = time.perf_counter()
+        entries = catalog.get(*item)
+        print(f"\n🔎 {item[0]} {item[1]}: {len(entries)} entries "
+              f"({(time.perf_counter() - lookup_start) * 1e6:.1f} µs)")
+        _print_entries(entries)
+    if chapter:
+        first, _, last = chapter.partition("..")
+        entries = catalog.chapters(first, last or None, aircraft_type)
+        print(f"\n📖 ATA {chapter}: {len(entries)} entries")
+        _print_entries(entries)
+    if category is not None:
+        entries = catalog.by_category(category, aircraft_type)
+        print(f"\n🏷️  Category {category or '(none)'}: {len(entries)} entries")
+        _print_entries(entries)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Load the MMEL JSON outputs into an indexed in-memory catalog and query it",
+        epilog="Example: python mmel_catalog.py --item A330 21-51-01 --chapter 21..24 --type B767")
+    parser.add_argument("directory", nargs="?", default=".", help="directory of *MMEL.json files")
+    parser.add_argument("--item", nargs=2, metavar=("TYPE", "ITEM"), help="look up one item")
+    parser.add_argument("--chapter", metavar="ATA[..ATA]", help="entries of an ATA chapter or chapter range")
+    parser.add_argument("--category", metavar="CAT", help="entries with this deferral category")
+    parser.add_argument("--type", dest="aircraft_type", help="limit --chapter and --category to one type")
+    args = parser.parse_args()
+
+    main(args.directory, item=args.item, chapter=args.chapter, category=args.category,
+         aircraft_type=args.aircraft_type)
@@ -0,0 +1,247 @@
+"""Compact record types for parsed MMEL entries.
+
+The parsers used to build every item as a dict with a nested remarks dict
+and two procedure lists. MMELEntry and Remarks are frozen dataclasses with
+__slots__ and tuple fields instead, which is what matters once the entries
+of a whole fleet are kept in memory. to_dict() gives exactly the JSON
+output schema (same keys, key order and value types) and from_dict() reads
+it back, so MMELEntry.from_dict(d).to_dict() == d.
+
+Entries built through a StringPool (build_entry(), from_dict(d, pool))
+share one object per distinct text, procedure tuple and remarks record:
+boilerplate remarks, the procedures of duplicate item numbers and, with a
+fleet-wide pool, identical manuals are then held once. unique_files() goes
+further for outputs that are byte-identical files (B74FMMEL.json is the
+B748 parse of the same PDF as B748MMEL.json): they are loaded once.
+
+`python mmel_entry.py *MMEL.json` measures the memory per entry of the
+representations and the text saved by pooling, per aircraft.
+"""
+import argparse
+import gc
+import hashlib
+import json
+import os
+import tracemalloc
+from dataclasses import dataclass
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+@dataclass(frozen=True)
+class Remarks:
+    __slots__ = ("summary", "steps")
+
+    summary: str
+    steps: Tuple[str, ...]
+
+    def to_dict(self) -> Dict:
+        return {"summary": self.summary, "steps": list(self.steps)}
+
+
+@dataclass(frozen=True)
+class MMELEntry:
+    """One MMEL item (one dispatch condition in layout mode)"""
+
+    __slots__ = ("aircraft_type", "ata_chapter", "item_number", "title", "deferral_category",
+                 "quantity_installed", "quantity_required", "remarks",
+                 "maintenance_procedures", "operational_procedures")
+
+    aircraft_type: str
+    ata_chapter: str
+    item_number: str
+    title: str
+    deferral_category: str
+    quantity_installed: int
+    quantity_required: int
+    remarks: Remarks
+    maintenance_procedures: Tuple[str, ...]
+    operational_procedures: Tuple[str, ...]
+
+    def to_dict(self) -> Dict:
+        """The entry in the JSON output schema"""
+        return {
+            "aircraftType": self.aircraft_type,
+            "ataChapter": self.ata_chapter,
+            "itemNumber": self.item_number,
+            "title": self.title,
+            "deferralCategory": self.deferral_category,
+            "quantityInstalled": self.quantity_installed,
+            "quantityRequired": self.quantity_required,
+            "remarks": self.remarks.to_dict(),
+            "maintenanceProcedures": list(self.maintenance_procedures),
+            "operationalProcedures": list(self.operational_procedures),
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict, pool: Optional["StringPool"] = None) -> "MMELEntry":
+        remarks = data["remarks"]
+        if pool is not None:
+            return build_entry(pool, data["aircraftType"], data["ataChapter"], data["itemNumber"],
+                               data["title"], data["deferralCategory"], data["quantityInstalled"],
+                               data["quantityRequired"], remarks["summary"], remarks["steps"],
+                               data["maintenanceProcedures"], data["operationalProcedures"])
+        return cls(data["aircraftType"], data["ataChapter"], data["itemNumber"], data["title"],
+                   data["deferralCategory"], data["quantityInstalled"], data["quantityRequired"],
+                   Remarks(remarks["summary"], tuple(remarks["steps"])),
+                   tuple(data["maintenanceProcedures"]), tuple(data["operationalProcedures"]))
+
+
+class StringPool:
+    """Equal values share one object: intern() returns the pooled copy.
+
+    A plain dict rather than sys.intern(), so a pool can be scoped (one per
+    parse, one per FleetCatalog) and dropped. Holds strings and the tuples
+    and Remarks built from pooled strings.
+    """
+
+    __slots__ = ("_values",)
+
+    def __init__(self):
+        self._values: Dict[Hashable, Hashable] = {}
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def intern(self, value):
+        return self._values.setdefault(value, value)
+
+    def intern_all(self, texts: Iterable[str]) -> Tuple[str, ...]:
+        values = self._values
+        pooled = tuple([values.setdefault(text, text) for text in texts])
+        return values.setdefault(pooled, pooled)
+
+
+def build_entry(pool: StringPool, aircraft_type: str, ata_chapter: str, item_number: str, title: str,
+                deferral_category: str, quantity_installed: int, quantity_required: int,
+                summary: str, steps: Iterable[str], maintenance_procedures: Iterable[str],
+                operational_procedures: Iterable[str]) -> MMELEntry:
+    """MMELEntry whose text comes from the pool"""
+    intern = pool.intern
+    return MMELEntry(intern(aircraft_type), intern(ata_chapter), intern(item_number), intern(title),
+                     intern(deferral_category), quantity_installed, quantity_required,
+                     intern(Remarks(intern(summary), pool.intern_all(steps))),
+                     pool.intern_all(maintenance_procedures), pool.intern_all(operational_procedures))
+
+
+def to_dicts(entries: Iterable[MMELEntry]) -> List[Dict]:
+    return [entry.to_dict() for entry in entries]
+
+
+def load_entries(path: str, pool: Optional[StringPool] = None) -> List[MMELEntry]:
+    """MMELEntry records of a JSON output file, pooled when a pool is given"""
+    with open(path, "r", encoding="utf-8") as f:
+        return [MMELEntry.from_dict(data, pool) for data in json.load(f)]
+
+
+def unique_files(paths: Iterable[str]) -> Tuple[List[str], Dict[str, str]]:
+    """Paths without byte-identical repeats, and each dropped path's kept twin"""
+    kept: List[str] = []
+    duplicates: Dict[str, str] = {}
+    digests: Dict[str, str] = {}
+    for path in paths:
+        with open(path, "rb") as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+        if digest in digests:
+            duplicates[path] = digests[digest]
+        else:
+            digests[digest] = path
+            kept.append(path)
+    return kept, duplicates
+
+
+def _traced(load) -> int:
+    """Bytes still allocated by load() once its result is built"""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        result = load()  # kept referenced while the traced memory is read
+        gc.collect()
+        return tracemalloc.get_traced_memory()[0]
+    finally:
+        tracemalloc.stop()
+
+
+def _strings(data: List[Dict]) -> Iterable[str]:
+    for d in data:
+        yield from (d["aircraftType"], d["ataChapter"], d["itemNumber"], d["title"],
+                    d["deferralCategory"], d["remarks"]["summary"])
+        yield from d["remarks"]["steps"]
+        yield from d["maintenanceProcedures"]
+        yield from d["operationalProcedures"]
+
+
+def measure(json_path: str) -> Dict:
+    """Traced bytes held by a JSON output as dicts, as MMELEntry records and
+    as pooled records, and the UTF-8 size of its text with and without
+    duplicates"""
+    def load_json():
+        with open(json_path, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    data = load_json()
+    text_bytes = sum(len(text.encode("utf-8")) for text in _strings(data))
+    unique_text_bytes = sum(len(text.encode("utf-8")) for text in set(_strings(data)))
+    return {
+        "items": len(data),
+        "dict_bytes": _traced(load_json),
+        "entry_bytes": _traced(lambda: [MMELEntry.from_dict(d) for d in load_json()]),
+        "pooled_bytes": _traced(lambda: load_entries(json_path, StringPool())),
+        "text_bytes": text_bytes,
+        "unique_text_bytes": unique_text_bytes,
+    }
+
+
+def measure_fleet(json_files: List[str]) -> Dict:
+    """Traced bytes of all outputs loaded through one shared pool, with and
+    without the byte-identical files.
+
+    The pool itself is dropped after the load, as FleetCatalog does: its
+    dict costs more than the text it would share with later loads.
+    """
+    def load_fleet(paths):
+        pool = StringPool()
+        return [load_entries(path, pool) for path in paths]
+
+    unique, duplicates = unique_files(json_files)
+    return {
+        "fleet_bytes": _traced(lambda: load_fleet(json_files)),
+        "unique_bytes": _traced(lambda: load_fleet(unique)),
+        "duplicates": duplicates,
+    }
+
+
+def main(json_files: List[str]):
+    print(f"{'File':<16} | Items | Dicts KB | Entries KB | Pooled KB | Entry B/item | Pooled B/item | "
+          f"Text KB | Unique KB | Saved")
+    print("-" * 117)
+    pooled_total = 0
+    for json_path in json_files:
+        r = measure(json_path)
+        items = max(r["items"], 1)
+        pooled_total += r["pooled_bytes"]
+        print(f"{os.path.basename(json_path):<16} | {r['items']:>5} | {r['dict_bytes'] / 1024:>8.0f} | "
+              f"{r['entry_bytes'] / 1024:>10.0f} | {r['pooled_bytes'] / 1024:>9.0f} | "
+              f"{r['entry_bytes'] / items:>12.0f} | {r['pooled_bytes'] / items:>13.0f} | "
+              f"{r['text_bytes'] / 1024:>7.0f} | {r['unique_text_bytes'] / 1024:>9.0f} | "
+              f"{1 - r['pooled_bytes'] / max(r['dict_bytes'], 1):>5.0%}")
+    if len(json_files) > 1:
+        fleet = measure_fleet(json_files)
+        print(f"🧵 One pool for all {len(json_files)} files: {fleet['fleet_bytes'] / 1024:,.0f} KB vs "
+              f"{pooled_total / 1024:,.0f} KB with a pool per file "
+              f"({fleet['fleet_bytes'] / max(pooled_total, 1) - 1:+.0%})")
+        for duplicate, original in fleet["duplicates"].items():
+            print(f"🪞 {os.path.basename(duplicate)} is identical to {os.path.basename(original)}")
+        if fleet["duplicates"]:
+            print(f"🧹 Loading identical files once: {fleet['unique_bytes'] / 1024:,.0f} KB "
+                  f"({fleet['unique_bytes'] / max(fleet['fleet_bytes'], 1) - 1:+.0%})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure the memory of MMEL JSON outputs as dicts, MMELEntry records and pooled "
+                    "records, and the duplicate text per aircraft",
+        epilog="Example: python mmel_entry.py B767MMEL.json A380MMEL.json")
+    parser.add_argument("json_files", nargs="+", help="MMEL JSON output files")
+    args = parser.parse_args()
+
+    main(args.json_files)
@@ -0,0 +1,251 @@
+"""Equivalent MMEL items across aircraft types in mmel_db.db.
+
+Comparing every title with every other is quadratic in the fleet's items.
+Instead each item becomes a set of normalized title tokens and bigrams
+(qualifiers in parentheses, "(Cont'd)", mod numbers and model designators
+removed; tokens found in more than TITLE_MAX_DF of all items dropped), is
+MinHashed to NUM_PERM values and banded into LSH buckets: only items that
+share a bucket with an item of another type become candidates, so the
+build is linear in the items plus the candidates.
+
+Candidates are verified with exact Jaccard similarity, the title set
+weighted by TITLE_WEIGHT and the remarks tokens by the rest, and pairs at
+or above the threshold are stored both ways in mmel_equivalents. Their
+connected components are stored in mmel_equivalence_groups.
+"""
+import argparse
+import hashlib
+import random
+import re
+import sqlite3
+import time
+from collections import Counter, defaultdict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+NUM_PERM = 64
+BANDS = 16                 # 4 rows per band: pairs from about 0.5 Jaccard up are found
+MAX_BUCKET = 200           # buckets of boilerplate titles are skipped rather than paired out
+TITLE_MAX_DF = 0.10
+REMARKS_MAX_DF = 0.05
+TITLE_WEIGHT = 0.75
+DEFAULT_THRESHOLD = 0.5
+
+_PRIME = (1 << 61) - 1
+_WORD_RE = re.compile(r"[a-z0-9]+")
+_PARENTHESES_RE = re.compile(r"\([^)]*\)?")
+# Continuation marks and sub-item labels such as "a)"
+_NOISE_RE = re.compile(r"\(cont[’']d\)|\b[a-z]\)")
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercase words without plural s; words with digits (item and mod
+    numbers, model designators such as -900ER) and single letters are dropped"""
+    words = _WORD_RE.findall(_NOISE_RE.sub(" ", text.lower()))
+    return [w[:-1] if len(w) > 3 and w.endswith("s") else w for w in words
+            if len(w) > 1 and not any(c.isdigit() for c in w)]
+
+
+def title_tokens(title: str) -> Set[str]:
+    """Tokens and bigrams of a title without its parenthesized qualifiers"""
+    tokens = normalize_tokens(_PARENTHESES_RE.sub(" ", title)) or normalize_tokens(title)
+    return set(tokens) | {f"{a} {b}" for a, b in zip(tokens, tokens[1:])}
+
+
+class MinHasher:
+    """MinHash signatures from NUM_PERM universal hash functions"""
+
+    def __init__(self, num_perm: int = NUM_PERM, seed: int = 1):
+        rng = random.Random(seed)
+        self._a = [rng.randrange(1, _PRIME) for _ in range(num_perm)]
+        self._b = [rng.randrange(_PRIME) for _ in range(num_perm)]
+        self._hashes: Dict[str, List[int]] = {}
+
+    def _feature(self, feature: str) -> List[int]:
+        values = self._hashes.get(feature)
+        if values is None:
+            x = int.from_bytes(hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest(), "little")
+            values = self._hashes[feature] = [(a * x + b) % _PRIME for a, b in zip(self._a, self._b)]
+        return values
+
+    def signature(self, features: Iterable[str]) -> Tuple[int, ...]:
+        # Column-wise minimum over the features' hash vectors
+        return tuple(map(min, zip(*[self._feature(f) for f in features])))
+
+
+def lsh_candidates(signatures: Dict[int, Tuple[int, ...]], groups: Dict[int, str],
+                   bands: int = BANDS, max_bucket: int = MAX_BUCKET) -> Set[Tuple[int, int]]:
+    """Pairs of keys sharing at least one band bucket, across groups only"""
+    buckets: Dict[tuple, List[int]] = defaultdict(list)
+    for key, signature in signatures.items():
+        rows = len(signature) // bands
+        for band in range(bands):
+            buckets[(band, signature[band * rows:(band + 1) * rows])].append(key)
+
+    candidates = set()
+    for keys in buckets.values():
+        if len(keys) < 2 or len(keys) > max_bucket:
+            continue
+        for n, first in enumerate(keys):
+            for second in keys[n + 1:]:
+                if groups[first] != groups[second]:
+                    candidates.add((first, second) if first < second else (second, first))
+    return candidates
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 0.0
+
+
+def create_equivalence_tables(conn: sqlite3.Connection):
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS mmel_equivalents (
+            mmel_item_id INTEGER NOT NULL,
+            equivalent_item_id INTEGER NOT NULL,
+            similarity REAL NOT NULL,
+            PRIMARY KEY (mmel_item_id, equivalent_item_id),
+            FOREIGN KEY (mmel_item_id) REFERENCES mmel_items (id),
+            FOREIGN KEY (equivalent_item_id) REFERENCES mmel_items (id)
+        )
+    ''')
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS mmel_equivalence_groups (
+            mmel_item_id INTEGER PRIMARY KEY,
+            group_id INTEGER NOT NULL,
+            FOREIGN KEY (mmel_item_id) REFERENCES mmel_items (id)
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_equivalence_group ON mmel_equivalence_groups (group_id)')
+
+
+def build_equivalents(conn: sqlite3.Connection, threshold: float = DEFAULT_THRESHOLD,
+                      num_perm: int = NUM_PERM, bands: int = BANDS) -> Dict:
+    """Rebuild mmel_equivalents and mmel_equivalence_groups; returns counts and timings"""
+    timings = {}
+    start = time.perf_counter()
+    items = conn.execute('SELECT id, aircraft_type, title, remarks_summary FROM mmel_items').fetchall()
+    aircraft_types = {item_id: aircraft_type for item_id, aircraft_type, _, _ in items}
+
+    # Token sets, without tokens common enough to be boilerplate
+    titles = {item_id: title_tokens(title) for item_id, _, title, _ in items}
+    remarks = {item_id: set(normalize_tokens(summary or "")) for item_id, _, _, summary in items}
+    title_df = Counter(token for tokens in titles.values() for token in tokens)
+    remarks_df = Counter(token for tokens in remarks.values() for token in tokens)
+    title_cut, remarks_cut = TITLE_MAX_DF * len(items), REMARKS_MAX_DF * len(items)
+    titles = {k: {t for t in tokens if title_df[t] <= title_cut} for k, tokens in titles.items()}
+    remarks = {k: {t for t in tokens if remarks_df[t] <= remarks_cut} for k, tokens in remarks.items()}
+    timings["tokenize"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    hasher = MinHasher(num_perm)
+    signatures = {k: hasher.signature(tokens) for k, tokens in titles.items() if tokens}
+    timings["minhash"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidates = lsh_candidates(signatures, aircraft_types, bands)
+    timings["lsh"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    pairs = []
+    for first, second in candidates:
+        similarity = (TITLE_WEIGHT * _jaccard(titles[first], titles[second])
+                      + (1 - TITLE_WEIGHT) * _jaccard(remarks[first], remarks[second]))
+        if similarity >= threshold:
+            pairs.append((first, second, round(similarity, 4)))
+
+    # Groups are the connected components of the verified pairs
+    parent: Dict[int, int] = {}
+
+    def find(x: int) -> int:
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    for first, second, _ in pairs:
+        a, b = find(first), find(second)
+        parent[max(a, b)] = min(a, b)
+    groups = [(item_id, find(item_id)) for item_id in sorted(parent)]
+    timings["verify"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    create_equivalence_tables(conn)
+    with conn:
+        conn.execute('DELETE FROM mmel_equivalents')
+        conn.execute('DELETE FROM mmel_equivalence_groups')
+        conn.executemany('INSERT INTO mmel_equivalents VALUES (?, ?, ?)',
+                         [row for a, b, s in pairs for row in ((a, b, s), (b, a, s))])
+        conn.executemany('INSERT INTO mmel_equivalence_groups VALUES (?, ?)', groups)
+    timings["store"] = time.perf_counter() - start
+
+    return {"items": len(items), "signed": len(signatures), "candidates": len(candidates),
+            "pairs": len(pairs), "grouped_items": len(groups),
+            "groups": len({group for _, group in groups}), "seconds": timings}
+
+
+def show_equivalents(conn: sqlite3.Connection, aircraft_type: str, item_number: str,
+                     other_type: Optional[str] = None) -> List[Dict]:
+    """Equivalents of an item (every sequence number of it), most similar first"""
+    sql = '''
+        SELECT src.sequence_number, eq.aircraft_type, eq.item_number, eq.sequence_number,
+               eq.title, eq.deferral_category, e.similarity, g.group_id
+        FROM mmel_items src
+        JOIN mmel_equivalents e ON e.mmel_item_id = src.id
+        JOIN mmel_items eq ON eq.id = e.equivalent_item_id
+        LEFT JOIN mmel_equivalence_groups g ON g.mmel_item_id = src.id
+        WHERE src.aircraft_type = ? AND src.item_number = ?
+    '''
+    params = [aircraft_type, item_number]
+    if other_type:
+        sql += ' AND eq.aircraft_type = ?'
+        params.append(other_type)
+    sql += ' ORDER BY e.similarity DESC, eq.aircraft_type, eq.item_number, eq.sequence_number'
+
+    return [{
+        "sequenceNumber": row[0],
+        "aircraftType": row[1],
+        "itemNumber": row[2],
+        "equivalentSequenceNumber": row[3],
+        "title": row[4],
+        "deferralCategory": row[5],
+        "similarity": row[6],
+        "groupId": row[7],
+    } for row in conn.execute(sql, params)]
+
+
+def main(db_path: str = 'mmel_db.db', build: bool = False, show: Optional[List[str]] = None,
+         other_type: Optional[str] = None, threshold: float = DEFAULT_THRESHOLD):
+    conn = sqlite3.connect(db_path)
+    if build:
+        stats = build_equivalents(conn, threshold=threshold)
+        seconds = stats["seconds"]
+        print(f"🔗 {stats['pairs']:,} equivalent pairs in {stats['groups']:,} groups "
+              f"({stats['grouped_items']:,} of {stats['items']:,} items) from "
+              f"{stats['candidates']:,} LSH candidates in {sum(seconds.values()):.2f}s")
+        print("   " + " | ".join(f"{stage} {s:.2f}s" for stage, s in seconds.items()))
+    if show:
+        results = show_equivalents(conn, show[0], show[1], other_type)
+        for r in results:
+            print(f"{r['similarity']:>5.2f} | {r['aircraftType']:>5} | {r['itemNumber']:<12} | "
+                  f"{r['deferralCategory'] or '-':>3} | {r['title'][:70]}")
+        print(f"\n🔎 {len(results)} equivalents of {show[0]} {show[1]}")
+    conn.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Find equivalent MMEL items across aircraft types with MinHash/LSH",
+        epilog="Example: python mmel_equivalents.py --build --show A320 21-51-01")
+    parser.add_argument("--db", default='mmel_db.db', help="database file (default: mmel_db.db)")
+    parser.add_argument("--build", action="store_true",
+                        help="(re)build the mmel_equivalents and mmel_equivalence_groups tables")
+    parser.add_argument("--show", nargs=2, metavar=("TYPE", "ITEM"), help="show equivalents of an item")
+    parser.add_argument("--aircraft", help="with --show: only equivalents of this aircraft type")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help=f"minimum weighted Jaccard similarity (default: {DEFAULT_THRESHOLD})")
+    args = parser.parse_args()
+    if not args.build and not args.show:
+        parser.error("nothing to do: give --build and/or --show")
+
+    main(args.db, build=args.build, show=args.show, other_type=args.aircraft, threshold=args.threshold)
@@ -0,0 +1,194 @@
+"""Declarative header/footer filter profiles.
+
+Page furniture (FAA banner, revision/date lines, table key, column titles)
+is described per manual family in filter_profiles.json instead of in code.
+A profile lists the `prefixes`, exact `lines` and `substrings` to skip, may
+`extends` other profiles, and may carry a nested `toc` filter for the lines
+a parser skips before an item starts. The `aircraft_types` section selects
+a profile per ICAO type.
+
+A profile may also carry an `extraction` section applied before any line
+is filtered: the `top` margin (points) cut off every page above the item
+table and the names of the fitz TEXT_* `flags` to extract with. The margin
+is taken from each page's own rectangle (see page_text()), so US Letter, A4
+and rotated pages lose the same banner. The section is inherited as a whole
+and replaced, not merged, by a profile that sets it.
+
+Extra profile files are layered on top of the bundled one, either through
+the MMEL_FILTER_PROFILES environment variable (paths separated by
+os.pathsep) or load_filter_profiles(); later files override profiles and
+aircraft type mappings with the same name.
+"""
+import json
+import os
+import re
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_PROFILES_PATH = Path(__file__).with_name("filter_profiles.json")
+PROFILES_ENV_VAR = "MMEL_FILTER_PROFILES"
+
+
+class LineFilter:
+    """Compiled matcher for one filter spec.
+
+    Prefixes are bucketed by first character so each line is compared only
+    against the prefixes that can possibly match; exact lines are a set
+    lookup and substrings share a single alternation regex.
+    """
+
+    def __init__(self, prefixes: Iterable[str] = (), lines: Iterable[str] = (),
+                 substrings: Iterable[str] = ()):
+        buckets: Dict[str, List[str]] = {}
+        for prefix in dict.fromkeys(prefixes):
+            if not prefix:
+                raise ValueError("Empty prefix in filter profile")
+            buckets.setdefault(prefix[0], []).append(prefix)
+        self._prefixes = {first: tuple(group) for first, group in buckets.items()}
+        self._lines = frozenset(lines)
+        substrings = list(dict.fromkeys(substrings))
+        self._substring_re = (re.compile("|".join(re.escape(s) for s in substrings))
+                              if substrings else None)
+
+    def __call__(self, line: str) -> bool:
+        if line in self._lines:
+            return True
+        prefixes = self._prefixes.get(line[:1])
+        if prefixes is not None and line.startswith(prefixes):
+            return True
+        return self._substring_re is not None and self._substring_re.search(line) is not None
+
+
+def _never(line: str) -> bool:
+    return False
+
+
+class FilterProfile:
+    """A compiled profile: `headers` filter, optional `toc` filter and
+    optional `extraction` settings"""
+
+    def __init__(self, name: str, headers: LineFilter, toc: Optional[LineFilter] = None,
+                 extraction: Optional[dict] = None):
+        self.name = name
+        self.headers = headers
+        self.toc = toc if toc is not None else _never
+        self.extraction = extraction
+
+
+class ProfileRegistry:
+    """Profile specs and aircraft type mappings merged from one or more files"""
+
+    def __init__(self):
+        self._specs: Dict[str, dict] = {}
+        self._aircraft_types: Dict[str, str] = {}
+        self._compiled: Dict[str, FilterProfile] = {}
+
+    def load(self, path):
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        self._specs.update(data.get("profiles", {}))
+        self._aircraft_types.update(data.get("aircraft_types", {}))
+        self._compiled.clear()
+
+    def names(self) -> List[str]:
+        return sorted(self._specs)
+
+    def name_for(self, aircraft_type: str, default: str) -> str:
+        return self._aircraft_types.get(aircraft_type, default)
+
+    def get(self, name: str) -> FilterProfile:
+        profile = self._compiled.get(name)
+        if profile is None:
+            spec = self._resolve(name, ())
+            toc = spec.get("toc")
+            profile = FilterProfile(
+                name,
+                LineFilter(spec["prefixes"], spec["lines"], spec["substrings"]),
+                LineFilter(toc["prefixes"], toc["lines"], toc["substrings"]) if toc else None,
+                spec.get("extraction"),
+            )
+            self._compiled[name] = profile
+        return profile
+
+    def fingerprint(self, name: str) -> str:
+        """Stable text form of a resolved profile, for cache keys"""
+        return json.dumps(self._resolve(name, ()), sort_keys=True)
+
+    def _resolve(self, name: str, seen: tuple) -> dict:
+        """Flatten `extends` chains into one spec"""
+        if name not in self._specs:
+            raise KeyError(f"Unknown filter profile '{name}'")
+        if name in seen:
+            raise ValueError(f"Filter profile '{name}' extends itself")
+        spec = self._specs[name]
+        # "extraction" is only present when set, so fingerprints of profiles
+        # without it stay the same
+        resolved = {"prefixes": [], "lines": [], "substrings": [], "toc": None}
+        for parent in spec.get("extends", []):
+            parent_spec = self._resolve(parent, seen + (name,))
+            for key in ("prefixes", "lines", "substrings"):
+                resolved[key].extend(parent_spec[key])
+            resolved["toc"] = parent_spec["toc"] or resolved["toc"]
+            if "extraction" in parent_spec:
+                resolved["extraction"] = parent_spec["extraction"]
+        for key in ("prefixes", "lines", "substrings"):
+            resolved[key].extend(spec.get(key, []))
+        if "toc" in spec:
+            toc = spec["toc"]
+            resolved["toc"] = {key: list(toc.get(key, [])) for key in ("prefixes", "lines", "substrings")}
+        if "extraction" in spec:
+            extraction = spec["extraction"]
+            resolved["extraction"] = ({"top": extraction.get("top"), "flags": extraction.get("flags")}
+                                      if extraction else None)
+        return resolved
+
+
+def page_text(page, options: Optional[dict] = None, output: str = "text"):
+    """page.get_text(output) with extraction options ({"top": points, "flags": n}).
+
+    The top margin is cut off the page as displayed and the clip is mapped
+    back to the unrotated coordinates text extraction works in.
+    """
+    if not options:
+        return page.get_text(output)
+    kwargs = {}
+    if options.get("top"):
+        clip = +page.rect
+        clip.y0 = min(clip.y0 + options["top"], clip.y1)
+        kwargs["clip"] = clip * page.derotation_matrix
+    if options.get("flags") is not None:
+        kwargs["flags"] = options["flags"]
+    return page.get_text(output, **kwargs)
+
+
+_registry: Optional[ProfileRegistry] = None
+
+
+def get_registry() -> ProfileRegistry:
+    """The process-wide registry: bundled profiles plus MMEL_FILTER_PROFILES"""
+    global _registry
+    if _registry is None:
+        registry = ProfileRegistry()
+        registry.load(DEFAULT_PROFILES_PATH)
+        for path in os.environ.get(PROFILES_ENV_VAR, "").split(os.pathsep):
+            if path:
+                registry.load(path)
+        _registry = registry
+    return _registry
+
+
+def load_filter_profiles(path):
+    """Layer an extra profile file on top of the current registry"""
+    get_registry().load(path)
+
+
+def filter_profile_fingerprint(aircraft_type: str, default: str, name: Optional[str] = None) -> str:
+    registry = get_registry()
+    return registry.fingerprint(name or registry.name_for(aircraft_type, default))
+
+
+def filter_profile_for(aircraft_type: str, default: str, name: Optional[str] = None) -> FilterProfile:
+    """Compiled profile for an explicit `name`, else the aircraft type's
+    mapping, else `default`"""
+    registry = get_registry()
+    return registry.get(name or registry.name_for(aircraft_type, default))
@@ -0,0 +1,162 @@
+"""Line classification for extracted MMEL text.
+
+Every line is stripped and tagged exactly once with the role it plays in the
+MMEL table (ATA section, item start, header, category, ...) using precompiled
+per-format grammars. The parsers in mmel_parser.py are state machines over
+the tagged stream and never re-run a regex on a line they have already seen.
+"""
+import re
+from collections import Counter
+from typing import Iterable, Iterator, Match, Optional, Tuple
+
+import mmel_metrics
+from mmel_filters import FilterProfile, filter_profile_for
+
+# Line tags
+BLANK = "BLANK"
+HEADER = "HEADER"
+ATA_SECTION = "ATA_SECTION"
+ATA_MINOR = "ATA_MINOR"      # A-380 "NN text" line too short to be a section title
+ITEM_START = "ITEM_START"
+TOC_ENTRY = "TOC_ENTRY"      # item-shaped line that belongs to a table of contents
+CATEGORY = "CATEGORY"
+QUANTITY = "QUANTITY"
+TEXT = "TEXT"
+
+TaggedLine = Tuple[str, str, Optional[Match]]
+
+CATEGORIES = frozenset(["A", "B", "C", "D"])
+
+
+class LineGrammar:
+    """Base class for a per-format line grammar.
+
+    Page furniture is recognised by a compiled filter profile (see
+    mmel_filters), chosen per aircraft type unless one is named explicitly.
+    """
+
+    name = ""
+    default_profile = ""
+
+    def __init__(self, profile: FilterProfile):
+        self.profile = profile
+        self.is_header = profile.headers
+        self.is_toc = profile.toc
+
+    @classmethod
+    def for_aircraft(cls, aircraft_type: str, profile: Optional[str] = None) -> "LineGrammar":
+        return cls(filter_profile_for(aircraft_type, cls.default_profile, profile))
+
+    def classify(self, line: str) -> TaggedLine:
+        raise NotImplementedError
+
+
+class FAAGrammar(LineGrammar):
+    """FAA MMELs with the item number alone on its line, either Airbus
+    "21-21-01" or Boeing "-21-01", and one table column per line."""
+
+    name = "faa"
+    default_profile = "faa-airbus"
+
+    _KEY_RE = re.compile(
+        r"(?P<airbus>\d{2}-\d{2}-\d{2}(?:-\d{2})*)$"
+        r"|(?P<boeing>-\d{2}-\d{2}(?:-\d{2})*)$"
+        r"|(?P<ata>\d{2})\.\s+(?P<ata_title>.+)"
+    )
+
+    def classify(self, line: str) -> TaggedLine:
+        if not line:
+            return BLANK, line, None
+        first = line[0]
+        if first == "-" or first.isdigit():
+            match = self._KEY_RE.match(line)
+            if match:
+                if match.group("ata") is not None:
+                    return ATA_SECTION, line, match
+                return ITEM_START, line, match
+        if self.is_header(line):
+            return HEADER, line, None
+        if line in CATEGORIES:
+            return CATEGORY, line, None
+        if line.isdigit():
+            return QUANTITY, line, None
+        return TEXT, line, None
+
+
+class A380Grammar(LineGrammar):
+    """A-380 tabular MMEL: "21  AIR CONDITIONING" sections and items such as
+    "03-04 BULK Cargo HEATER" or "21-03-01 ..." with the columns on the same
+    or following lines."""
+
+    name = "a380"
+    default_profile = "a380-tabular"
+
+    _KEY_RE = re.compile(
+        r"(?:(?P<full>\d{2}-\d{2}-\d{2})|(?P<seq>\d{2}-\d{2}))\s+(?P<rest>.+)"
+        r"|(?P<ata>\d{2})\s+(?P<ata_title>.+)"
+    )
+
+    def classify(self, line: str) -> TaggedLine:
+        if not line:
+            return BLANK, line, None
+        if line[0].isdigit():
+            match = self._KEY_RE.match(line)
+            if match:
+                if match.group("ata") is not None:
+                    # Short trailing text is not a section title
+                    if len(match.group("ata_title")) > 3:
+                        return ATA_SECTION, line, match
+                    return ATA_MINOR, line, match
+                return ITEM_START, line, match
+        if self.is_header(line):
+            return HEADER, line, None
+        return TEXT, line, None
+
+
+class B747Grammar(LineGrammar):
+    """Boeing 747-400 tabular MMEL: "21. Air Conditioning" sections and items
+    such as "31-1 ..." or "31-1A ..." with the columns on the same line."""
+
+    name = "b747-400"
+    default_profile = "b747-400-tabular"
+
+    _KEY_RE = re.compile(
+        r"(?:(?P<alpha>\d{2}-\d{1,2}[A-Z])|(?P<seq>\d{2}-\d{1,2}))\s+(?P<rest>.+)"
+        r"|(?P<ata>\d{2})\.\s+(?P<ata_title>.+)"
+    )
+
+    def classify(self, line: str) -> TaggedLine:
+        if not line:
+            return BLANK, line, None
+        if line[0].isdigit():
+            match = self._KEY_RE.match(line)
+            if match:
+                if match.group("ata") is not None:
+                    return ATA_SECTION, line, match
+                if self.is_toc(line):
+                    return TOC_ENTRY, line, match
+                return ITEM_START, line, match
+        if self.is_header(line):
+            return HEADER, line, None
+        return TEXT, line, None
+
+
+def classify_lines(lines: Iterable[str], grammar: LineGrammar) -> Iterator[TaggedLine]:
+    """Strip and tag each line once"""
+    classify = grammar.classify
+    if mmel_metrics.active is None:
+        for line in lines:
+            yield classify(line.strip())
+        return
+
+    # Instrumented: count the tags (lines.header are the header lines
+    # skipped, lines.item_start the items started, ...)
+    tags: Counter = Counter()
+    try:
+        for line in lines:
+            tagged = classify(line.strip())
+            tags[tagged[0]] += 1
+            yield tagged
+    finally:
+        for tag, n in tags.items():
+            mmel_metrics.count(f"lines.{tag.lower()}", n)
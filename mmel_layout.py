@@ -0,0 +1,307 @@
+"""Layout-aware extraction of tabular MMEL pages from word coordinates.
+
+page.get_text("text") flattens the MMEL table, so the text parsers have to
+guess which column a line came from. Here every word keeps its position
+(page.get_text("words")): the numbered column labels of the page header
+("1." repair category, "2." installed, "3." required, "4." remarks) give
+the column edges, words are clustered into rows by y and bucketed into
+columns by x, and each category/quantity row becomes one condition of the
+item it belongs to.
+
+Column templates are per format; the edges themselves are learned from the
+header of every page, so small layout shifts between pages are followed.
+Pages without the header row (cover, contents, preamble) are skipped.
+"""
+import re
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import fitz  # PyMuPDF
+
+import mmel_metrics
+from mmel_filters import page_text
+from mmel_grammar import ATA_SECTION, HEADER, ITEM_START, TOC_ENTRY, LineGrammar
+
+# Column indexes of a table row
+ITEM, CATEGORY, INSTALLED, REQUIRED, REMARKS = range(5)
+
+# Words whose tops are this close (points) share a table row
+ROW_TOLERANCE = 3.0
+
+# (ata, item_number, title, deferral_category, qty_installed, qty_required, remarks)
+LayoutRow = Tuple[str, str, str, str, int, int, str]
+
+
+@dataclass(frozen=True)
+class ColumnTemplate:
+    """Header words that locate the columns of one MMEL format.
+
+    labels are the category/installed/required/remarks column labels, in
+    that order; right_label, if set, starts a column (change bars) that is
+    not part of the table. skip_cells are body cells that are page
+    furniture, skip_titles are item column words that are not part of the
+    title, and continued_titles mark the end of an item's repeated title
+    on a continuation page.
+    """
+
+    labels: Tuple[str, str, str, str]
+    right_label: str = ""
+    max_label_spread: float = 80.0
+    skip_cells: Tuple[str, ...] = ()
+    skip_titles: Tuple[str, ...] = ()
+    continued_titles: Tuple[str, ...] = ()
+
+
+LAYOUT_TEMPLATES: Dict[str, ColumnTemplate] = {
+    # Labels are stacked over four header lines
+    "A380": ColumnTemplate(labels=("1.", "2.", "3.", "4."), skip_titles=("***",),
+                           continued_titles=("(Cont’d)", "(Cont'd)")),
+    # Bare digits on one header line; "1." .. "4." belong to the table key
+    "B747-400": ColumnTemplate(labels=("1", "2", "3", "4"), right_label="Change",
+                               skip_cells=("(Continued)",),
+                               skip_titles=("***",), continued_titles=("(Cont’d)", "(Cont'd)")),
+}
+
+
+@dataclass
+class PageColumns:
+    """Column edges learned from one page header"""
+
+    edges: Tuple[float, float, float, float]  # left x of category .. remarks
+    right: float                              # words from here on are ignored
+    body_top: float                           # first y below the header
+
+    def column(self, x0: float) -> int:
+        edges = self.edges
+        if x0 < edges[0]:
+            return ITEM
+        if x0 < edges[1]:
+            return CATEGORY
+        if x0 < edges[2]:
+            return INSTALLED
+        if x0 < edges[3]:
+            return REQUIRED
+        return REMARKS
+
+
+def learn_columns(words: List[tuple], template: ColumnTemplate,
+                  page_width: float) -> Optional[PageColumns]:
+    """Column edges from the topmost header labels, or None for pages
+    that are not table pages"""
+    wanted = set(template.labels)
+    if template.right_label:
+        wanted.add(template.right_label)
+    found: Dict[str, tuple] = {}
+    for word in sorted(words, key=lambda w: w[1]):
+        text = word[4]
+        if text in wanted and text not in found:
+            found[text] = word
+    if any(label not in found for label in template.labels):
+        return None
+
+    labels = [found[label] for label in template.labels]
+    xs = [word[0] for word in labels]
+    if any(b - a < 10 for a, b in zip(xs, xs[1:])):
+        return None
+    if max(w[1] for w in labels) - min(w[1] for w in labels) > template.max_label_spread:
+        return None
+
+    # A cell starts at most half a column before its label
+    edges = (xs[0] - (xs[1] - xs[0]) / 2,
+             (xs[0] + xs[1]) / 2,
+             (xs[1] + xs[2]) / 2,
+             (xs[2] + xs[3]) / 2)
+    right = page_width
+    right_word = found.get(template.right_label)
+    if right_word is not None and right_word[0] > xs[3]:
+        right = right_word[0] - 5
+    return PageColumns(edges, right, max(w[3] for w in labels))
+
+
+def _rows(words: List[tuple]) -> Iterator[List[tuple]]:
+    """Cluster words into rows by their top edge, each row left to right"""
+    row: List[tuple] = []
+    row_top = 0.0
+    for word in sorted(words, key=lambda w: (w[1], w[0])):
+        if row and word[1] - row_top > ROW_TOLERANCE:
+            yield sorted(row, key=lambda w: w[0])
+            row = []
+        if not row:
+            row_top = word[1]
+        row.append(word)
+    if row:
+        yield sorted(row, key=lambda w: w[0])
+
+
+def _cells(row: List[tuple], columns: PageColumns) -> List[str]:
+    parts: List[List[str]] = [[], [], [], [], []]
+    for word in row:
+        parts[columns.column(word[0])].append(word[4])
+    return [" ".join(part) for part in parts]
+
+
+# "1) Passenger/Combi" and "a) Models With ..." sub-item headings
+_SUB_ITEM_RE = re.compile(r"\(?(?:(?P<number>\d{1,2})|[a-z])\)\s")
+
+
+def _item_number(match, ata: str) -> str:
+    """Full item number from an ITEM_START match of the A-380 or B-747 grammar"""
+    groups = match.groupdict()
+    return groups.get("full") or f"{ata}-{groups.get('alpha') or groups['seq']}"
+
+
+def _quantity(cell: str) -> int:
+    # "-" is an unspecified (variable) quantity
+    return int(cell) if cell.isdigit() else 0
+
+
+class _Item:
+    """Title, sub-item headings and conditions of the item being read"""
+
+    def __init__(self, ata: str, item_number: str, page: int):
+        self.ata = ata
+        self.item_number = item_number
+        self.page = page
+        self.title: List[str] = []
+        self.remarks: List[str] = []  # remarks above the first condition
+        self.conditions: List[Dict] = []
+        # Open sub-item headings as (level, lines); conditions share them
+        self.headings: List[Tuple[int, List[str]]] = []
+        # Title lines after the item number was repeated on a new page
+        self.repeated: Optional[List[str]] = None
+
+    def add_title(self, text: str):
+        if self.repeated is not None:
+            self.repeated.append(text)
+            return
+        match = _SUB_ITEM_RE.match(text)
+        if match:
+            level = 0 if match.group("number") else 1
+            self.headings = [h for h in self.headings if h[0] < level] + [(level, [text])]
+        elif self.headings:
+            self.headings[-1][1].append(text)
+        else:
+            # Wrapped item titles run alongside the first conditions
+            self.title.append(text)
+
+    def end_repeat(self, continued: bool):
+        """Lines up to a "(Cont'd)" mark repeat earlier ones; at the next
+        condition the repeated block ends and lines since the mark are kept"""
+        if self.repeated is None:
+            return
+        if continued:
+            self.repeated = []
+        else:
+            lines, self.repeated = self.repeated, None
+            for text in lines:
+                self.add_title(text)
+
+    def add_condition(self, category: str):
+        self.conditions.append({"category": category, "installed": None, "required": None,
+                                "headings": self.headings, "remarks": []})
+
+    def rows(self) -> Iterator[LayoutRow]:
+        self.end_repeat(continued=False)
+        conditions = self.conditions or [{"category": "", "installed": None, "required": None,
+                                          "headings": [], "remarks": []}]
+        for n, condition in enumerate(conditions):
+            title = self.title + [text for _, lines in condition["headings"] for text in lines]
+            remarks = condition["remarks"] if n else self.remarks + condition["remarks"]
+            yield (self.ata, self.item_number, " ".join(title),
+                   condition["category"], condition["installed"] or 0,
+                   condition["required"] or 0, " ".join(remarks))
+
+
+def iter_layout_rows(pdf_path: str, template: ColumnTemplate, grammar: LineGrammar,
+                     options: Optional[Dict] = None, start_ata: str = "") -> Iterator[LayoutRow]:
+    """Yield one row per item condition, page by page.
+
+    options are the extraction top margin and flags (the margin must keep the
+    column labels). The item column is classified with the format's line grammar, so item
+    numbers and ATA sections are recognised exactly as in text mode.
+    Items, conditions and remarks continue across page breaks.
+    """
+    ata = start_ata
+    item: Optional[_Item] = None
+    skip_cells = set(template.skip_cells)
+    skip_titles = set(template.skip_titles)
+    continued_titles = set(template.continued_titles)
+    options = options or {}
+
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            start = time.perf_counter()
+            words = page_text(page, options, "words")
+            if mmel_metrics.active is not None:
+                mmel_metrics.active.page(page.number, time.perf_counter() - start)
+            columns = learn_columns(words, template, page.rect.width)
+            if columns is None:
+                continue
+
+            for row in _rows([w for w in words if w[0] < columns.right]):
+                if row[0][1] < columns.body_top - 1:
+                    # Header zone: only the running ATA section is of interest
+                    tag, _, match = grammar.classify(" ".join(w[4] for w in row))
+                    if tag == ATA_SECTION:
+                        ata = match.group("ata")
+                    continue
+
+                cells = _cells(row, columns)
+                line = ""
+                repeated = False
+                if cells[ITEM]:
+                    tag, line, match = grammar.classify(cells[ITEM])
+                    if tag == ATA_SECTION or tag == ITEM_START or tag == TOC_ENTRY:
+                        item_number = _item_number(match, ata) if tag != ATA_SECTION else None
+                        if item is not None and item_number == item.item_number \
+                                and page.number > item.page:
+                            # A continued item repeats its number on the next page
+                            repeated = True
+                            line = match.group("rest")
+                        else:
+                            if item is not None:
+                                yield from item.rows()
+                            item = None
+                            line = ""
+                            if tag == ATA_SECTION:
+                                ata = match.group("ata")
+                            elif tag == ITEM_START:
+                                item = _Item(ata, item_number, page.number)
+                                line = match.group("rest")
+                    elif tag == HEADER:
+                        line = ""
+
+                if item is None:
+                    continue
+
+                tokens = line.split()
+                title = " ".join(w for w in tokens if w not in skip_titles and w not in continued_titles)
+                category, installed, required = cells[CATEGORY], cells[INSTALLED], cells[REQUIRED]
+                remarks = cells[REMARKS]
+                if repeated:
+                    item.repeated = []
+                elif any(w in continued_titles for w in tokens):
+                    item.end_repeat(continued=True)
+                elif category or installed or required:
+                    item.end_repeat(continued=False)
+                if title:
+                    item.add_title(title)
+
+                # A condition starts at a category cell, or at a quantity
+                # cell when the current condition already has its quantities
+                if category or ((installed or required) and (
+                        not item.conditions or item.conditions[-1]["installed"] is not None)):
+                    item.add_condition(category)
+                if item.conditions:
+                    condition = item.conditions[-1]
+                    if installed and condition["installed"] is None:
+                        condition["installed"] = _quantity(installed)
+                    if required and condition["required"] is None:
+                        condition["required"] = _quantity(required)
+
+                if remarks and remarks not in skip_cells:
+                    (item.conditions[-1]["remarks"] if item.conditions else item.remarks).append(remarks)
+
+    if item is not None:
+        yield from item.rows()
@@ -0,0 +1,177 @@
+"""Load test for mmel_service.py.
+
+Opens a number of keep-alive connections and has each send requests back to
+back for a fixed time. The URL mix is drawn from the database itself: item
+lookups, chapter listings and summaries in the proportions given. Reports
+throughput and latency percentiles (p50/p95/p99/max).
+"""
+import argparse
+import asyncio
+import random
+import sqlite3
+import subprocess
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+from typing import List, Optional
+from urllib.parse import quote
+
+from mmel_service import DEFAULT_PORT
+
+
+def build_urls(db_path: str, count: int, seed: int = 0) -> List[str]:
+    """Request paths: ~80% items, ~15% chapters, ~5% summaries"""
+    conn = sqlite3.connect(db_path)
+    items = conn.execute('SELECT DISTINCT aircraft_type, item_number FROM mmel_items').fetchall()
+    chapters = conn.execute('SELECT DISTINCT aircraft_type, ata_chapter FROM mmel_items').fetchall()
+    aircraft_types = [row[0] for row in conn.execute('SELECT aircraft_type FROM aircraft_summary')]
+    conn.close()
+    if not items:
+        raise SystemExit(f"❌ {db_path} has no MMEL items")
+
+    rng = random.Random(seed)
+    urls = []
+    for _ in range(count):
+        roll = rng.random()
+        if roll < 0.80:
+            aircraft_type, item_number = rng.choice(items)
+            urls.append(f"/items/{quote(aircraft_type, safe='')}/{quote(item_number, safe='')}")
+        elif roll < 0.95:
+            aircraft_type, ata = rng.choice(chapters)
+            urls.append(f"/chapters/{quote(aircraft_type, safe='')}/{quote(ata, safe='')}")
+        elif aircraft_types and roll < 0.98:
+            urls.append(f"/summary/{quote(rng.choice(aircraft_types), safe='')}")
+        else:
+            urls.append("/summary")
+    return urls
+
+
+async def _client(host: str, port: int, urls: List[str], offset: int, deadline: float,
+                  latencies: List[float], statuses: Counter):
+    """Send requests until the deadline; a dropped connection is counted
+    under statuses["errors"] and reopened, one that cannot be reopened ends
+    the client"""
+    n = offset
+    while time.perf_counter() < deadline:
+        try:
+            reader, writer = await asyncio.open_connection(host, port)
+        except ConnectionError:
+            statuses["errors"] += 1
+            return
+        try:
+            while time.perf_counter() < deadline:
+                url = urls[n % len(urls)]
+                n += 1
+                start = time.perf_counter()
+                writer.write(f"GET {url} HTTP/1.1\r\nHost: {host}\r\n\r\n".encode("ascii"))
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.split(b"\r\n"):
+                    if line[:15].lower() == b"content-length:":
+                        length = int(line[15:])
+                await reader.readexactly(length)
+                latencies.append(time.perf_counter() - start)
+                statuses[int(head.split(b" ", 2)[1])] += 1
+        except (asyncio.IncompleteReadError, ConnectionError):
+            statuses["errors"] += 1
+        finally:
+            writer.close()
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_load(host: str, port: int, urls: List[str], concurrency: int, duration: float) -> dict:
+    latencies: List[float] = []
+    statuses: Counter = Counter()
+    start = time.perf_counter()
+    deadline = start + duration
+    stride = max(1, len(urls) // concurrency)
+    await asyncio.gather(*(_client(host, port, urls, n * stride, deadline, latencies, statuses)
+                           for n in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    if not latencies:
+        return {"requests": 0, "seconds": elapsed, "rps": 0.0, "p50": None, "p95": None, "p99": None,
+                "max": None, "statuses": dict(statuses)}
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50),
+        "p95": percentile(latencies, 0.95),
+        "p99": percentile(latencies, 0.99),
+        "max": latencies[-1],
+        "statuses": dict(statuses),
+    }
+
+
+async def _wait_for_port(host: str, port: int, timeout: float = 10.0):
+    deadline = time.perf_counter() + timeout
+    while True:
+        try:
+            _, writer = await asyncio.open_connection(host, port)
+            writer.close()
+            return
+        except OSError:
+            if time.perf_counter() > deadline:
+                raise
+            await asyncio.sleep(0.05)
+
+
+def main(db_path: str = 'mmel_db.db', host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+         concurrency: int = 32, duration: float = 10.0, distinct_urls: int = 20000,
+         serve: bool = False, service_args: Optional[List[str]] = None):
+    urls = build_urls(db_path, distinct_urls)
+    server = None
+    if serve:
+        server = subprocess.Popen([sys.executable, str(Path(__file__).with_name("mmel_service.py")),
+                                   "--db", db_path, "--host", host, "--port", str(port)]
+                                  + (service_args or []))
+    try:
+        asyncio.run(_wait_for_port(host, port))
+        print(f"Load testing http://{host}:{port} with {concurrency} connections for {duration:.0f}s "
+              f"({len(set(urls))} distinct URLs)")
+        result = asyncio.run(run_load(host, port, urls, concurrency, duration))
+    finally:
+        if server is not None:
+            server.terminate()
+            server.wait()
+
+    errors = result["statuses"].get("errors", 0)
+    if not result["requests"]:
+        print(f"❌ No request completed in {result['seconds']:.2f}s ({errors:,} connection errors)")
+        return result
+    print(f"📊 {result['requests']:,} requests in {result['seconds']:.2f}s = {result['rps']:,.0f} req/s")
+    print(f"⏱️  latency p50 {result['p50'] * 1000:.2f} ms | p95 {result['p95'] * 1000:.2f} ms | "
+          f"p99 {result['p99'] * 1000:.2f} ms | max {result['max'] * 1000:.2f} ms")
+    # "errors" counts dropped connections; it sorts after the numeric codes
+    print(f"   status codes: {', '.join(f'{k}: {v:,}' for k, v in sorted(result['statuses'].items(), key=str))}")
+    if errors:
+        print(f"⚠️  {errors:,} connections dropped or refused")
+    return result
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Measure throughput and p99 latency of mmel_service.py",
+        epilog="Example: python mmel_loadtest.py --serve --concurrency 64 --duration 10")
+    parser.add_argument("--db", default='mmel_db.db', help="database the URL mix is drawn from")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--concurrency", type=int, default=32, help="keep-alive connections (default: 32)")
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to run (default: 10)")
+    parser.add_argument("--urls", type=int, default=20000,
+                        help="length of the random URL mix cycled through (default: 20000)")
+    parser.add_argument("--serve", action="store_true",
+                        help="start mmel_service.py for the run instead of using a running one")
+    parser.add_argument("--cache-entries", type=int, default=None,
+                        help="with --serve: response cache size passed to the service")
+    args = parser.parse_args()
+
+    service_args = ["--cache-entries", str(args.cache_entries)] if args.cache_entries is not None else []
+    main(args.db, host=args.host, port=args.port, concurrency=args.concurrency,
+         duration=args.duration, distinct_urls=args.urls, serve=args.serve, service_args=service_args)
@@ -0,0 +1,127 @@
+"""Opt-in instrumentation of the extract/parse pipeline.
+
+Off by default: stage() then returns a shared no-op context manager and
+every other hook sits behind a single `if active is not None` check, so a
+normal run pays a few attribute lookups per manual. Once enabled, records
+
+- wall time per stage (open, extract, split, parse, serialize) and, with
+  trace_memory, the tracemalloc peak of each stage above its start,
+- the extraction time of every page (serial and streaming extraction),
+- line tag counts (header lines skipped, ATA sections, items started, ...),
+- how often each parser fallback branch fires,
+
+and reports them as one JSON document (see Instrumentation.report()).
+"""
+import contextlib
+import json
+import time
+import tracemalloc
+from collections import Counter
+from typing import Dict, List, Optional
+
+# The running Instrumentation, or None when disabled
+active: Optional["Instrumentation"] = None
+
+_NULL_STAGE = contextlib.nullcontext()
+
+
+class _Stage:
+    __slots__ = ("name", "start", "base", "peak")
+
+
+class Instrumentation:
+    """Stage timings, page timings and counters of one run"""
+
+    def __init__(self, trace_memory: bool = False):
+        self.trace_memory = trace_memory
+        self.stages: Dict[str, Dict] = {}
+        self.page_seconds: List[float] = []
+        self.counters: Counter = Counter()
+        self._stack: List[_Stage] = []
+        # Whether enable() started tracemalloc, so disable() leaves a caller's tracing running
+        self._started_tracing = False
+
+    def _fold_peak(self):
+        # tracemalloc keeps a single peak, so it is folded into every open
+        # stage before an inner stage resets it
+        peak = tracemalloc.get_traced_memory()[1]
+        for stage in self._stack:
+            stage.peak = max(stage.peak, peak)
+
+    @contextlib.contextmanager
+    def stage(self, name: str):
+        stage = _Stage()
+        stage.name = name
+        if self.trace_memory:
+            self._fold_peak()
+            tracemalloc.reset_peak()
+            stage.base = stage.peak = tracemalloc.get_traced_memory()[0]
+        self._stack.append(stage)
+        stage.start = time.perf_counter()
+        try:
+            yield
+        finally:
+            seconds = time.perf_counter() - stage.start
+            if self.trace_memory:
+                self._fold_peak()
+            self._stack.pop()
+            record = self.stages.setdefault(name, {"seconds": 0.0, "calls": 0})
+            record["seconds"] += seconds
+            record["calls"] += 1
+            if self.trace_memory:
+                record["peak_bytes"] = max(record.get("peak_bytes", 0), stage.peak - stage.base)
+
+    def page(self, number: int, seconds: float):
+        if number >= len(self.page_seconds):
+            self.page_seconds.extend([0.0] * (number + 1 - len(self.page_seconds)))
+        self.page_seconds[number] += seconds
+
+    def count(self, name: str, n: int = 1):
+        self.counters[name] += n
+
+    def report(self, **info) -> Dict:
+        pages = self.page_seconds
+        return dict(info, **{
+            "stages": self.stages,
+            "pages": {
+                "count": len(pages),
+                "seconds": sum(pages),
+                "slowest": sorted(range(len(pages)), key=pages.__getitem__, reverse=True)[:10],
+                "page_seconds": pages,
+            },
+            "counters": dict(sorted(self.counters.items())),
+        })
+
+
+def enable(trace_memory: bool = False) -> Instrumentation:
+    """Start recording into a new Instrumentation and return it"""
+    global active
+    active = Instrumentation(trace_memory)
+    if trace_memory and not tracemalloc.is_tracing():
+        tracemalloc.start()
+        active._started_tracing = True
+    return active
+
+
+def disable() -> Optional[Instrumentation]:
+    """Stop recording; returns what was recorded"""
+    global active
+    instrumentation, active = active, None
+    if instrumentation is not None and instrumentation._started_tracing:
+        tracemalloc.stop()
+    return instrumentation
+
+
+def stage(name: str):
+    """Context manager timing a pipeline stage (no-op when disabled)"""
+    return _NULL_STAGE if active is None else active.stage(name)
+
+
+def count(name: str, n: int = 1):
+    if active is not None:
+        active.counters[name] += n
+
+
+def write_report(instrumentation: Instrumentation, path: str, **info):
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(instrumentation.report(**info), f, indent=2)
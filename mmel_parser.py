@@ -1,661 +1,837 @@
 import re
+import os
 import json
 import sys
+import time
+import argparse
+import contextlib
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import List, Dict
+from typing import List, Dict, Tuple, Iterable, Iterator, TextIO, Optional
 import fitz  # PyMuPDF
 
+import mmel_metrics
+from mmel_binary import BinaryWriter, dump as dump_binary, print_comparison as print_binary_comparison
+from mmel_cache import CACHE_DIR_ENV_VAR, DEFAULT_MAX_BYTES, MMELCache
+from mmel_entry import MMELEntry, StringPool, build_entry, to_dicts
+from mmel_filters import filter_profile_fingerprint, filter_profile_for, load_filter_profiles, page_text
+from mmel_grammar import (
+    A380Grammar, B747Grammar, FAAGrammar, CATEGORIES, classify_lines,
+    ATA_MINOR, ATA_SECTION, BLANK, HEADER, ITEM_START, QUANTITY, CATEGORY, TOC_ENTRY,
+)
+from mmel_layout import LAYOUT_TEMPLATES, iter_layout_rows
+from mmel_sniff import check_aircraft_type, detect_aircraft_type
+
 # Step 1: Extract layout-preserved text from PDF
-def extract_text_from_pdf(pdf_path: str) -> str:
+def _page_ranges(page_count: int, workers: int) -> List[Tuple[int, int]]:
+    """Split page indexes into at most `workers` contiguous (start, stop) ranges"""
+    workers = max(1, min(workers, page_count))
+    size, extra = divmod(page_count, workers)
+    ranges = []
+    start = 0
+    for n in range(workers):
+        stop = start + size + (1 if n < extra else 0)
+        ranges.append((start, stop))
+        start = stop
+    return ranges
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int, options: Dict) -> List[str]:
+    """Worker: open a private fitz handle and extract pages [start, stop)"""
     doc = fitz.open(pdf_path)
-    text = "\n".join(page.get_text("text") for page in doc)
-    return text
+    try:
+        return [page_text(doc[n], options) for n in range(start, stop)]
+    finally:
+        doc.close()
+
+
+def extraction_options(aircraft_type: str, profile: Optional[str] = None) -> Dict:
+    """Top margin and text flags from the filter profile's extraction section,
+    for mmel_filters.page_text().
+
+    Empty (whole page, default flags) when the profile has none.
+    """
+    spec = filter_profile_for(aircraft_type, select_grammar(aircraft_type).default_profile,
+                              profile).extraction
+    options = {}
+    if spec:
+        if spec.get("top"):
+            options["top"] = spec["top"]
+        if spec.get("flags") is not None:
+            flags = 0
+            for name in spec["flags"]:
+                flags |= getattr(fitz, name)
+            options["flags"] = flags
+    return options
+
+
+def _timed_page_texts(doc, options: Dict) -> Iterator[str]:
+    """page.get_text() of every page, recording each page's time"""
+    for page in doc:
+        start = time.perf_counter()
+        text = page_text(page, options)
+        mmel_metrics.active.page(page.number, time.perf_counter() - start)
+        yield text
+
+
+def extract_text_from_pdf(pdf_path: str, workers: int = 1, options: Optional[Dict] = None) -> str:
+    """Text of every page joined by newlines; options are extraction_options()"""
+    options = options or {}
+    if workers <= 1:
+        with mmel_metrics.stage("open"):
+            doc = fitz.open(pdf_path)
+        with doc:
+            if mmel_metrics.active is None:
+                text = "\n".join(page_text(page, options) for page in doc)
+            else:
+                text = "\n".join(_timed_page_texts(doc, options))
+        return text
+
+    # Parallel mode: each worker extracts a contiguous page range and the
+    # chunks are stitched back in page order, so the result is identical
+    # to the serial path.
+    with mmel_metrics.stage("open"):
+        doc = fitz.open(pdf_path)
+    page_count = doc.page_count
+    doc.close()
+    if page_count == 0:
+        return ""
+
+    ranges = _page_ranges(page_count, workers)
+    with ProcessPoolExecutor(max_workers=len(ranges)) as pool:
+        chunks = pool.map(_extract_page_range,
+                          [pdf_path] * len(ranges),
+                          [start for start, _ in ranges],
+                          [stop for _, stop in ranges],
+                          [options] * len(ranges))
+        pages = [page_text for chunk in chunks for page_text in chunk]
+    return "\n".join(pages)
+
+
+def iter_pdf_lines(pdf_path: str, options: Optional[Dict] = None) -> Iterator[str]:
+    """Yield text lines page by page without building the whole document text.
+
+    Produces the same lines as extract_text_from_pdf(pdf_path, options=options)
+    .splitlines(), but only one page is held in memory at a time.
+    """
+    options = options or {}
+    with fitz.open(pdf_path) as doc:
+        if mmel_metrics.active is None:
+            texts = (page_text(page, options) for page in doc)
+        else:
+            texts = _timed_page_texts(doc, options)
+        for text in texts:
+            # Pages are joined with "\n" in the non-streaming path
+            yield from (text + "\n").splitlines()
+
+
+# Precompiled patterns for the column-level parsing done once an item's
+# lines have been collected; line-level patterns live in mmel_grammar
+_QTY_REMARK_RE = re.compile(r"^(\d+)(?:\s+(.+))?")
+_BULLET_RE = re.compile(r"^\(?[a-zA-Z]\)?[\.\)]\s*(.+)")
+_PROCEDURE_MARK_RE = re.compile(r"\(([MO])\)")
+_A380_TITLE_RE = re.compile(r"^(.+?)\s+([A-D])\s+(\d+)\s+(\d+)\s*(.*)$")
+_A380_CAT_QTY_RE = re.compile(r"^([A-D])\s+(\d+)\s+(\d+)")
+_QTY_PAIR_RE = re.compile(r"^(\d+)\s+(\d+)")
+_B747_CAT_QTY_RE = re.compile(r"\b([A-D])\s+(\d+)\s+(\d+)\s+(.+)")
+_B747_CAT_QTY_LINE_RE = re.compile(r"^([A-D])\s+(\d+)\s+(\d+)\s*(.*)$")
+
 
 # Step 2: Identify MMEL item lines and parse them into structured objects
-def parse_mmel_entries(text: str, aircraft_type: str) -> List[Dict]:
-    entries = []
-    current_entry = None
-    current_ata = ""
-    lines = text.splitlines()
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Skip empty lines
-        if not line:
-            i += 1
-            continue
+def _build_faa_entry(aircraft_type: str, ata: str, item_number: str, title_parts: List[str],
+                     deferral_category: str, qty_installed: int, qty_required: int,
+                     remarks: List[str], pool: StringPool) -> MMELEntry:
+    maintenance_procedures = []
+    operational_procedures = []
+    steps = []
+
+    # Extract maintenance and operational procedures
+    for remark in remarks:
+        if "(M)" in remark:
+            maintenance_procedures.append(remark.strip())
+        if "(O)" in remark:
+            operational_procedures.append(remark.strip())
+
+        # Extract bullet points
+        bullet_match = _BULLET_RE.match(remark)
+        if bullet_match:
+            steps.append(bullet_match.group(1).strip())
+
+    return build_entry(pool, aircraft_type, ata, item_number, " ".join(title_parts).strip(),
+                       deferral_category, qty_installed, qty_required, " ".join(remarks).strip(), steps,
+                       maintenance_procedures, operational_procedures)
+
+
+def iter_mmel_entries(lines: Iterable[str], aircraft_type: str,
+                   profile: Optional[str] = None, start_ata: str = "",
+                   pool: Optional[StringPool] = None) -> Iterator[MMELEntry]:
+    """Yield MMEL entries one at a time as they are completed.
+
+    `start_ata` seeds the ATA chapter when parsing starts mid-document.
+    Entry text is interned in `pool` (a new one per call by default), so
+    repeated remarks and procedures are held once.
+    """
+    if pool is None:
+        pool = StringPool()
+    current_ata = start_ata
+    # Column state of the item being collected, None between items:
+    # title -> category -> qty_installed -> qty_required -> remarks
+    state = None
+
+    grammar = FAAGrammar.for_aircraft(aircraft_type, profile)
+
+    for tag, line, match in classify_lines(lines, grammar):
+        if state is not None:
+            # The next MMEL item or a new ATA section closes the current item
+            if tag == ITEM_START or tag == ATA_SECTION:
+                yield _build_faa_entry(aircraft_type, current_ata, item_number, title_parts,
+                                       deferral_category, qty_installed, qty_required, remarks, pool)
+                state = None
+            # Skip empty lines, table headers, and page headers
+            elif tag == BLANK or tag == HEADER:
+                continue
+            elif state == "title":
+                # Category letters are single characters A, B, C, or D on their own line
+                if tag == CATEGORY:
+                    deferral_category = line
+                    state = "qty_installed"
+                else:
+                    # Still part of title
+                    title_parts.append(line)
+                continue
+            elif state == "qty_installed":
+                # Should be a number
+                if tag == QUANTITY:
+                    qty_installed = int(line)
+                    state = "qty_required"
+                else:
+                    # If not a digit, assume it's still part of title or remarks
+                    if deferral_category:  # We already have category, this must be remarks
+                        mmel_metrics.count("fallback.faa_qty_installed_as_remarks")
+                        remarks.append(line)
+                        state = "remarks"
+                    else:
+                        mmel_metrics.count("fallback.faa_qty_installed_as_title")
+                        title_parts.append(line)
+                continue
+            elif state == "qty_required":
+                # Look for pattern like "0 (M)(O) May be inoperative..." or just "0"
+                qty_match = _QTY_REMARK_RE.match(line)
+                if qty_match:
+                    qty_required = int(qty_match.group(1))
+                    if qty_match.group(2):
+                        remarks.append(qty_match.group(2))
+                else:
+                    # Not a quantity pattern, treat as remark
+                    mmel_metrics.count("fallback.faa_qty_required_as_remarks")
+                    remarks.append(line)
+                state = "remarks"
+                continue
+            else:  # state == "remarks"
+                # Everything else is remarks
+                remarks.append(line)
+                continue
 
         # Detect ATA section (e.g., "21. Air Conditioning")
-        ata_match = re.match(r"^(\d{2})\.\s+(.+)", line)
-        if ata_match:
-            current_ata = ata_match.group(1)
-            i += 1
-            continue
+        if tag == ATA_SECTION:
+            current_ata = match.group("ata")
 
-        # Match a new MMEL item number 
+        # Match a new MMEL item number
         # Airbus format: "21-21-01" or Boeing format: "-21-01"
-        item_match = re.match(r"^(\d{2}-\d{2}-\d{2}(?:-\d{2})*)$", line)  # Airbus format
-        boeing_match = re.match(r"^(-\d{2}-\d{2}(?:-\d{2})*)$", line)      # Boeing format
-        
-        if (item_match or boeing_match) and current_ata:
-            # Save previous entry if exists
-            if current_entry:
-                entries.append(current_entry)
-            
-            if item_match:
-                item_number = item_match.group(1)
+        elif tag == ITEM_START and current_ata:
+            if match.group("airbus"):
+                item_number = match.group("airbus")
             else:
                 # Boeing format: add current ATA prefix to the item number
-                boeing_item = boeing_match.group(1)
-                item_number = current_ata + boeing_item  # e.g., "21" + "-21-01" = "21-21-01"
-            
-            # Parse the entry structure
+                item_number = current_ata + match.group("boeing")  # e.g., "21" + "-21-01" = "21-21-01"
+
             title_parts = []
             deferral_category = ""
             qty_installed = 0
             qty_required = 0
             remarks = []
-            
-            # Look ahead to gather title, category, quantities, and remarks
-            j = i + 1
-            state = "title"  # title -> category -> qty_installed -> qty_required -> remarks
-            
-            while j < len(lines):
-                next_line = lines[j].strip()
-                
-                # Check if we've hit the next MMEL item
-                if (re.match(r"^(\d{2}-\d{2}-\d{2}(?:-\d{2})*)$", next_line) or
-                    re.match(r"^(-\d{2}-\d{2}(?:-\d{2})*)$", next_line)):
-                    break
-                
-                # Check if we've hit a new ATA section
-                if re.match(r"^(\d{2})\.\s+(.+)", next_line):
-                    break
-                
-                # Skip empty lines, table headers, and page headers
-                if (not next_line or 
-                    next_line in ["Item", "Change", "Bar", "Sequence No."] or
-                    next_line.startswith("U.S. DEPARTMENT OF TRANSPORTATION") or
-                    next_line.startswith("FEDERAL AVIATION ADMINISTRATION") or
-                    next_line.startswith("MASTER MINIMUM EQUIPMENT LIST") or
-                    next_line.startswith("REVISION NO.") or
-                    next_line.startswith("DATE:") or
-                    next_line.startswith("PAGE NO.") or
-                    next_line.startswith("AIRCRAFT:") or
-                    next_line.startswith("Airbus") or
-                    next_line.startswith("TABLE KEY") or
-                    next_line.startswith("1. REPAIR CATEGORY") or
-                    next_line.startswith("2. NO. INSTALLED") or
-                    next_line.startswith("3. NO. REQUIRED") or
-                    next_line.startswith("4. REMARKS OR EXCEPTIONS")):
-                    j += 1
-                    continue
-                
-                # Parse based on current state
-                if state == "title":
-                    # Category letters are single characters A, B, C, or D on their own line
-                    if next_line in ["A", "B", "C", "D"]:
-                        deferral_category = next_line
-                        state = "qty_installed"
-                    else:
-                        # Still part of title
-                        title_parts.append(next_line)
-                elif state == "qty_installed":
-                    # Should be a number
-                    if next_line.isdigit():
-                        qty_installed = int(next_line)
-                        state = "qty_required"
-                    else:
-                        # If not a digit, assume it's still part of title or remarks
-                        if deferral_category:  # We already have category, this must be remarks
-                            remarks.append(next_line)
-                            state = "remarks"
-                        else:
-                            title_parts.append(next_line)
-                elif state == "qty_required":
-                    # Look for pattern like "0 (M)(O) May be inoperative..." or just "0"
-                    qty_match = re.match(r"^(\d+)(?:\s+(.+))?", next_line)
-                    if qty_match:
-                        qty_required = int(qty_match.group(1))
-                        if qty_match.group(2):
-                            remarks.append(qty_match.group(2))
-                        state = "remarks"
-                    else:
-                        # Not a quantity pattern, treat as remark
-                        remarks.append(next_line)
-                        state = "remarks"
-                else:  # state == "remarks"
-                    # Everything else is remarks
-                    remarks.append(next_line)
-                
-                j += 1
-            
-            # Create the entry
-            current_entry = {
-                "aircraftType": aircraft_type,
-                "ataChapter": current_ata,
-                "itemNumber": item_number,
-                "title": " ".join(title_parts).strip(),
-                "deferralCategory": deferral_category,
-                "quantityInstalled": qty_installed,
-                "quantityRequired": qty_required,
-                "remarks": {
-                    "summary": "",
-                    "steps": []
-                },
-                "maintenanceProcedures": [],
-                "operationalProcedures": [],
-            }
-            
-            # Process remarks to categorize them
-            full_remarks = " ".join(remarks).strip()
-            current_entry["remarks"]["summary"] = full_remarks
-            
-            # Extract maintenance and operational procedures
-            for remark in remarks:
-                if "(M)" in remark:
-                    current_entry["maintenanceProcedures"].append(remark.strip())
-                if "(O)" in remark:
-                    current_entry["operationalProcedures"].append(remark.strip())
-                
-                # Extract bullet points
-                bullet_match = re.match(r"^\(?[a-zA-Z]\)?[\.\)]\s*(.+)", remark)
-                if bullet_match:
-                    current_entry["remarks"]["steps"].append(bullet_match.group(1).strip())
-            
-            # Move to the last processed line
-            i = j - 1
-        
-        i += 1
-    
+            state = "title"
+
     # Add the last entry
-    if current_entry:
-        entries.append(current_entry)
+    if state is not None:
+        yield _build_faa_entry(aircraft_type, current_ata, item_number, title_parts,
+                               deferral_category, qty_installed, qty_required, remarks, pool)
 
-    return entries
 
+def parse_mmel_entries(text: str, aircraft_type: str,
+                    profile: Optional[str] = None) -> List[MMELEntry]:
+    return list(iter_mmel_entries(text.splitlines(), aircraft_type, profile))
+
+
+def _split_procedures(remarks_text: str) -> Tuple[List[str], List[str]]:
+    """Split a remarks column into (M) maintenance and (O) operational procedures"""
+    maintenance_procedures = []
+    operational_procedures = []
+
+    # Look for (M) and (O) patterns in remarks
+    if remarks_text:
+        # Split by (M) and (O) patterns
+        parts = _PROCEDURE_MARK_RE.split(remarks_text)
+        current_type = None
+
+        for part in parts:
+            part = part.strip()
+            if part in ['M', 'O']:
+                current_type = part
+            elif part and current_type:
+                if current_type == 'M':
+                    maintenance_procedures.append(f"({current_type}){part}")
+                else:
+                    operational_procedures.append(f"({current_type}){part}")
+
+        # If no specific procedures found, treat as general remark
+        if not maintenance_procedures and not operational_procedures and remarks_text:
+            if '(M)' in remarks_text:
+                maintenance_procedures.append(remarks_text)
+            elif '(O)' in remarks_text:
+                operational_procedures.append(remarks_text)
+
+    return maintenance_procedures, operational_procedures
+
+
+def _build_tabular_entry(aircraft_type: str, ata: str, item_number: str, title: str,
+                         deferral_category: str, qty_installed: int, qty_required: int,
+                         remarks_text: str, pool: StringPool) -> MMELEntry:
+    maintenance_procedures, operational_procedures = _split_procedures(remarks_text)
+
+    return build_entry(pool, aircraft_type, ata, item_number, title, deferral_category,
+                       qty_installed, qty_required, remarks_text, (),
+                       maintenance_procedures, operational_procedures)
+
+
+def _build_a380_entry(aircraft_type: str, ata: str, item_number: str,
+                      entry_lines: List[str], pool: StringPool, previous_remarks: str = "") -> MMELEntry:
+    """Parse the collected lines of one A-380 item.
+
+    When the fallback path finds no remarks column, the remarks of the
+    previous item are kept, as the A-380 parser has always done.
+    """
+    remarks_text = previous_remarks
+    deferral_category = ""
+    qty_installed = 0
+    qty_required = 0
+    remarks_parts = []
+
+    # Parse the collected entry lines
+    all_text = " ".join(entry_lines)
+
+    # Extract title (everything before category)
+    title_match = _A380_TITLE_RE.match(all_text)
+    if title_match:
+        title = title_match.group(1).strip()
+        deferral_category = title_match.group(2)
+        qty_installed = int(title_match.group(3))
+        qty_required = int(title_match.group(4))
+        remarks_text = title_match.group(5).strip()
+    else:
+        # Try alternative pattern where category might be on separate line
+        mmel_metrics.count("fallback.a380_title_match")
+        title_parts = []
+        category_found = False
+
+        for entry_line in entry_lines:
+            # Check if this line contains a single category letter
+            if not category_found and entry_line in CATEGORIES:
+                deferral_category = entry_line
+                category_found = True
+                continue
+
+            # Check if this line contains quantities
+            qty_match = _A380_CAT_QTY_RE.match(entry_line)
+            if qty_match:
+                deferral_category = qty_match.group(1)
+                qty_installed = int(qty_match.group(2))
+                qty_required = int(qty_match.group(3))
+                # Rest of the line is remarks
+                remarks_text = entry_line[len(qty_match.group(0)):].strip()
+                break
+
+            # Check for quantity patterns without category
+            qty_only_match = _QTY_PAIR_RE.match(entry_line)
+            if qty_only_match and not category_found:
+                qty_installed = int(qty_only_match.group(1))
+                qty_required = int(qty_only_match.group(2))
+                remarks_text = entry_line[len(qty_only_match.group(0)):].strip()
+                break
+
+            # Otherwise, add to title
+            if not category_found:
+                title_parts.append(entry_line)
+            else:
+                # Add to remarks
+                remarks_parts.append(entry_line)
+
+        title = " ".join(title_parts).strip()
+        if not title and entry_lines:
+            mmel_metrics.count("fallback.untitled_first_line")
+            title = entry_lines[0].strip()
+
+        if remarks_parts:
+            remarks_text = " ".join(remarks_parts).strip()
+
+    # Clean up title - remove "***" markers
+    title = title.replace("***", "").strip()
+
+    return _build_tabular_entry(aircraft_type, ata, item_number, title, deferral_category,
+                                qty_installed, qty_required, remarks_text, pool)
+
+
+def iter_a380_mmel_entries(lines: Iterable[str], aircraft_type: str,
+                        profile: Optional[str] = None, start_ata: str = "",
+                        pool: Optional[StringPool] = None) -> Iterator[MMELEntry]:
+    """Yield A-380 MMEL entries with tabular format"""
+    if pool is None:
+        pool = StringPool()
+    current_ata = start_ata
+    remarks_text = ""
+    entry_lines = None  # lines of the item being collected, None between items
+
+    grammar = A380Grammar.for_aircraft(aircraft_type, profile)
+
+    for tag, line, match in classify_lines(lines, grammar):
+        if entry_lines is not None:
+            # Stop at another MMEL item or a new ATA section
+            if tag == ITEM_START or tag == ATA_SECTION or tag == ATA_MINOR:
+                entry = _build_a380_entry(aircraft_type, current_ata, item_number, entry_lines,
+                                          pool, remarks_text)
+                remarks_text = entry.remarks.summary
+                yield entry
+                entry_lines = None
+            # Skip headers and empty lines
+            elif tag == BLANK or tag == HEADER:
+                continue
+            else:
+                entry_lines.append(line)
+                continue
 
-def parse_a380_mmel_entries(text: str, aircraft_type: str) -> List[Dict]:
-    """Parse A-380 MMEL entries with tabular format"""
-    entries = []
-    lines = text.splitlines()
-    current_ata = ""
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Skip empty lines
-        if not line:
-            i += 1
-            continue
-        
         # Detect ATA section header (e.g., "21  AIR CONDITIONING")
-        ata_match = re.match(r"^(\d{2})\s+(.+)", line)
-        if ata_match and len(ata_match.group(2)) > 3:  # Ensure it's a section header
-            current_ata = ata_match.group(1)
-            i += 1
-            continue
-        
-        # Skip table headers and page headers
-        if (line.startswith("U.S. DEPARTMENT OF TRANSPORTATION") or
-            line.startswith("FEDERAL AVIATION ADMINISTRATION") or
-            line.startswith("MASTER MINIMUM EQUIPMENT LIST") or
-            line.startswith("AIRCRAFT:") or
-            line.startswith("REVISION NO") or
-            line.startswith("DATE:") or
-            line.startswith("PAGE:") or
-            line.startswith("SYSTEM &") or
-            line.startswith("SEQUENCE") or
-            line.startswith("ITEM") or
-            line.startswith("NUMBER") or
-            line.startswith("REQUIRED FOR DISPATCH") or
-            line.startswith("REMARKS OR EXCEPTIONS") or
-            line.startswith("1.") or
-            line.startswith("2.") or
-            line.startswith("3.") or
-            line.startswith("4.") or
-            line == "A-380"):
-            i += 1
-            continue
-        
-        # Look for MMEL item patterns in A-380 format
-        # Pattern 1: Two-digit sequence (like "03-04")
-        seq_match = re.match(r"^(\d{2}-\d{2})\s+(.+)", line)
-        # Pattern 2: Three-digit sequence (like "21-03")  
-        full_match = re.match(r"^(\d{2}-\d{2}-\d{2})\s+(.+)", line)
-        
-        if seq_match or full_match:
-            if full_match:
-                item_number = full_match.group(1)
-                remaining_text = full_match.group(2)
+        if tag == ATA_SECTION:
+            current_ata = match.group("ata")
+
+        # MMEL items are "03-04 ..." sequences within the current chapter
+        # or full "21-03-01 ..." item numbers
+        elif tag == ITEM_START:
+            if match.group("full"):
+                item_number = match.group("full")
             else:
                 # For sequences like "03-04", prepend current ATA chapter
-                seq_number = seq_match.group(1)
-                item_number = f"{current_ata}-{seq_number}"
-                remaining_text = seq_match.group(2)
-            
-            # Parse the remaining text to extract title, category, quantities, and remarks
-            title_parts = []
-            deferral_category = ""
-            qty_installed = 0
-            qty_required = 0
-            remarks_parts = []
-            
-            # Look for category and quantities in the remaining text and subsequent lines
-            title_line = remaining_text
-            
-            # Look ahead to collect full entry information
-            j = i + 1
-            entry_lines = [title_line]
-            
-            while j < len(lines):
-                next_line = lines[j].strip()
-                
-                # Stop if we hit another MMEL item
-                if (re.match(r"^(\d{2}-\d{2})\s+(.+)", next_line) or
-                    re.match(r"^(\d{2}-\d{2}-\d{2})\s+(.+)", next_line)):
-                    break
-                
-                # Stop if we hit a new ATA section
-                if re.match(r"^(\d{2})\s+(.+)", next_line) and len(next_line.split()) > 1:
-                    break
-                
-                # Skip headers and empty lines
-                if (not next_line or
-                    next_line.startswith("U.S. DEPARTMENT OF TRANSPORTATION") or
-                    next_line.startswith("FEDERAL AVIATION ADMINISTRATION") or
-                    next_line.startswith("MASTER MINIMUM EQUIPMENT LIST") or
-                    next_line.startswith("AIRCRAFT:") or
-                    next_line.startswith("REVISION NO") or
-                    next_line.startswith("DATE:") or
-                    next_line.startswith("PAGE:") or
-                    next_line.startswith("SYSTEM &") or
-                    next_line.startswith("SEQUENCE") or
-                    next_line.startswith("ITEM") or
-                    next_line.startswith("NUMBER") or
-                    next_line.startswith("REQUIRED FOR DISPATCH") or
-                    next_line.startswith("REMARKS OR EXCEPTIONS") or
-                    next_line.startswith("1.") or
-                    next_line.startswith("2.") or
-                    next_line.startswith("3.") or
-                    next_line.startswith("4.") or
-                    next_line == "A-380"):
-                    j += 1
-                    continue
-                
-                entry_lines.append(next_line)
-                j += 1
-            
-            # Parse the collected entry lines
-            all_text = " ".join(entry_lines)
-            
-            # Extract title (everything before category)
-            title_match = re.match(r"^(.+?)\s+([A-D])\s+(\d+)\s+(\d+)\s*(.*)$", all_text)
-            if title_match:
-                title = title_match.group(1).strip()
-                deferral_category = title_match.group(2)
-                qty_installed = int(title_match.group(3))
-                qty_required = int(title_match.group(4))
-                remarks_text = title_match.group(5).strip()
+                item_number = f"{current_ata}-{match.group('seq')}"
+            entry_lines = [match.group("rest")]
+
+    if entry_lines is not None:
+        yield _build_a380_entry(aircraft_type, current_ata, item_number, entry_lines,
+                                pool, remarks_text)
+
+
+def parse_a380_mmel_entries(text: str, aircraft_type: str,
+                         profile: Optional[str] = None) -> List[MMELEntry]:
+    """Parse A-380 MMEL entries with tabular format"""
+    return list(iter_a380_mmel_entries(text.splitlines(), aircraft_type, profile))
+
+
+def _build_b747_400_entry(aircraft_type: str, ata: str, item_number: str,
+                          entry_lines: List[str], pool: StringPool) -> MMELEntry:
+    """Parse the collected lines of one B-747-400 item"""
+    deferral_category = ""
+    qty_installed = 0
+    qty_required = 0
+    remarks_parts = []
+
+    # Parse the collected entry lines
+    all_text = " ".join(entry_lines)
+
+    # Try to parse category, quantities, and remarks
+    # Look for pattern: title [category] [qty1] [qty2] remarks
+    # B747-400 format: "item_desc C 2 0 (M)(O) May be inoperative..."
+
+    # First try to find category and quantities in the text
+    category_qty_match = _B747_CAT_QTY_RE.search(all_text)
+    if category_qty_match:
+        # Extract title (everything before the category)
+        title_end = all_text.find(category_qty_match.group(0))
+        title = all_text[:title_end].strip()
+
+        deferral_category = category_qty_match.group(1)
+        qty_installed = int(category_qty_match.group(2))
+        qty_required = int(category_qty_match.group(3))
+        remarks_text = category_qty_match.group(4).strip()
+    else:
+        # Try alternative parsing
+        mmel_metrics.count("fallback.b747_category_qty_match")
+        title_parts = []
+        category_found = False
+
+        for entry_line in entry_lines:
+            # Check if this line contains category and quantities
+            cat_qty_match = _B747_CAT_QTY_LINE_RE.match(entry_line)
+            if cat_qty_match:
+                deferral_category = cat_qty_match.group(1)
+                qty_installed = int(cat_qty_match.group(2))
+                qty_required = int(cat_qty_match.group(3))
+                remarks_text = cat_qty_match.group(4).strip()
+                category_found = True
+                break
+
+            # Check for standalone category
+            if not category_found and entry_line in CATEGORIES:
+                deferral_category = entry_line
+                category_found = True
+                continue
+
+            # Otherwise, add to title or remarks
+            if not category_found:
+                title_parts.append(entry_line)
             else:
-                # Try alternative pattern where category might be on separate line
-                title_parts = []
-                category_found = False
-                
-                for entry_line in entry_lines:
-                    # Check if this line contains a single category letter
-                    if not category_found and entry_line in ["A", "B", "C", "D"]:
-                        deferral_category = entry_line
-                        category_found = True
-                        continue
-                    
-                    # Check if this line contains quantities
-                    qty_match = re.match(r"^([A-D])\s+(\d+)\s+(\d+)", entry_line)
-                    if qty_match:
-                        deferral_category = qty_match.group(1)
-                        qty_installed = int(qty_match.group(2))
-                        qty_required = int(qty_match.group(3))
-                        # Rest of the line is remarks
-                        remarks_text = entry_line[len(qty_match.group(0)):].strip()
-                        break
-                    
-                    # Check for quantity patterns without category
-                    qty_only_match = re.match(r"^(\d+)\s+(\d+)", entry_line)
-                    if qty_only_match and not category_found:
-                        qty_installed = int(qty_only_match.group(1))
-                        qty_required = int(qty_only_match.group(2))
-                        remarks_text = entry_line[len(qty_only_match.group(0)):].strip()
-                        break
-                    
-                    # Otherwise, add to title
-                    if not category_found:
-                        title_parts.append(entry_line)
-                    else:
-                        # Add to remarks
-                        remarks_parts.append(entry_line)
-                
-                title = " ".join(title_parts).strip()
-                if not title and entry_lines:
-                    title = entry_lines[0].strip()
-                
-                if remarks_parts:
-                    remarks_text = " ".join(remarks_parts).strip()
-            
-            # Clean up title - remove "***" markers
-            title = re.sub(r'\*\*\*', '', title).strip()
-            
-            # Parse remarks to extract maintenance and operational procedures
-            maintenance_procedures = []
-            operational_procedures = []
-            remarks_summary = remarks_text
-            
-            # Look for (M) and (O) patterns in remarks
-            if remarks_text:
-                # Split by (M) and (O) patterns
-                parts = re.split(r'\(([MO])\)', remarks_text)
-                current_type = None
-                
-                for part in parts:
-                    part = part.strip()
-                    if part in ['M', 'O']:
-                        current_type = part
-                    elif part and current_type:
-                        if current_type == 'M':
-                            maintenance_procedures.append(f"({current_type}){part}")
-                        else:
-                            operational_procedures.append(f"({current_type}){part}")
-                
-                # If no specific procedures found, treat as general remark
-                if not maintenance_procedures and not operational_procedures and remarks_text:
-                    if '(M)' in remarks_text:
-                        maintenance_procedures.append(remarks_text)
-                    elif '(O)' in remarks_text:
-                        operational_procedures.append(remarks_text)
-            
-            # Create MMEL entry
-            entry = {
-                "aircraftType": aircraft_type,
-                "ataChapter": current_ata,
-                "itemNumber": item_number,
-                "title": title,
-                "deferralCategory": deferral_category,
-                "quantityInstalled": qty_installed,
-                "quantityRequired": qty_required,
-                "remarks": {
-                    "summary": remarks_summary,
-                    "steps": []
-                },
-                "maintenanceProcedures": maintenance_procedures,
-                "operationalProcedures": operational_procedures
-            }
-            
-            entries.append(entry)
-            i = j - 1  # Continue from where we left off
-        
-        i += 1
-    
-    return entries
-
-
-def parse_b747_400_mmel_entries(text: str, aircraft_type: str) -> List[Dict]:
-    """Parse B-747-400 MMEL entries with Boeing tabular format"""
-    entries = []
-    lines = text.splitlines()
-    current_ata = ""
-    
-    i = 0
-    while i < len(lines):
-        line = lines[i].strip()
-        
-        # Skip empty lines
-        if not line:
-            i += 1
-            continue
-        
-        # Detect ATA section header (e.g., "21. Air Conditioning")
-        ata_match = re.match(r"^(\d{2})\.\s+(.+)", line)
-        if ata_match:
-            current_ata = ata_match.group(1)
-            i += 1
-            continue
-        
-        # Skip table headers and page headers
-        if (line.startswith("U.S. DEPARTMENT OF TRANSPORTATION") or
-            line.startswith("FEDERAL AVIATION ADMINISTRATION") or
-            line.startswith("MASTER MINIMUM EQUIPMENT LIST") or
-            line.startswith("AIRCRAFT:") or
-            line.startswith("REVISION NO") or
-            line.startswith("DATE:") or
-            line.startswith("PAGE NO") or
-            line.startswith("TABLE KEY") or
-            line.startswith("1. REPAIR CATEGORY") or
-            line.startswith("2. NO. INSTALLED") or
-            line.startswith("3. NO. REQUIRED") or
-            line.startswith("4. REMARKS OR EXCEPTIONS") or
-            line.startswith("Sequence No.") or
-            line.startswith("Item") or
-            line.startswith("Change") or
-            line.startswith("Bar") or
-            line in ["1", "2", "3", "4"] or
-            line.startswith("B-747-400") or
-            line.startswith("TABLE OF CONTENTS") or
-            line.startswith("SYSTEM NO.") or
-            line.startswith("SYSTEM") or
-            line.startswith("PAGE NO.") or
-            line.startswith("REV NO.") or
-            line.startswith("HIGHLIGHTS OF CHANGE") or
-            "thru" in line):  # Skip table of contents entries
-            i += 1
-            continue
-        
-        # Look for MMEL item patterns in B747-400 format
-        # Pattern: sequence like "31-1", "32-2", etc.
-        seq_match = re.match(r"^(\d{2}-\d{1,2})\s+(.+)", line)
-        # Also check for patterns like "31-1A" or "31-1B"
-        seq_alpha_match = re.match(r"^(\d{2}-\d{1,2}[A-Z])\s+(.+)", line)
-        
-        if seq_match or seq_alpha_match:
-            if seq_alpha_match:
-                seq_number = seq_alpha_match.group(1)
-                remaining_text = seq_alpha_match.group(2)
+                remarks_parts.append(entry_line)
+
+        title = " ".join(title_parts).strip()
+        if not title and entry_lines:
+            mmel_metrics.count("fallback.untitled_first_line")
+            title = entry_lines[0].strip()
+
+        if remarks_parts:
+            remarks_text = " ".join(remarks_parts).strip()
+        else:
+            remarks_text = ""
+
+    # Clean up title
+    title = " ".join(title.split())
+
+    return _build_tabular_entry(aircraft_type, ata, item_number, title, deferral_category,
+                                qty_installed, qty_required, remarks_text, pool)
+
+
+def iter_b747_400_mmel_entries(lines: Iterable[str], aircraft_type: str,
+                            profile: Optional[str] = None, start_ata: str = "",
+                            pool: Optional[StringPool] = None) -> Iterator[MMELEntry]:
+    """Yield B-747-400 MMEL entries with Boeing tabular format"""
+    if pool is None:
+        pool = StringPool()
+    current_ata = start_ata
+    entry_lines = None  # lines of the item being collected, None between items
+
+    grammar = B747Grammar.for_aircraft(aircraft_type, profile)
+
+    for tag, line, match in classify_lines(lines, grammar):
+        if entry_lines is not None:
+            # Stop at another MMEL item (table of contents ones included)
+            # or a new ATA section
+            if tag == ITEM_START or tag == TOC_ENTRY or tag == ATA_SECTION:
+                yield _build_b747_400_entry(aircraft_type, current_ata, item_number, entry_lines, pool)
+                entry_lines = None
+            # Skip headers and empty lines
+            elif tag == BLANK or tag == HEADER:
+                continue
             else:
-                seq_number = seq_match.group(1)
-                remaining_text = seq_match.group(2)
-            
+                entry_lines.append(line)
+                continue
+
+        # Detect ATA section header (e.g., "21. Air Conditioning")
+        if tag == ATA_SECTION:
+            current_ata = match.group("ata")
+
+        # Look for MMEL item patterns in B747-400 format: sequences like
+        # "31-1", "32-2" or "31-1A"; table of contents entries are skipped
+        elif tag == ITEM_START:
+            seq_number = match.group("alpha") or match.group("seq")
             # Create full item number with ATA chapter
             item_number = f"{current_ata}-{seq_number}"
-            
-            # Parse the remaining text to extract title, category, quantities, and remarks
-            title_parts = []
-            deferral_category = ""
-            qty_installed = 0
-            qty_required = 0
-            remarks_parts = []
-            
-            # Look ahead to collect full entry information
-            j = i + 1
-            entry_lines = [remaining_text]
-            
-            while j < len(lines):
-                next_line = lines[j].strip()
-                
-                # Stop if we hit another MMEL item
-                if (re.match(r"^(\d{2}-\d{1,2})\s+(.+)", next_line) or
-                    re.match(r"^(\d{2}-\d{1,2}[A-Z])\s+(.+)", next_line)):
-                    break
-                
-                # Stop if we hit a new ATA section
-                if re.match(r"^(\d{2})\.\s+(.+)", next_line):
-                    break
-                
-                # Skip headers and empty lines
-                if (not next_line or
-                    next_line.startswith("U.S. DEPARTMENT OF TRANSPORTATION") or
-                    next_line.startswith("FEDERAL AVIATION ADMINISTRATION") or
-                    next_line.startswith("MASTER MINIMUM EQUIPMENT LIST") or
-                    next_line.startswith("AIRCRAFT:") or
-                    next_line.startswith("REVISION NO") or
-                    next_line.startswith("DATE:") or
-                    next_line.startswith("PAGE NO") or
-                    next_line.startswith("TABLE KEY") or
-                    next_line.startswith("1. REPAIR CATEGORY") or
-                    next_line.startswith("2. NO. INSTALLED") or
-                    next_line.startswith("3. NO. REQUIRED") or
-                    next_line.startswith("4. REMARKS OR EXCEPTIONS") or
-                    next_line.startswith("Sequence No.") or
-                    next_line.startswith("Item") or
-                    next_line.startswith("Change") or
-                    next_line.startswith("Bar") or
-                    next_line in ["1", "2", "3", "4"] or
-                    next_line.startswith("B-747-400") or
-                    next_line.startswith("|")):  # Skip continuation bars
-                    j += 1
-                    continue
-                
-                entry_lines.append(next_line)
-                j += 1
-            
-            # Parse the collected entry lines
-            all_text = " ".join(entry_lines)
-            
-            # Try to parse category, quantities, and remarks
-            # Look for pattern: title [category] [qty1] [qty2] remarks
-            # B747-400 format: "item_desc C 2 0 (M)(O) May be inoperative..."
-            
-            # First try to find category and quantities in the text
-            category_qty_match = re.search(r'\b([A-D])\s+(\d+)\s+(\d+)\s+(.+)', all_text)
-            if category_qty_match:
-                # Extract title (everything before the category)
-                title_end = all_text.find(category_qty_match.group(0))
-                title = all_text[:title_end].strip()
-                
-                deferral_category = category_qty_match.group(1)
-                qty_installed = int(category_qty_match.group(2))
-                qty_required = int(category_qty_match.group(3))
-                remarks_text = category_qty_match.group(4).strip()
-            else:
-                # Try alternative parsing
-                title_parts = []
-                category_found = False
-                
-                for entry_line in entry_lines:
-                    # Check if this line contains category and quantities
-                    cat_qty_match = re.match(r'^([A-D])\s+(\d+)\s+(\d+)\s*(.*)$', entry_line)
-                    if cat_qty_match:
-                        deferral_category = cat_qty_match.group(1)
-                        qty_installed = int(cat_qty_match.group(2))
-                        qty_required = int(cat_qty_match.group(3))
-                        remarks_text = cat_qty_match.group(4).strip()
-                        category_found = True
-                        break
-                    
-                    # Check for standalone category
-                    if not category_found and entry_line in ["A", "B", "C", "D"]:
-                        deferral_category = entry_line
-                        category_found = True
-                        continue
-                    
-                    # Otherwise, add to title or remarks
-                    if not category_found:
-                        title_parts.append(entry_line)
-                    else:
-                        remarks_parts.append(entry_line)
-                
-                title = " ".join(title_parts).strip()
-                if not title and entry_lines:
-                    title = entry_lines[0].strip()
-                
-                if remarks_parts:
-                    remarks_text = " ".join(remarks_parts).strip()
-                else:
-                    remarks_text = ""
-            
-            # Clean up title
-            title = re.sub(r'\s+', ' ', title).strip()
-            
-            # Parse remarks to extract maintenance and operational procedures
-            maintenance_procedures = []
-            operational_procedures = []
-            remarks_summary = remarks_text
-            
-            # Look for (M) and (O) patterns in remarks
-            if remarks_text:
-                # Split by (M) and (O) patterns
-                parts = re.split(r'\(([MO])\)', remarks_text)
-                current_type = None
-                
-                for part in parts:
-                    part = part.strip()
-                    if part in ['M', 'O']:
-                        current_type = part
-                    elif part and current_type:
-                        if current_type == 'M':
-                            maintenance_procedures.append(f"({current_type}){part}")
-                        else:
-                            operational_procedures.append(f"({current_type}){part}")
-                
-                # If no specific procedures found, treat as general remark
-                if not maintenance_procedures and not operational_procedures and remarks_text:
-                    if '(M)' in remarks_text:
-                        maintenance_procedures.append(remarks_text)
-                    elif '(O)' in remarks_text:
-                        operational_procedures.append(remarks_text)
-            
-            # Create MMEL entry
-            entry = {
-                "aircraftType": aircraft_type,
-                "ataChapter": current_ata,
-                "itemNumber": item_number,
-                "title": title,
-                "deferralCategory": deferral_category,
-                "quantityInstalled": qty_installed,
-                "quantityRequired": qty_required,
-                "remarks": {
-                    "summary": remarks_summary,
-                    "steps": []
-                },
-                "maintenanceProcedures": maintenance_procedures,
-                "operationalProcedures": operational_procedures
-            }
-            
-            entries.append(entry)
-            i = j - 1  # Continue from where we left off
-        
-        i += 1
-    
-    return entries
+            entry_lines = [match.group("rest")]
+
+    if entry_lines is not None:
+        yield _build_b747_400_entry(aircraft_type, current_ata, item_number, entry_lines, pool)
+
+
+def parse_b747_400_mmel_entries(text: str, aircraft_type: str,
+                             profile: Optional[str] = None) -> List[MMELEntry]:
+    """Parse B-747-400 MMEL entries with Boeing tabular format"""
+    return list(iter_b747_400_mmel_entries(text.splitlines(), aircraft_type, profile))
+
+
+def iter_layout_entries(pdf_path: str, aircraft_type: str,
+                        profile: Optional[str] = None) -> Iterator[MMELEntry]:
+    """Yield tabular MMEL entries from word coordinates (see mmel_layout).
+
+    One entry per category/quantity row, so items with several dispatch
+    conditions appear once per condition under the same item number.
+    """
+    template = LAYOUT_TEMPLATES.get(aircraft_type)
+    if template is None:
+        raise ValueError(f"No layout template for {aircraft_type}; "
+                         f"layout extraction supports {', '.join(LAYOUT_TEMPLATES)}")
+    grammar = select_grammar(aircraft_type).for_aircraft(aircraft_type, profile)
+    pool = StringPool()
+    for ata, item_number, title, category, installed, required, remarks in \
+            iter_layout_rows(pdf_path, template, grammar, extraction_options(aircraft_type, profile)):
+        yield _build_tabular_entry(aircraft_type, ata, item_number, title, category,
+                                   installed, required, remarks, pool)
+
+
+def write_json_stream(entries: Iterable[Dict], f: TextIO) -> int:
+    """Write entries as a JSON array while they are produced.
+
+    The output is byte-identical to json.dump(list(entries), f, indent=2,
+    ensure_ascii=False). Returns the number of entries written.
+    """
+    count = 0
+    for entry in entries:
+        f.write("[\n" if count == 0 else ",\n")
+        encoded = json.dumps(entry, indent=2, ensure_ascii=False)
+        f.write("\n".join("  " + line for line in encoded.split("\n")))
+        count += 1
+    f.write("\n]" if count else "[]")
+    return count
+
+
+def write_jsonl_stream(entries: Iterable[Dict], f: TextIO) -> int:
+    """Write one compact JSON entry per line (JSON Lines) as entries are produced.
+
+    Returns the number of entries written.
+    """
+    count = 0
+    for entry in entries:
+        f.write(json.dumps(entry, ensure_ascii=False))
+        f.write("\n")
+        count += 1
+    return count
+
+
+def _open_output(output_path: str):
+    """Text file for writing, or stdout for "-" (so output can be piped)"""
+    if output_path == "-":
+        return contextlib.nullcontext(sys.stdout)
+    return open(output_path, "w", encoding="utf-8")
 
 
 # Step 3: Main function
-def main(pdf_path: str, output_path: str, aircraft_type: str):
-    print(f"Processing: {pdf_path}")
-    text = extract_text_from_pdf(pdf_path)
-    
-    # Select parser based on aircraft type
-    if aircraft_type == "A380":
-        entries = parse_a380_mmel_entries(text, aircraft_type)
-    elif aircraft_type == "B747-400":
-        entries = parse_b747_400_mmel_entries(text, aircraft_type)
+# Entry generator, whole-text parser and grammar of each format; FAA otherwise
+PARSERS = {
+    "A380": (iter_a380_mmel_entries, parse_a380_mmel_entries, A380Grammar),
+    "B747-400": (iter_b747_400_mmel_entries, parse_b747_400_mmel_entries, B747Grammar),
+}
+FAA_PARSERS = (iter_mmel_entries, parse_mmel_entries, FAAGrammar)
+
+
+def select_entry_iterator(aircraft_type: str):
+    """Pick the entry generator for an aircraft type"""
+    return PARSERS.get(aircraft_type, FAA_PARSERS)[0]
+
+
+def select_parser(aircraft_type: str):
+    """Whole-text parser matching select_entry_iterator(aircraft_type)"""
+    return PARSERS.get(aircraft_type, FAA_PARSERS)[1]
+
+
+def select_grammar(aircraft_type: str):
+    """Grammar class used by select_entry_iterator(aircraft_type)"""
+    return PARSERS.get(aircraft_type, FAA_PARSERS)[2]
+
+
+def extraction_settings(options: Optional[Dict] = None) -> Dict:
+    """Everything besides the PDF bytes that determines the extracted text"""
+    settings = {"method": "text", "fitz": fitz.VersionBind}
+    if options:
+        settings["top"] = options.get("top")
+        settings["flags"] = options.get("flags")
+    return settings
+
+
+def _convert_pdf_cached(pdf_path: str, output_path: str, aircraft_type: str, workers: int,
+                        profile: Optional[str], cache: MMELCache) -> int:
+    options = extraction_options(aircraft_type, profile)
+    text_key = cache.text_key(cache.pdf_hash(pdf_path), extraction_settings(options))
+    text = None
+    text_hash = cache.text_hash(text_key)
+    if text_hash is None:
+        with mmel_metrics.stage("extract"):
+            text = extract_text_from_pdf(pdf_path, workers=workers, options=options)
+        text_hash = cache.put_text(text_key, text)
+
+    fingerprint = filter_profile_fingerprint(aircraft_type, select_grammar(aircraft_type).default_profile,
+                                             profile)
+    entries_key = cache.entries_key(text_hash, aircraft_type, fingerprint)
+    cached_entries = cache.get_entries(entries_key)
+    if cached_entries is not None:
+        data, count = cached_entries
     else:
-        entries = parse_mmel_entries(text, aircraft_type)
+        if text is None:
+            cached_text = cache.get_text(text_key)
+            with mmel_metrics.stage("extract"):
+                text = cached_text[0] if cached_text else extract_text_from_pdf(pdf_path, workers=workers,
+                                                                                options=options)
+        with mmel_metrics.stage("split"):
+            lines = text.splitlines()
+        with mmel_metrics.stage("parse"):
+            entries = list(select_entry_iterator(aircraft_type)(lines, aircraft_type, profile))
+        with mmel_metrics.stage("serialize"):
+            data = json.dumps(to_dicts(entries), indent=2, ensure_ascii=False).encode("utf-8")
+        count = len(entries)
+        cache.put_entries(entries_key, data, count)
 
     with open(output_path, "w", encoding="utf-8") as f:
-        json.dump(entries, f, indent=2, ensure_ascii=False)
+        f.write(data.decode("utf-8"))
+    return count
+
+
+def _tee_binary(entries: Iterable[Dict], writer: Optional[BinaryWriter]) -> Iterator[Dict]:
+    for entry in entries:
+        if writer is not None:
+            writer.write(entry)
+        yield entry
+
+
+def convert_pdf(pdf_path: str, output_path: str, aircraft_type: str, workers: int = 1,
+                stream: bool = False, profile: Optional[str] = None,
+                cache: Optional[MMELCache] = None, binary_path: Optional[str] = None,
+                compress_binary: bool = False, jsonl: bool = False, layout: bool = False) -> int:
+    """Parse one MMEL PDF into a JSON file and return the number of entries.
+
+    With a cache, extracted text and parse results are reused across runs
+    (streaming, JSON Lines and layout runs bypass the cache). With layout
+    the columns of tabular formats are taken from word coordinates instead
+    of the flattened text (see iter_layout_entries). With binary_path the
+    entries are also written in the compact binary format of mmel_binary.
+    With jsonl the output has one entry per line, written as soon as the
+    entry is parsed; output_path "-" writes to stdout.
+    """
+    iter_entries = select_entry_iterator(aircraft_type)
+    options = extraction_options(aircraft_type, profile)
+
+    if stream or jsonl or layout:
+        # Entries are written as soon as they are complete; streaming and
+        # layout runs also read the PDF page by page, so memory does not
+        # grow with the manual size
+        if layout:
+            entries = iter_layout_entries(pdf_path, aircraft_type, profile)
+        elif stream:
+            entries = iter_entries(iter_pdf_lines(pdf_path, options), aircraft_type, profile)
+        else:
+            with mmel_metrics.stage("extract"):
+                text = extract_text_from_pdf(pdf_path, workers=workers, options=options)
+            with mmel_metrics.stage("split"):
+                lines = text.splitlines()
+            entries = iter_entries(lines, aircraft_type, profile)
+        write_entries = write_jsonl_stream if jsonl else write_json_stream
+        # Stages interleave here; per-page times still separate extraction
+        with _open_output(output_path) as f, \
+                open(binary_path or os.devnull, "wb") as binary_file, \
+                mmel_metrics.stage("stream"):
+            writer = BinaryWriter(binary_file, compress=compress_binary) if binary_path else None
+            count = write_entries(_tee_binary((entry.to_dict() for entry in entries), writer), f)
+            if writer is not None:
+                writer.close()
+            return count
+
+    if cache is not None:
+        count = _convert_pdf_cached(pdf_path, output_path, aircraft_type, workers, profile, cache)
+        if binary_path:
+            with open(output_path, "r", encoding="utf-8") as f:
+                dump_binary(json.load(f), binary_path, compress=compress_binary)
+        return count
+
+    with mmel_metrics.stage("extract"):
+        text = extract_text_from_pdf(pdf_path, workers=workers, options=options)
+    with mmel_metrics.stage("split"):
+        lines = text.splitlines()
+    with mmel_metrics.stage("parse"):
+        entries = list(iter_entries(lines, aircraft_type, profile))
+
+    with mmel_metrics.stage("serialize"):
+        data = to_dicts(entries)
+        with open(output_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2, ensure_ascii=False)
+        if binary_path:
+            dump_binary(data, binary_path, compress=compress_binary)
+
+    return len(entries)
+
 
-    print(f"Extracted {len(entries)} MMEL items to {output_path}")
+def main(pdf_path: str, output_path: str, aircraft_type: str, workers: int = 1,
+         stream: bool = False, profile: Optional[str] = None,
+         cache: Optional[MMELCache] = None, binary_path: Optional[str] = None,
+         compress_binary: bool = False, jsonl: bool = False, layout: bool = False,
+         metrics_path: Optional[str] = None, trace_memory: bool = False, check_type: bool = False):
+    # Keep stdout clean when the entries themselves go there
+    log = sys.stderr if output_path == "-" else sys.stdout
+    print(f"Processing: {pdf_path}", file=log)
+    if aircraft_type == "auto":
+        detected = detect_aircraft_type(pdf_path)
+        aircraft_type = detected["aircraft_type"]
+        print(f"🔍 Detected {aircraft_type} ({detected['grammar']} grammar, "
+              f"confidence {detected['confidence']:.2f})", file=log)
+    elif check_type:
+        mismatch = check_aircraft_type(pdf_path, aircraft_type, require_items=not layout)
+        if mismatch:
+            raise ValueError(mismatch)
+    instrumentation = mmel_metrics.enable(trace_memory) if metrics_path else None
+    start = time.perf_counter()
+    try:
+        count = convert_pdf(pdf_path, output_path, aircraft_type, workers=workers,
+                            stream=stream, profile=profile, cache=cache,
+                            binary_path=binary_path, compress_binary=compress_binary, jsonl=jsonl,
+                            layout=layout)
+    finally:
+        mmel_metrics.disable()
+    print(f"Extracted {count} MMEL items to {'stdout' if output_path == '-' else output_path}", file=log)
+    if instrumentation is not None:
+        mmel_metrics.write_report(instrumentation, metrics_path, pdf=pdf_path, aircraft_type=aircraft_type,
+                                  entries=count, seconds=time.perf_counter() - start)
+        print(f"📈 Instrumentation written to {metrics_path}", file=log)
+    if binary_path and output_path != "-" and not jsonl:
+        print_binary_comparison(output_path, binary_path)
 
 # CLI usage
 if __name__ == "__main__":
-    if len(sys.argv) != 4:
-        print("Usage: python mmel_parser.py <mmel_pdf_file> <output_json_file> <aircraft_type>")
-        print("Example: python mmel_parser.py A-320_Rev_31.pdf a320_mmel.json A320")
-        sys.exit(1)
+    parser = argparse.ArgumentParser(
+        description="Parse an MMEL PDF into structured JSON",
+        epilog="Example: python mmel_parser.py A-320_Rev_31.pdf a320_mmel.json A320")
+    parser.add_argument("mmel_pdf_file")
+    parser.add_argument("output_json_file", help="output file, or - for stdout")
+    parser.add_argument("aircraft_type", help="ICAO aircraft type, or auto to detect it from the PDF")
+    parser.add_argument("--check-type", action="store_true",
+                        help="check the PDF's first item pages against the aircraft type's format "
+                             "before the full run")
+    parser.add_argument("--workers", type=int, default=1,
+                        help="number of processes used for PDF text extraction (default: 1)")
+    parser.add_argument("--stream", action="store_true",
+                        help="extract, parse and write page by page with bounded memory")
+    parser.add_argument("--filter-profile", metavar="NAME",
+                        help="header/footer filter profile (default: chosen by aircraft type)")
+    parser.add_argument("--filter-profiles", metavar="FILE", action="append", default=[],
+                        help="extra filter profile JSON file layered over filter_profiles.json")
+    parser.add_argument("--cache-dir", default=os.environ.get(CACHE_DIR_ENV_VAR),
+                        help=f"reuse extracted text and parse results from this cache "
+                             f"(default: ${CACHE_DIR_ENV_VAR}, unset disables caching)")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        metavar="MB", help="cache size cap before LRU eviction (default: %(default)s)")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="write JSON Lines (one entry per line, as parsed); combine with --stream "
+                             "and output '-' to pipe into create_enhanced_database.py --jsonl -")
+    parser.add_argument("--layout", action="store_true",
+                        help="A380 and B747-400: read the table columns from word positions "
+                             "(one entry per dispatch condition)")
+    parser.add_argument("--binary", metavar="FILE",
+                        help="also write the compact binary format (.mmelb) and compare it with the JSON")
+    parser.add_argument("--compress-binary", action="store_true",
+                        help="zlib-compress the --binary output")
+    parser.add_argument("--metrics", metavar="FILE",
+                        help="write per-stage and per-page timings and parse-path counters as JSON")
+    parser.add_argument("--trace-memory", action="store_true",
+                        help="with --metrics: also record the tracemalloc peak of each stage "
+                             "(slows the run down)")
+    args = parser.parse_args()
 
-    pdf_file = sys.argv[1]
-    json_output = sys.argv[2]
-    aircraft = sys.argv[3]
+    for profiles_file in args.filter_profiles:
+        load_filter_profiles(profiles_file)
 
-    main(pdf_file, json_output, aircraft)
+    cache = MMELCache(args.cache_dir, args.cache_size * 1024 * 1024) if args.cache_dir else None
+    main(args.mmel_pdf_file, args.output_json_file, args.aircraft_type,
+         workers=args.workers, stream=args.stream, profile=args.filter_profile, cache=cache,
+         binary_path=args.binary, compress_binary=args.compress_binary, jsonl=args.jsonl,
+         layout=args.layout, metrics_path=args.metrics, trace_memory=args.trace_memory,
+         check_type=args.check_type)
@@ -0,0 +1,225 @@
+"""Overlapped extract → parse → write pipeline.
+
+convert_pdf() runs its steps one after the other: all pages are extracted,
+then all lines parsed, then every entry written. Here the three run at the
+same time, connected by bounded queues:
+
+- extract: a child process (PyMuPDF holds the GIL while it extracts) sends
+  the text of each page as soon as it is extracted
+- parse: the main thread feeds the lines of arriving pages to the format's
+  entry iterator, so a chapter is parsed while later pages are extracted
+- write: a thread serializes batches of entries to JSON / JSON Lines, or
+  inserts them into an SQLite database (sqlite releases the GIL)
+
+A full queue blocks the stage feeding it (backpressure), so memory is
+bounded by the queue sizes whichever stage is slowest. Every stage reports
+its wall window, and how much of it was spent working, waiting for input and
+blocked on a full output queue. The JSON output is byte-identical to
+convert_pdf().
+"""
+import argparse
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from typing import Dict, Iterator, List, Optional
+
+import fitz  # PyMuPDF
+
+from create_enhanced_database import (
+    create_enhanced_mmel_database, has_summary_triggers, insert_mmel_batches, update_enhanced_aircraft_summary,
+)
+from mmel_filters import load_filter_profiles, page_text
+from mmel_parser import extraction_options, select_entry_iterator, write_json_stream, write_jsonl_stream
+
+PAGE_QUEUE_SIZE = 32       # pages extracted ahead of the parser
+BATCH_SIZE = 64            # entries per hand-off to the writer
+BATCH_QUEUE_SIZE = 8       # batches parsed ahead of the writer
+
+
+def _new_stage(name: str) -> Dict:
+    return {"stage": name, "start": time.perf_counter(), "end": 0.0,
+            "waiting": 0.0, "blocked": 0.0, "items": 0}
+
+
+def _extract_stage(pdf_path: str, options: Dict, pages):
+    """Child process: put the text of every page, then ("done", stage)"""
+    stage = _new_stage("extract")
+    try:
+        with fitz.open(pdf_path) as doc:
+            for page in doc:
+                text = page_text(page, options)
+                put_start = time.perf_counter()
+                pages.put(text)
+                stage["blocked"] += time.perf_counter() - put_start
+                stage["items"] += 1
+        stage["end"] = time.perf_counter()
+        pages.put(("done", stage))
+    except Exception as e:
+        pages.put(("error", f"{type(e).__name__}: {e}"))
+
+
+def _page_lines(pages, stage: Dict, extract: Dict) -> Iterator[str]:
+    """Lines of the pages arriving from the extract stage, as iter_pdf_lines()"""
+    while True:
+        get_start = time.perf_counter()
+        item = pages.get()
+        stage["waiting"] += time.perf_counter() - get_start
+        if isinstance(item, tuple):
+            status, detail = item
+            if status == "error":
+                raise RuntimeError(f"Extraction failed: {detail}")
+            extract.update(detail)
+            return
+        yield from (item + "\n").splitlines()
+
+
+def _queued_batches(batches: queue.Queue, stage: Dict) -> Iterator[List[Dict]]:
+    """Batches from the parse stage as entry dicts, until the None sentinel"""
+    while True:
+        get_start = time.perf_counter()
+        batch = batches.get()
+        stage["waiting"] += time.perf_counter() - get_start
+        if batch is None:
+            return
+        stage["items"] += len(batch)
+        yield [entry.to_dict() for entry in batch]
+
+
+def _write_stage(batches: queue.Queue, output_path: str, jsonl: bool, database: bool,
+                 source_file: str, stage: Dict):
+    stage["start"] = time.perf_counter()
+    try:
+        if database:
+            # The connection has to be created in the thread that uses it
+            conn = create_enhanced_mmel_database(output_path)
+            try:
+                insert_mmel_batches(conn, _queued_batches(batches, stage), source_file)
+                if not has_summary_triggers(conn):
+                    update_enhanced_aircraft_summary(conn)
+            finally:
+                conn.close()
+        else:
+            write_entries = write_jsonl_stream if jsonl else write_json_stream
+            entries = (entry for batch in _queued_batches(batches, stage) for entry in batch)
+            with open(output_path, "w", encoding="utf-8") as f:
+                write_entries(entries, f)
+    except Exception as e:
+        stage["error"] = f"{type(e).__name__}: {e}"
+        # Keep draining so the parse stage is never blocked on a dead writer
+        while batches.get() is not None:
+            pass
+    stage["end"] = time.perf_counter()
+
+
+def run_pipeline(pdf_path: str, output_path: str, aircraft_type: str, profile: Optional[str] = None,
+                 jsonl: bool = False, database: bool = False,
+                 page_queue_size: int = PAGE_QUEUE_SIZE, batch_size: int = BATCH_SIZE,
+                 batch_queue_size: int = BATCH_QUEUE_SIZE) -> Dict:
+    """Convert one PDF with overlapping stages.
+
+    Writes JSON (JSON Lines with jsonl) to output_path, or with database
+    adds the entries to the SQLite database output_path. Returns the entry
+    count, the end-to-end wall time and the timings of each stage.
+    """
+    start = time.perf_counter()
+    pages = multiprocessing.Queue(maxsize=page_queue_size)
+    batches: queue.Queue = queue.Queue(maxsize=batch_queue_size)
+    extract = {"stage": "extract", "start": start, "end": 0.0, "waiting": 0.0, "blocked": 0.0, "items": 0}
+    parse = _new_stage("parse")
+    write = _new_stage("write")
+
+    # The extractor is forked before the writer thread exists
+    extractor = multiprocessing.Process(target=_extract_stage,
+                                        args=(pdf_path, extraction_options(aircraft_type, profile), pages),
+                                        daemon=True)
+    extractor.start()
+    writer = threading.Thread(target=_write_stage, name="mmel-writer",
+                              args=(batches, output_path, jsonl, database, pdf_path, write))
+    writer.start()
+
+    count = 0
+    try:
+        parse["start"] = time.perf_counter()
+        batch = []
+        iter_entries = select_entry_iterator(aircraft_type)
+        for entry in iter_entries(_page_lines(pages, parse, extract), aircraft_type, profile):
+            batch.append(entry)
+            if len(batch) >= batch_size:
+                put_start = time.perf_counter()
+                batches.put(batch)
+                parse["blocked"] += time.perf_counter() - put_start
+                count += len(batch)
+                batch = []
+        if batch:
+            batches.put(batch)
+            count += len(batch)
+        parse["items"] = count
+        parse["end"] = time.perf_counter()
+    finally:
+        batches.put(None)
+        writer.join()
+        if parse["end"]:
+            extractor.join()
+        else:
+            # Parsing failed: the extractor may be blocked on a full queue
+            extractor.terminate()
+            extractor.join()
+
+    if "error" in write:
+        raise RuntimeError(f"Writing {output_path} failed: {write['error']}")
+
+    stages = []
+    for stage in (extract, parse, write):
+        seconds = stage["end"] - stage["start"]
+        stages.append(dict(stage, start=stage["start"] - start, end=stage["end"] - start, seconds=seconds,
+                           busy=max(seconds - stage["waiting"] - stage["blocked"], 0.0)))
+    return {"entries": count, "seconds": time.perf_counter() - start, "stages": stages}
+
+
+def print_stages(result: Dict):
+    print(f"{'Stage':<8} | Start (s) | End (s) | Busy (s) | Waiting (s) | Blocked (s) | Items")
+    print("-" * 74)
+    for s in result["stages"]:
+        print(f"{s['stage']:<8} | {s['start']:>9.2f} | {s['end']:>7.2f} | {s['busy']:>8.2f} | "
+              f"{s['waiting']:>11.2f} | {s['blocked']:>11.2f} | {s['items']:>5}")
+    busy = sum(s["busy"] for s in result["stages"])
+    print(f"⏱️  {result['entries']} entries in {result['seconds']:.2f}s wall; the stages were busy "
+          f"{busy:.2f}s in total ({busy / max(result['seconds'], 1e-9):.2f}x overlap)")
+
+
+def main(pdf_path: str, output_path: str, aircraft_type: str, profile: Optional[str] = None,
+         jsonl: bool = False, database: bool = False, page_queue_size: int = PAGE_QUEUE_SIZE):
+    print(f"Processing: {pdf_path}")
+    result = run_pipeline(pdf_path, output_path, aircraft_type, profile=profile, jsonl=jsonl,
+                          database=database, page_queue_size=page_queue_size)
+    print(f"Extracted {result['entries']} MMEL items to {output_path}")
+    print_stages(result)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Parse an MMEL PDF with extraction, parsing and writing running concurrently",
+        epilog="Example: python mmel_pipeline.py B-767_Rev_41.pdf mmel_db.db B767 --db")
+    parser.add_argument("mmel_pdf_file")
+    parser.add_argument("output_file", help="output JSON file, or the database with --db")
+    parser.add_argument("aircraft_type")
+    parser.add_argument("--jsonl", action="store_true", help="write JSON Lines instead of a JSON array")
+    parser.add_argument("--db", action="store_true",
+                        help="add the entries to the SQLite database output_file (created if missing)")
+    parser.add_argument("--filter-profile", metavar="NAME",
+                        help="header/footer filter profile (default: chosen by aircraft type)")
+    parser.add_argument("--filter-profiles", metavar="FILE", action="append", default=[],
+                        help="extra filter profile JSON file layered over filter_profiles.json")
+    parser.add_argument("--page-queue", type=int, default=PAGE_QUEUE_SIZE, metavar="PAGES",
+                        help="pages extracted ahead of the parser (default: %(default)s)")
+    args = parser.parse_args()
+    if args.db and args.jsonl:
+        parser.error("--jsonl and --db are exclusive")
+
+    for profiles_file in args.filter_profiles:
+        load_filter_profiles(profiles_file)
+
+    main(args.mmel_pdf_file, args.output_file, args.aircraft_type, profile=args.filter_profile,
+         jsonl=args.jsonl, database=args.db, page_queue_size=args.page_queue)
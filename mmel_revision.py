@@ -0,0 +1,291 @@
+"""Incremental re-parse of a new MMEL revision.
+
+A new revision usually changes a handful of pages. Alongside each output
+JSON a <output>.pages.json sidecar records, per page, the hash of its
+content stream and text plus the ATA chapters it covers. Given the previous
+revision's output and sidecar, pages of the new PDF are matched by hash
+(text is only extracted for pages whose content stream changed), and only
+the ATA chapters touching changed, inserted or removed pages are re-parsed.
+Items of the other chapters are carried over from the previous output.
+
+Besides the merged JSON, a diff of the items added, removed and changed,
+keyed by itemNumber, can be written.
+"""
+import argparse
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Set, Tuple
+
+import fitz  # PyMuPDF
+
+from mmel_filters import load_filter_profiles, page_text
+from mmel_grammar import ATA_SECTION, classify_lines
+from mmel_parser import extraction_options, extraction_settings, select_entry_iterator, select_grammar
+
+SIDECAR_SUFFIX = ".pages.json"
+
+
+def sidecar_path(output_path: str) -> str:
+    return output_path + SIDECAR_SUFFIX
+
+
+def _sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+def _page_lines(page_text: str) -> List[str]:
+    # Same lines iter_pdf_lines yields for the page
+    return (page_text + "\n").splitlines()
+
+
+def _page_chapters(lines: List[str], grammar, start_ata: str) -> Tuple[List[str], str]:
+    """ATA chapters active on a page and the chapter in effect at its end"""
+    chapters = [start_ata]
+    current = start_ata
+    for tag, _, match in classify_lines(lines, grammar):
+        if tag == ATA_SECTION:
+            current = match.group("ata")
+            if current not in chapters:
+                chapters.append(current)
+    return chapters, current
+
+
+class _PageTexts:
+    """Lazily extracted page texts of one open document"""
+
+    def __init__(self, doc, options: Dict):
+        self.doc = doc
+        self.options = options
+        self._texts: Dict[int, str] = {}
+
+    def __getitem__(self, index: int) -> str:
+        if index not in self._texts:
+            self._texts[index] = page_text(self.doc[index], self.options)
+        return self._texts[index]
+
+    @property
+    def extracted(self) -> int:
+        return len(self._texts)
+
+
+def build_page_index(pdf_path: str, aircraft_type: str, profile: Optional[str] = None) -> Dict:
+    """Sidecar contents for a PDF (extracts every page)"""
+    grammar = select_grammar(aircraft_type).for_aircraft(aircraft_type, profile)
+    options = extraction_options(aircraft_type, profile)
+    pages = []
+    ata = ""
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            text = page_text(page, options)
+            chapters, end_ata = _page_chapters(_page_lines(text), grammar, ata)
+            pages.append({
+                "content": _sha256(page.read_contents()),
+                "text": _sha256(text.encode("utf-8")),
+                "start_ata": ata,
+                "end_ata": end_ata,
+                "chapters": chapters,
+            })
+            ata = end_ata
+    return {"aircraft_type": aircraft_type, "profile": profile,
+            "extraction": extraction_settings(options), "pages": pages}
+
+
+def _load_sidecar(path: str, aircraft_type: str, profile: Optional[str]) -> Optional[Dict]:
+    """The previous sidecar, unless it was built for other settings"""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        sidecar = json.load(f)
+    if sidecar.get("aircraft_type") != aircraft_type or sidecar.get("profile") != profile:
+        return None
+    options = extraction_options(aircraft_type, profile)
+    if sidecar.get("extraction", extraction_settings()) != extraction_settings(options):
+        return None
+    return sidecar
+
+
+def _group_by_chapter(entries: List[Dict]) -> Dict[str, List[Dict]]:
+    groups: Dict[str, List[Dict]] = {}
+    for entry in entries:
+        groups.setdefault(entry["ataChapter"], []).append(entry)
+    return groups
+
+
+def diff_entries(old_entries: List[Dict], new_entries: List[Dict]) -> Dict:
+    """Items added, removed and changed between two outputs, keyed by itemNumber.
+
+    Duplicate item numbers are compared as a whole list of entries.
+    """
+    old_items: Dict[str, List[Dict]] = {}
+    for entry in old_entries:
+        old_items.setdefault(entry["itemNumber"], []).append(entry)
+    new_items: Dict[str, List[Dict]] = {}
+    for entry in new_entries:
+        new_items.setdefault(entry["itemNumber"], []).append(entry)
+
+    diff = {"added": {}, "removed": {}, "changed": {}, "unchanged": 0}
+    for item_number, entries in new_items.items():
+        if item_number not in old_items:
+            diff["added"][item_number] = entries
+        elif old_items[item_number] != entries:
+            diff["changed"][item_number] = {"before": old_items[item_number], "after": entries}
+        else:
+            diff["unchanged"] += 1
+    for item_number, entries in old_items.items():
+        if item_number not in new_items:
+            diff["removed"][item_number] = entries
+    return diff
+
+
+def update_revision(pdf_path: str, previous_output: str, output_path: str, aircraft_type: str,
+                    profile: Optional[str] = None, previous_pdf: Optional[str] = None) -> Dict:
+    """Write the new revision's JSON and sidecar; return a report with the diff"""
+    with open(previous_output, "r", encoding="utf-8") as f:
+        old_entries = json.load(f)
+
+    sidecar = _load_sidecar(sidecar_path(previous_output), aircraft_type, profile)
+    if sidecar is None and previous_pdf:
+        sidecar = build_page_index(previous_pdf, aircraft_type, profile)
+    old_pages = sidecar["pages"] if sidecar else []
+    # Old page indices by hash; each old page matches one new page at most,
+    # so a repeated page counts as inserted
+    by_content: Dict[str, List[int]] = {}
+    by_text: Dict[str, List[int]] = {}
+    for n, page in enumerate(old_pages):
+        by_content.setdefault(page["content"], []).append(n)
+        by_text.setdefault(page["text"], []).append(n)
+    matched: Set[int] = set()
+
+    def take(candidates: List[int], start_ata: str) -> Optional[Dict]:
+        for n in candidates:
+            if n not in matched and old_pages[n]["start_ata"] == start_ata:
+                matched.add(n)
+                return old_pages[n]
+        return None
+
+    grammar = select_grammar(aircraft_type).for_aircraft(aircraft_type, profile)
+    iter_entries = select_entry_iterator(aircraft_type)
+
+    options = extraction_options(aircraft_type, profile)
+    with fitz.open(pdf_path) as doc:
+        texts = _PageTexts(doc, options)
+        pages = []
+        affected: Set[str] = set()
+        changed_pages = []
+        ata = ""
+
+        # Walk the new revision in order so each page knows the chapter in
+        # effect when it starts; a page whose context changed is re-parsed
+        for index, page in enumerate(doc):
+            content_hash = _sha256(page.read_contents())
+            previous = take(by_content.get(content_hash, []), ata)
+            text_hash = None
+            if previous is None:
+                text_hash = _sha256(texts[index].encode("utf-8"))
+                previous = take(by_text.get(text_hash, []), ata)
+
+            if previous is not None:
+                record = dict(previous, content=content_hash)
+            else:
+                chapters, end_ata = _page_chapters(_page_lines(texts[index]), grammar, ata)
+                record = {"content": content_hash, "text": text_hash, "start_ata": ata,
+                          "end_ata": end_ata, "chapters": chapters}
+                affected.update(chapters)
+                changed_pages.append(index + 1)
+            pages.append(record)
+            ata = record["end_ata"]
+
+        # Chapters that lost pages must be re-parsed as well
+        for n, page in enumerate(old_pages):
+            if n not in matched:
+                affected.update(page["chapters"])
+
+        # Re-parse each contiguous run of pages touching an affected chapter
+        new_entries: List[Dict] = []
+        index = 0
+        while index < len(pages):
+            if not affected.intersection(pages[index]["chapters"]):
+                index += 1
+                continue
+            start = index
+            while index < len(pages) and affected.intersection(pages[index]["chapters"]):
+                index += 1
+            lines = (line for n in range(start, index) for line in _page_lines(texts[n]))
+            for entry in iter_entries(lines, aircraft_type, profile, start_ata=pages[start]["start_ata"]):
+                if entry.ata_chapter in affected:
+                    new_entries.append(entry.to_dict())
+        pages_extracted = texts.extracted
+
+    # Merge chapter by chapter in the new document order
+    old_groups = _group_by_chapter(old_entries)
+    new_groups = _group_by_chapter(new_entries)
+    chapter_order: List[str] = []
+    for page in pages:
+        for chapter in page["chapters"]:
+            if chapter not in chapter_order:
+                chapter_order.append(chapter)
+    merged: List[Dict] = []
+    for chapter in chapter_order:
+        if chapter in affected:
+            merged.extend(new_groups.get(chapter, []))
+        else:
+            merged.extend(old_groups.get(chapter, []))
+
+    with open(output_path, "w", encoding="utf-8") as f:
+        json.dump(merged, f, indent=2, ensure_ascii=False)
+    with open(sidecar_path(output_path), "w", encoding="utf-8") as f:
+        json.dump({"aircraft_type": aircraft_type, "profile": profile,
+                   "extraction": extraction_settings(options), "pages": pages}, f)
+
+    report = diff_entries(old_entries, merged)
+    report["reparsedChapters"] = sorted(affected)
+    report["changedPages"] = changed_pages
+    report["pagesExtracted"] = pages_extracted
+    report["totalPages"] = len(pages)
+    return report
+
+
+def main(pdf_path: str, previous_output: str, output_path: str, aircraft_type: str,
+         profile: Optional[str] = None, previous_pdf: Optional[str] = None,
+         diff_path: Optional[str] = None):
+    print(f"Processing: {pdf_path} against {previous_output}")
+    report = update_revision(pdf_path, previous_output, output_path, aircraft_type,
+                             profile=profile, previous_pdf=previous_pdf)
+
+    if diff_path:
+        with open(diff_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+
+    print(f"Changed pages: {len(report['changedPages'])} of {report['totalPages']} "
+          f"({report['pagesExtracted']} extracted)")
+    print(f"Re-parsed ATA chapters: {', '.join(report['reparsedChapters']) or 'none'}")
+    print(f"Items added: {len(report['added'])}, removed: {len(report['removed'])}, "
+          f"changed: {len(report['changed'])}, unchanged: {report['unchanged']}")
+    print(f"Wrote merged MMEL items to {output_path}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Re-parse only the ATA chapters that changed in a new MMEL revision",
+        epilog="Example: python mmel_revision.py B-737_Rev_63.pdf B737MMEL.json B737MMEL_63.json B737 "
+               "--previous-pdf B-737_Rev_62.pdf --diff B737_62_63_diff.json")
+    parser.add_argument("mmel_pdf_file", help="new revision PDF")
+    parser.add_argument("previous_json_file", help="output of the previous revision")
+    parser.add_argument("output_json_file")
+    parser.add_argument("aircraft_type")
+    parser.add_argument("--previous-pdf",
+                        help="previous revision PDF, used to build the page index when the "
+                             "previous output has no .pages.json sidecar")
+    parser.add_argument("--diff", metavar="FILE", help="write the item-level diff as JSON")
+    parser.add_argument("--filter-profile", metavar="NAME",
+                        help="header/footer filter profile (default: chosen by aircraft type)")
+    parser.add_argument("--filter-profiles", metavar="FILE", action="append", default=[],
+                        help="extra filter profile JSON file layered over filter_profiles.json")
+    args = parser.parse_args()
+
+    for profiles_file in args.filter_profiles:
+        load_filter_profiles(profiles_file)
+
+    main(args.mmel_pdf_file, args.previous_json_file, args.output_json_file, args.aircraft_type,
+         profile=args.filter_profile, previous_pdf=args.previous_pdf, diff_path=args.diff)
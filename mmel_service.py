@@ -0,0 +1,327 @@
+"""Local HTTP/JSON lookup service over mmel_db.db.
+
+A small asyncio HTTP/1.1 server (keep-alive, GET only). SQLite reads run on
+a pool of read-only connections in worker threads, and responses are kept
+in a bounded LRU cache that is dropped whenever the database file (or its
+WAL) changes on disk.
+
+Endpoints:
+    GET /items/<aircraft_type>/<item_number>   all entries of an item, with procedures
+    GET /chapters/<aircraft_type>/<ata>        items of an ATA chapter
+    GET /summary                               aircraft_summary for every type
+    GET /summary/<aircraft_type>               aircraft_summary for one type
+"""
+import argparse
+import asyncio
+import json
+import os
+import sqlite3
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+DEFAULT_PORT = 8631
+DEFAULT_CACHE_ENTRIES = 4096
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            500: "Internal Server Error"}
+
+_SUMMARY_COLUMNS = (
+    "aircraft_type", "total_items", "unique_item_numbers", "total_category_a", "total_category_b",
+    "total_category_c", "total_category_d", "total_empty_category",
+    "items_with_maintenance_procedures", "items_with_operational_procedures",
+    "items_with_remarks", "source_file", "last_updated",
+)
+
+
+# Queries (run on a pooled connection in a worker thread)
+
+def _procedures(conn: sqlite3.Connection, table: str, column: str, item_ids: List[int]) -> Dict[int, List[str]]:
+    placeholders = ",".join("?" * len(item_ids))
+    rows = conn.execute(f'''
+        SELECT mmel_item_id, {column} FROM {table}
+        WHERE mmel_item_id IN ({placeholders})
+        ORDER BY mmel_item_id, sequence_order, id
+    ''', item_ids)
+    procedures: Dict[int, List[str]] = {item_id: [] for item_id in item_ids}
+    for item_id, text in rows:
+        procedures[item_id].append(text)
+    return procedures
+
+
+def lookup_item(conn: sqlite3.Connection, aircraft_type: str, item_number: str) -> Optional[List[Dict]]:
+    """Every entry of an item (duplicates by sequence number) or None"""
+    rows = conn.execute('''
+        SELECT id, aircraft_type, ata_chapter, item_number, sequence_number, title,
+               deferral_category, quantity_installed, quantity_required, remarks_summary
+        FROM mmel_items
+        WHERE aircraft_type = ? AND item_number = ?
+        ORDER BY sequence_number
+    ''', (aircraft_type, item_number)).fetchall()
+    if not rows:
+        return None
+    item_ids = [row[0] for row in rows]
+    maintenance = _procedures(conn, "maintenance_procedures", "procedure_text", item_ids)
+    operational = _procedures(conn, "operational_procedures", "procedure_text", item_ids)
+    steps = _procedures(conn, "remarks_steps", "step_text", item_ids)
+    return [{
+        "aircraftType": row[1],
+        "ataChapter": row[2],
+        "itemNumber": row[3],
+        "sequenceNumber": row[4],
+        "title": row[5],
+        "deferralCategory": row[6],
+        "quantityInstalled": row[7],
+        "quantityRequired": row[8],
+        "remarks": {"summary": row[9], "steps": steps[row[0]]},
+        "maintenanceProcedures": maintenance[row[0]],
+        "operationalProcedures": operational[row[0]],
+    } for row in rows]
+
+
+def list_chapter(conn: sqlite3.Connection, aircraft_type: str, ata_chapter: str) -> Optional[List[Dict]]:
+    """Items of one ATA chapter in database order, or None"""
+    rows = conn.execute('''
+        SELECT item_number, sequence_number, title, deferral_category,
+               quantity_installed, quantity_required
+        FROM mmel_items
+        WHERE aircraft_type = ? AND ata_chapter = ?
+        ORDER BY id
+    ''', (aircraft_type, ata_chapter)).fetchall()
+    if not rows:
+        return None
+    return [{
+        "itemNumber": row[0],
+        "sequenceNumber": row[1],
+        "title": row[2],
+        "deferralCategory": row[3],
+        "quantityInstalled": row[4],
+        "quantityRequired": row[5],
+    } for row in rows]
+
+
+def aircraft_summary(conn: sqlite3.Connection, aircraft_type: Optional[str] = None):
+    """All aircraft_summary rows, or one type's row (None if unknown)"""
+    sql = f'SELECT {", ".join(_SUMMARY_COLUMNS)} FROM aircraft_summary'
+    if aircraft_type is None:
+        return [dict(zip(_SUMMARY_COLUMNS, row))
+                for row in conn.execute(sql + ' ORDER BY aircraft_type')]
+    row = conn.execute(sql + ' WHERE aircraft_type = ?', (aircraft_type,)).fetchone()
+    return dict(zip(_SUMMARY_COLUMNS, row)) if row else None
+
+
+def route(path: str) -> Optional[Tuple[Callable, tuple]]:
+    """Query function and arguments for a request path"""
+    parts = [unquote(part) for part in urlsplit(path).path.split("/") if part]
+    if len(parts) == 3 and parts[0] == "items":
+        return lookup_item, (parts[1], parts[2])
+    if len(parts) == 3 and parts[0] == "chapters":
+        return list_chapter, (parts[1], parts[2])
+    if parts == ["summary"]:
+        return aircraft_summary, ()
+    if len(parts) == 2 and parts[0] == "summary":
+        return aircraft_summary, (parts[1],)
+    return None
+
+
+# Connection pool and response cache
+
+class ReadOnlyPool:
+    """Fixed set of read-only SQLite connections, each used by one thread at a time"""
+
+    def __init__(self, db_path: str, size: int):
+        uri = Path(db_path).resolve().as_uri() + "?mode=ro"
+        self._connections: asyncio.Queue = asyncio.Queue()
+        for _ in range(size):
+            self._connections.put_nowait(sqlite3.connect(uri, uri=True, check_same_thread=False))
+        self._executor = ThreadPoolExecutor(max_workers=size, thread_name_prefix="mmel-db")
+
+    async def run(self, fn: Callable, *args):
+        conn = await self._connections.get()
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, conn, *args)
+        finally:
+            self._connections.put_nowait(conn)
+
+    def close(self):
+        self._executor.shutdown(wait=True)
+        while not self._connections.empty():
+            self._connections.get_nowait().close()
+
+
+class ResponseCache:
+    """LRU cache of encoded responses, cleared when the database file changes"""
+
+    def __init__(self, db_path: str, max_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.paths = (db_path, db_path + "-wal")
+        self.max_entries = max_entries
+        self._responses: "OrderedDict[str, Tuple[int, bytes]]" = OrderedDict()
+        self._signature = self._stat()
+        self.generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def _stat(self) -> tuple:
+        signature = []
+        for path in self.paths:
+            try:
+                st = os.stat(path)
+                signature.append((st.st_ino, st.st_size, st.st_mtime_ns))
+            except FileNotFoundError:
+                signature.append(None)
+        return tuple(signature)
+
+    def check(self):
+        """Drop every response if the database changed since the last check"""
+        signature = self._stat()
+        if signature != self._signature:
+            self._signature = signature
+            self._responses.clear()
+            self.generation += 1
+
+    def get(self, key: str) -> Optional[Tuple[int, bytes]]:
+        response = self._responses.get(key)
+        if response is None:
+            self.misses += 1
+            return None
+        self._responses.move_to_end(key)
+        self.hits += 1
+        return response
+
+    def put(self, key: str, response: Tuple[int, bytes], generation: int):
+        # A response computed before an invalidation may be stale: drop it
+        if generation != self.generation or self.max_entries <= 0:
+            return
+        self._responses[key] = response
+        self._responses.move_to_end(key)
+        if len(self._responses) > self.max_entries:
+            self._responses.popitem(last=False)
+
+
+# HTTP
+
+def _encode(status: int, payload) -> Tuple[int, bytes]:
+    return status, json.dumps(payload, ensure_ascii=False).encode("utf-8")
+
+
+def _http_response(status: int, body: bytes, keep_alive: bool) -> bytes:
+    head = (f"HTTP/1.1 {status} {_REASONS[status]}\r\n"
+            f"Content-Type: application/json; charset=utf-8\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n")
+    return head.encode("ascii") + body
+
+
+class MMELService:
+    def __init__(self, db_path: str, pool_size: int = 4, cache_entries: int = DEFAULT_CACHE_ENTRIES):
+        self.db_path = db_path
+        self.pool_size = pool_size
+        self.cache = ResponseCache(db_path, cache_entries)
+        self.pool: Optional[ReadOnlyPool] = None
+
+    async def respond(self, method: str, target: str) -> Tuple[int, bytes]:
+        if method != "GET":
+            return _encode(405, {"error": "only GET is supported"})
+        self.cache.check()
+        cached = self.cache.get(target)
+        if cached is not None:
+            return cached
+
+        generation = self.cache.generation
+        handler = route(target)
+        if handler is None:
+            return _encode(404, {"error": f"no such endpoint: {target}"})
+        fn, args = handler
+        try:
+            result = await self.pool.run(fn, *args)
+        except sqlite3.Error as e:
+            return _encode(500, {"error": f"{type(e).__name__}: {e}"})
+        response = _encode(200, result) if result is not None else _encode(404, {"error": "not found"})
+        self.cache.put(target, response, generation)
+        return response
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ConnectionError):
+                    break
+                lines = head.decode("latin-1").split("\r\n")
+                request = lines[0].split()
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    headers[name.strip().lower()] = value.strip()
+                try:
+                    length = int(headers.get("content-length") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    # The request body cannot be skipped, so the connection is not reusable
+                    writer.write(_http_response(*_encode(400, {"error": "invalid Content-Length"}), False))
+                    await writer.drain()
+                    break
+                if length:
+                    try:
+                        await reader.readexactly(length)
+                    except asyncio.IncompleteReadError:
+                        break
+
+                if len(request) != 3:
+                    status, body = _encode(400, {"error": "malformed request line"})
+                    keep_alive = False
+                else:
+                    status, body = await self.respond(request[0], request[1])
+                    connection = headers.get("connection", "").lower()
+                    keep_alive = (connection != "close" if request[2] == "HTTP/1.1"
+                                  else connection == "keep-alive")
+                writer.write(_http_response(status, body, keep_alive))
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = DEFAULT_PORT):
+        self.pool = ReadOnlyPool(self.db_path, self.pool_size)
+        server = await asyncio.start_server(self.handle, host, port, backlog=1024)
+        print(f"🛫 Serving {self.db_path} on http://{host}:{port} "
+              f"({self.pool_size} connections, cache {self.cache.max_entries} responses)")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.pool.close()
+
+
+def main(db_path: str = 'mmel_db.db', host: str = "127.0.0.1", port: int = DEFAULT_PORT,
+         pool_size: int = 4, cache_entries: int = DEFAULT_CACHE_ENTRIES):
+    if not os.path.exists(db_path):
+        raise SystemExit(f"❌ {db_path}: File not found, run create_enhanced_database.py first")
+    service = MMELService(db_path, pool_size=pool_size, cache_entries=cache_entries)
+    try:
+        asyncio.run(service.serve(host, port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Serve MMEL item, chapter and summary lookups from mmel_db.db over HTTP/JSON",
+        epilog="Example: python mmel_service.py --port 8631, then GET /items/B737/21-51-01")
+    parser.add_argument("--db", default='mmel_db.db', help="database file (default: mmel_db.db)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--connections", type=int, default=4,
+                        help="read-only SQLite connections in the pool (default: 4)")
+    parser.add_argument("--cache-entries", type=int, default=DEFAULT_CACHE_ENTRIES,
+                        help=f"responses kept in the LRU cache, 0 disables it (default: {DEFAULT_CACHE_ENTRIES})")
+    args = parser.parse_args()
+
+    main(args.db, host=args.host, port=args.port, pool_size=args.connections,
+         cache_entries=args.cache_entries)
@@ -0,0 +1,232 @@
+"""One database per aircraft type, queried together through ATTACH.
+
+mmel_db.db is loaded by one writer, so the fleet's files are inserted one
+after the other under SQLite's single write lock. Here every aircraft type
+gets its own shard database with the mmel_db.db schema, built in its own
+process; a type is rebuilt into a temporary file that then replaces its
+shard, without touching the other shards.
+
+FleetShards attaches the shards to an in-memory connection and defines
+temporary views named like the tables (mmel_items, aircraft_summary, the
+procedure and steps tables), each the UNION ALL of that table across the
+shards. Queries written for mmel_db.db, such as the summary and duplicate
+statistics of create_enhanced_database.main(), run unchanged. Row ids are
+offset by the shard's position (index << 32) so ids stay unique and the
+child tables still join on mmel_item_id. SQLite attaches at most 10
+databases by default (SQLITE_MAX_ATTACHED); with more shards they are
+attached in batches of that size and copied into temporary tables of the
+same names instead, so every query still sees the whole fleet.
+"""
+import argparse
+import contextlib
+import io
+import os
+import re
+import sqlite3
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from create_enhanced_database import (
+    MMEL_JSON_FILES, bulk_insert_enhanced_mmel_data, create_enhanced_mmel_database, create_mmel_indexes,
+    create_search_index, print_aircraft_summary, print_duplicate_statistics, set_bulk_load_pragmas,
+    update_enhanced_aircraft_summary,
+)
+
+SHARD_DIR = "mmel_shards"
+SHARDED_TABLES = ("mmel_items", "maintenance_procedures", "operational_procedures", "remarks_steps",
+                  "aircraft_summary")
+# Columns holding mmel_items ids, offset per shard in the views
+_ID_COLUMNS = ("id", "mmel_item_id")
+
+_AIRCRAFT_TYPE_RE = re.compile(r'"aircraftType":\s*"([^"]*)"')
+
+
+def shard_path(shard_dir: str, aircraft_type: str) -> str:
+    return str(Path(shard_dir) / f"mmel_{aircraft_type}.db")
+
+
+def json_aircraft_type(json_file: str) -> str:
+    """Aircraft type of a JSON output's first entry (B74FMMEL.json holds B748
+    items), read from its head; the file name's when it has no entries"""
+    with open(json_file, "r", encoding="utf-8") as f:
+        match = _AIRCRAFT_TYPE_RE.search(f.read(4096))
+    return match.group(1) if match else Path(json_file).name.replace("MMEL.json", "")
+
+
+def group_json_files(json_files: List[str]) -> Dict[str, List[str]]:
+    """Existing JSON files by aircraft type, in the given order"""
+    groups: Dict[str, List[str]] = {}
+    for json_file in json_files:
+        if os.path.exists(json_file):
+            groups.setdefault(json_aircraft_type(json_file), []).append(json_file)
+        else:
+            print(f"❌ {json_file}: File not found")
+    return groups
+
+
+def build_shard(aircraft_type: str, json_files: List[str], path: str) -> Dict:
+    """Worker: bulk load one aircraft type's files into a new shard at path"""
+    start = time.perf_counter()
+    temporary = path + ".tmp"
+    if os.path.exists(temporary):
+        os.remove(temporary)
+    items = rows = 0
+    # The loaders' per-file progress lines would interleave across workers
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn = create_enhanced_mmel_database(temporary, create_indexes=False)
+        try:
+            set_bulk_load_pragmas(conn, True)
+            for json_file in json_files:
+                file_items, file_rows = bulk_insert_enhanced_mmel_data(conn, json_file)
+                items += file_items
+                rows += file_rows
+            create_mmel_indexes(conn)
+            set_bulk_load_pragmas(conn, False)
+            update_enhanced_aircraft_summary(conn)
+            create_search_index(conn)
+        finally:
+            conn.close()
+    # Readers of the old shard keep a consistent file until the swap
+    os.replace(temporary, path)
+    return {"aircraft_type": aircraft_type, "files": json_files, "path": path, "items": items, "rows": rows,
+            "seconds": time.perf_counter() - start}
+
+
+def build_shards(json_files: Optional[List[str]] = None, shard_dir: str = SHARD_DIR,
+                 aircraft_types: Optional[List[str]] = None, workers: Optional[int] = None) -> List[Dict]:
+    """Build the shards of all types (or only aircraft_types) in parallel"""
+    groups = group_json_files(json_files or MMEL_JSON_FILES)
+    if aircraft_types:
+        unknown = sorted(set(aircraft_types) - set(groups))
+        if unknown:
+            raise ValueError(f"No JSON files for {', '.join(unknown)}")
+        groups = {t: files for t, files in groups.items() if t in aircraft_types}
+    os.makedirs(shard_dir, exist_ok=True)
+
+    # Largest types first so the slowest one is not scheduled last
+    order = sorted(groups, key=lambda t: sum(os.path.getsize(f) for f in groups[t]), reverse=True)
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers or os.cpu_count() or 1, max(len(order), 1))) as pool:
+        futures = [pool.submit(build_shard, t, groups[t], shard_path(shard_dir, t)) for t in order]
+        for future in as_completed(futures):
+            results.append(future.result())
+    return sorted(results, key=lambda r: r["aircraft_type"])
+
+
+class FleetShards:
+    """Read-only fleet view over the shard databases of a directory"""
+
+    def __init__(self, shard_dir: str = SHARD_DIR, attach_limit: Optional[int] = None):
+        paths = sorted(Path(shard_dir).glob("mmel_*.db"))
+        if not paths:
+            raise FileNotFoundError(f"No shard databases in {shard_dir}")
+        self.conn = sqlite3.connect("file::memory:", uri=True)
+        limit = self.conn.getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+        if attach_limit:
+            limit = min(limit, attach_limit)
+        self.shards: Dict[str, str] = {path.stem[len("mmel_"):]: str(path) for path in paths}
+        # More shards than SQLite attaches at once are copied in batches
+        self.copied = len(paths) > limit
+
+        if not self.copied:
+            schemas = self._attach(paths, 0)
+            for table in SHARDED_TABLES:
+                self.conn.execute(f"CREATE TEMP VIEW {table} AS " + self._union(table, schemas, 0))
+            return
+
+        for first in range(0, len(paths), limit):
+            schemas = self._attach(paths[first:first + limit], first)
+            for table in SHARDED_TABLES:
+                if first == 0:
+                    self.conn.execute(f"CREATE TEMP TABLE {table} AS " + self._union(table, schemas, first))
+                else:
+                    self.conn.execute(f"INSERT INTO temp.{table} " + self._union(table, schemas, first))
+            self.conn.commit()
+            for schema in schemas:
+                self.conn.execute(f"DETACH DATABASE {schema}")
+        for table in SHARDED_TABLES:
+            columns = [row[1] for row in self.conn.execute(f"PRAGMA temp.table_info({table})")]
+            for column in _ID_COLUMNS:
+                if column in columns:
+                    self.conn.execute(f"CREATE INDEX temp.idx_{table}_{column} ON {table}({column})")
+        self.conn.commit()
+
+    def _attach(self, paths: List[Path], first: int) -> List[str]:
+        """Attach paths read-only as shard_<first>, shard_<first + 1>, ..."""
+        schemas = []
+        for n, path in enumerate(paths, first):
+            schema = f"shard_{n}"
+            uri = f"{path.resolve().as_uri()}?mode=ro"
+            self.conn.execute("ATTACH DATABASE ? AS " + schema, (uri,))
+            schemas.append(schema)
+        return schemas
+
+    def _union(self, table: str, schemas: List[str], first: int) -> str:
+        """UNION ALL of table across schemas, ids offset by shard position"""
+        columns = [row[1] for row in self.conn.execute(f"PRAGMA {schemas[0]}.table_info({table})")]
+        selects = []
+        for n, schema in enumerate(schemas, first):
+            fields = ", ".join(f"({n} << 32) + {c} AS {c}" if c in _ID_COLUMNS else c for c in columns)
+            selects.append(f"SELECT {fields} FROM {schema}.{table}")
+        return " UNION ALL ".join(selects)
+
+    def execute(self, sql: str, parameters=()) -> sqlite3.Cursor:
+        return self.conn.execute(sql, parameters)
+
+    def close(self):
+        self.conn.close()
+
+
+def main(shard_dir: str = SHARD_DIR, build: Optional[List[str]] = None, workers: Optional[int] = None,
+         report: bool = False, sql: Optional[str] = None):
+    if build is not None:
+        start = time.perf_counter()
+        results = build_shards(shard_dir=shard_dir, aircraft_types=build or None, workers=workers)
+        for r in results:
+            print(f"✅ {r['aircraft_type']:<8} {r['items']:>6,} items {r['rows']:>7,} rows "
+                  f"{r['seconds']:>6.2f}s  {r['path']}  ({', '.join(r['files'])})")
+        elapsed = time.perf_counter() - start
+        print(f"⚡ {len(results)} shards in {elapsed:.2f}s wall vs "
+              f"{sum(r['seconds'] for r in results):.2f}s of shard builds")
+
+    if report or sql:
+        fleet = FleetShards(shard_dir)
+        try:
+            how = "copied in batches" if fleet.copied else "attached"
+            print(f"🗂️  {len(fleet.shards)} shards {how}: {', '.join(fleet.shards)}")
+            if report:
+                cursor = fleet.conn.cursor()
+                print_aircraft_summary(cursor)
+                print_duplicate_statistics(cursor)
+            if sql:
+                start = time.perf_counter()
+                cursor = fleet.execute(sql)
+                rows = cursor.fetchall()
+                if cursor.description:
+                    print(" | ".join(d[0] for d in cursor.description))
+                for row in rows:
+                    print(" | ".join(str(value) for value in row))
+                print(f"\n🔎 {len(rows)} rows in {(time.perf_counter() - start) * 1000:.1f} ms")
+        finally:
+            fleet.close()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Build one MMEL database per aircraft type in parallel and query them as one fleet",
+        epilog="Example: python mmel_shards.py --build && python mmel_shards.py --build B748 --report")
+    parser.add_argument("--dir", default=SHARD_DIR, help=f"shard directory (default: {SHARD_DIR})")
+    parser.add_argument("--build", nargs="*", metavar="TYPE",
+                        help="(re)build the shards of these aircraft types, or of all types when none are given")
+    parser.add_argument("--workers", type=int, default=None,
+                        help="shards built in parallel (default: CPU count)")
+    parser.add_argument("--report", action="store_true",
+                        help="print the fleet's aircraft summary and duplicate statistics")
+    parser.add_argument("--sql", help="run a query over the fleet views (mmel_items, aircraft_summary, ...)")
+    args = parser.parse_args()
+    if args.build is None and not args.report and not args.sql:
+        parser.error("nothing to do: give --build, --report and/or --sql")
+
+    main(args.dir, build=args.build, workers=args.workers, report=args.report, sql=args.sql)
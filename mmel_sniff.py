@@ -0,0 +1,216 @@
+"""Cheap format detection for MMEL PDFs.
+
+The parser and its grammar are chosen from the aircraft type, so a wrong
+type costs a full extraction and parse that yields garbage. sniff_pdf()
+reads only the first few item pages (pages with an item number and a
+repair category) and weighs three signals:
+
+- the aircraft named after "AIRCRAFT:" in the page header,
+- the item lines each parser grammar would start an item on: its own
+  line classification is run over the page, so a style counts only when
+  that parser can read it (FAA "21-21-01" / "-21-01" alone on a line,
+  A-380 "21-03 Title", B747-400 "31-1 Title" / "31-1A Title"),
+- the column layout: A-380 pages carry category and number installed on
+  one line ("C 2"), the others one column per line.
+
+The result names the grammar, the aircraft type and a confidence between
+0 and 1; the evidence is returned with it. A grammar that starts no item
+on the sampled pages has no confidence, whatever the header says.
+"""
+import argparse
+import re
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+import fitz  # PyMuPDF
+
+from mmel_grammar import ITEM_START, A380Grammar, B747Grammar, FAAGrammar
+
+MAX_ITEM_PAGES = 5
+MAX_PAGES = 80             # preamble and table of contents pages read at most
+HEADER_LINES = 15          # non-blank lines at the top of a page holding its header and page label
+MIN_CONFIDENCE = 0.6       # below this, "auto" refuses to pick a parser
+
+# Signal weights; the header counts only when it names a known type
+STYLE_WEIGHT = 0.5
+LAYOUT_WEIGHT = 0.25
+HEADER_WEIGHT = 0.25
+
+# Candidate grammars with the aircraft type their filter profile is taken from
+_GRAMMARS = [(FAAGrammar, ""), (A380Grammar, "A380"), (B747Grammar, "B747-400")]
+# Any item number shape, parsable or not: sampled pages are chosen with it
+_ITEM_NUMBER_RE = re.compile(r"-?\d{2}-\d{1,2}(?:-\d{2})*[A-Z]?(?:\s|$)")
+_CATEGORY_RE = re.compile(r"[A-D]$")
+_CATEGORY_QUANTITY_RE = re.compile(r"[A-D]\s+\d+$")
+
+# Aircraft named in the header, checked in order
+HEADER_TYPE_PATTERNS = [
+    (re.compile(r"A-?380"), "A380"),
+    (re.compile(r"A-?350"), "A350"),
+    (re.compile(r"A-?330"), "A330"),
+    (re.compile(r"A-?3(?:18|19|20|21)"), "A320"),
+    (re.compile(r"737\s*MAX|737-(?:7|8|9|10)\b", re.IGNORECASE), "B38M"),
+    (re.compile(r"737"), "B737"),
+    (re.compile(r"747-8"), "B748"),
+    (re.compile(r"747-400"), "B747-400"),
+    (re.compile(r"767"), "B767"),
+    (re.compile(r"777"), "B777"),
+    (re.compile(r"787"), "B787"),
+]
+
+# Aircraft type assumed for a tabular grammar when the header names none
+_GRAMMAR_TYPES = {A380Grammar.name: "A380", B747Grammar.name: "B747-400"}
+
+
+def grammar_for_type(aircraft_type: str) -> str:
+    """Name of the grammar mmel_parser uses for an aircraft type"""
+    if aircraft_type == "A380":
+        return A380Grammar.name
+    elif aircraft_type == "B747-400":
+        return B747Grammar.name
+    else:
+        return FAAGrammar.name
+
+
+def header_aircraft_type(lines: List[str]) -> Optional[str]:
+    """Type named in the lines following "AIRCRAFT:", if any"""
+    for n, line in enumerate(lines):
+        if line.startswith("AIRCRAFT"):
+            header = " ".join([line[len("AIRCRAFT:"):]] + lines[n + 1:n + 8])
+            for pattern, aircraft_type in HEADER_TYPE_PATTERNS:
+                if pattern.search(header):
+                    return aircraft_type
+            return None
+    return None
+
+
+def sniff_pdf(pdf_path: str, max_item_pages: int = MAX_ITEM_PAGES, max_pages: int = MAX_PAGES) -> Dict:
+    """Grammar, aircraft type and confidence from the first item pages"""
+    start = time.perf_counter()
+    grammars = [grammar.for_aircraft(aircraft_type) for grammar, aircraft_type in _GRAMMARS]
+    item_lines: Counter = Counter()
+    parsed_pages: Counter = Counter()
+    layout: Counter = Counter()
+    headers: Counter = Counter()
+    item_pages = pages_read = 0
+    with fitz.open(pdf_path) as doc:
+        for page in doc:
+            if pages_read >= max_pages or item_pages >= max_item_pages:
+                break
+            pages_read += 1
+            lines = [line.strip() for line in page.get_text("text").splitlines()]
+            lines = [line for line in lines if line]
+            # Page labels such as "21-3" in the header look like item numbers
+            body = lines[HEADER_LINES:]
+            numbers = [line for line in body if _ITEM_NUMBER_RE.match(line)]
+            categories = sum(1 for line in body if _CATEGORY_RE.match(line))
+            category_quantities = sum(1 for line in body if _CATEGORY_QUANTITY_RE.match(line))
+            if not numbers or not (categories or category_quantities):
+                continue
+            item_pages += 1
+            page_items = Counter(grammar.name for grammar in grammars for line in numbers
+                                 if grammar.classify(line)[0] == ITEM_START)
+            item_lines.update(page_items)
+            parsed_pages.update(page_items.keys())
+            layout["column per line"] += categories
+            layout["category and quantity"] += category_quantities
+            aircraft_type = header_aircraft_type(lines)
+            if aircraft_type:
+                headers[aircraft_type] += 1
+
+    layout_counts = {
+        FAAGrammar.name: layout["column per line"],
+        B747Grammar.name: layout["column per line"],
+        A380Grammar.name: layout["category and quantity"],
+    }
+    header_type = headers.most_common(1)[0][0] if headers else None
+
+    scores = {}
+    for name in (grammar.name for grammar in grammars):
+        if not item_lines[name]:
+            # The parser would yield nothing from these pages
+            scores[name] = 0.0
+            continue
+        score = STYLE_WEIGHT * item_lines[name] / sum(item_lines.values())
+        # FAA and B747 pages share their layout, so its share is taken per format family
+        score += LAYOUT_WEIGHT * layout_counts[name] / max(
+            layout["column per line"] + layout["category and quantity"], 1)
+        if header_type and grammar_for_type(header_type) == name:
+            score += HEADER_WEIGHT
+        # Scaled by the share of item pages the parser finds items on
+        scores[name] = round(score * parsed_pages[name] / item_pages, 3)
+    grammar = max(scores, key=scores.__getitem__)
+
+    if header_type and grammar_for_type(header_type) == grammar:
+        aircraft_type = header_type
+    else:
+        aircraft_type = _GRAMMAR_TYPES.get(grammar)
+    return {
+        "pdf": pdf_path,
+        "aircraft_type": aircraft_type,
+        "grammar": grammar,
+        "confidence": scores[grammar],
+        "scores": scores,
+        "header_type": header_type,
+        "item_lines": dict(item_lines),
+        "layout": dict(layout),
+        "item_pages": item_pages,
+        "pages_read": pages_read,
+        "seconds": time.perf_counter() - start,
+    }
+
+
+def detect_aircraft_type(pdf_path: str, min_confidence: float = MIN_CONFIDENCE) -> Dict:
+    """sniff_pdf() result whose aircraft_type can be used for parsing.
+
+    Raises ValueError when no type is found with enough confidence.
+    """
+    result = sniff_pdf(pdf_path)
+    if result["aircraft_type"] is None or result["confidence"] < min_confidence:
+        raise ValueError(f"Cannot detect the aircraft type of {pdf_path} "
+                         f"(best guess {result['aircraft_type'] or result['header_type'] or 'unknown'}, {result['grammar']} grammar, "
+                         f"confidence {result['confidence']:.2f}); pass it explicitly")
+    return result
+
+
+def check_aircraft_type(pdf_path: str, aircraft_type: str, min_confidence: float = MIN_CONFIDENCE,
+                        require_items: bool = True) -> Optional[str]:
+    """Why aircraft_type's parser does not fit the PDF, or None when it does
+    (or the sniff is not confident enough to tell).
+
+    With require_items, a parser that starts no item on the sampled item
+    pages does not fit either; layout mode reads other lines and skips that.
+    """
+    result = sniff_pdf(pdf_path)
+    grammar = grammar_for_type(aircraft_type)
+    if result["confidence"] >= min_confidence and result["grammar"] != grammar:
+        return (f"{pdf_path} looks like {result['aircraft_type'] or 'an unknown type'} "
+                f"({result['grammar']} grammar, confidence {result['confidence']:.2f}), "
+                f"not {aircraft_type} ({grammar} grammar)")
+    if require_items and result["item_pages"] and not result["item_lines"].get(grammar):
+        return (f"The {grammar} grammar of {aircraft_type} reads no item number on the first "
+                f"{result['item_pages']} item pages of {pdf_path}; the parser would yield nothing")
+    return None
+
+
+def main(pdf_files: List[str]):
+    name_width = max([len(path) for path in pdf_files] + [4])
+    print(f"{'File':<{name_width}} | Type     | Grammar  | Confidence | Header   | Pages | Time (s) | Item lines")
+    print("-" * (name_width + 90))
+    for pdf_path in pdf_files:
+        r = sniff_pdf(pdf_path)
+        item_lines = ", ".join(f"{name} {count}" for name, count in sorted(r["item_lines"].items()))
+        print(f"{pdf_path:<{name_width}} | {r['aircraft_type'] or '?':<8} | {r['grammar']:<8} | "
+              f"{r['confidence']:>10.2f} | {r['header_type'] or '-':<8} | {r['pages_read']:>5} | "
+              f"{r['seconds']:>8.2f} | {item_lines or '-'}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Detect the format and aircraft type of MMEL PDFs from their first item pages",
+        epilog="Example: python mmel_sniff.py *.pdf")
+    parser.add_argument("pdf_files", nargs="+", help="MMEL PDF files")
+    args = parser.parse_args()
+
+    main(args.pdf_files)
@@ -0,0 +1,106 @@
+"""BM25-ranked full-text search over mmel_db.db.
+
+Uses the mmel_search FTS5 index built by create_enhanced_database.py over
+item titles, remarks summaries and maintenance/operational procedure text.
+By default the query is searched as a phrase ("pack valve" only matches the
+two words together); --match passes FTS5 query syntax through unchanged.
+"""
+import argparse
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+# Column weights for bm25(): title, remarks, procedures
+TITLE_WEIGHT = 5.0
+REMARKS_WEIGHT = 2.0
+PROCEDURES_WEIGHT = 1.0
+
+
+def phrase_query(text: str) -> str:
+    """FTS5 phrase for free text, with embedded quotes escaped"""
+    return '"' + text.replace('"', '""') + '"'
+
+
+def search_mmel(conn: sqlite3.Connection, query: str, aircraft_type: Optional[str] = None,
+                ata_chapter: Optional[str] = None, limit: int = 20) -> List[Dict]:
+    """Items matching an FTS5 query, best BM25 score first"""
+    sql = f'''
+        SELECT mi.id, mi.aircraft_type, mi.ata_chapter, mi.item_number, mi.sequence_number,
+               mi.title, mi.deferral_category,
+               bm25(mmel_search, {TITLE_WEIGHT}, {REMARKS_WEIGHT}, {PROCEDURES_WEIGHT}) AS score,
+               snippet(mmel_search, -1, '[', ']', '...', 10)
+        FROM mmel_search
+        JOIN mmel_items mi ON mi.id = mmel_search.rowid
+        WHERE mmel_search MATCH ?
+    '''
+    params: list = [query]
+    if aircraft_type:
+        sql += ' AND mmel_search.aircraft_type = ?'
+        params.append(aircraft_type)
+    if ata_chapter:
+        sql += ' AND mmel_search.ata_chapter = ?'
+        params.append(ata_chapter)
+    sql += ' ORDER BY score LIMIT ?'
+    params.append(limit)
+
+    results = []
+    for row in conn.execute(sql, params):
+        results.append({
+            "id": row[0],
+            "aircraftType": row[1],
+            "ataChapter": row[2],
+            "itemNumber": row[3],
+            "sequenceNumber": row[4],
+            "title": row[5],
+            "deferralCategory": row[6],
+            "score": row[7],
+            "snippet": row[8],
+        })
+    return results
+
+
+def main(query: str, db_path: str = 'mmel_db.db', aircraft_type: Optional[str] = None,
+         ata_chapter: Optional[str] = None, limit: int = 20, raw: bool = False):
+    if not Path(db_path).is_file():
+        print(f"❌ {db_path}: Database not found, run create_enhanced_database.py first")
+        return 1
+    # Read-only, so a mistyped path cannot leave an empty database behind
+    conn = sqlite3.connect(Path(db_path).resolve().as_uri() + "?mode=ro", uri=True)
+    start = time.perf_counter()
+    try:
+        results = search_mmel(conn, query if raw else phrase_query(query),
+                              aircraft_type=aircraft_type, ata_chapter=ata_chapter, limit=limit)
+    except sqlite3.OperationalError as e:
+        if "no such table" in str(e):
+            print(f"❌ {db_path} has no search index, run create_enhanced_database.py first")
+        else:
+            print(f"❌ Invalid search syntax: {e}")
+        return 1
+    finally:
+        conn.close()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+
+    for r in results:
+        print(f"{r['aircraftType']:>8} | {r['itemNumber']:<12} | {r['deferralCategory'] or '-':>3} | "
+              f"{r['score']:>7.2f} | {r['title'][:60]}")
+        print(f"{'':>8}   {' '.join(r['snippet'].split())}")
+    print(f"\n🔎 {len(results)} items in {elapsed_ms:.1f} ms")
+    return 0
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Search MMEL titles, remarks and procedures in mmel_db.db",
+        epilog='Example: python search_mmel.py "pack valve" --aircraft B737 --ata 21')
+    parser.add_argument("query", help="words to search for, as a phrase unless --match is given")
+    parser.add_argument("--db", default='mmel_db.db', help="database file (default: mmel_db.db)")
+    parser.add_argument("--aircraft", help="only items of this aircraft type")
+    parser.add_argument("--ata", help="only items of this ATA chapter")
+    parser.add_argument("--limit", type=int, default=20, help="maximum number of items (default: 20)")
+    parser.add_argument("--match", action="store_true",
+                        help="treat the query as FTS5 syntax (AND/OR/NEAR, prefix*, column:)")
+    args = parser.parse_args()
+
+    raise SystemExit(main(args.query, db_path=args.db, aircraft_type=args.aircraft, ata_chapter=args.ata,
+                          limit=args.limit, raw=args.match))
@@ -0,0 +1,21 @@
+import sys
+from pathlib import Path
+
+import pytest
+
+REPO = Path(__file__).resolve().parent.parent
+# The tools are flat top-level modules
+sys.path.insert(0, str(REPO))
+
+
+def _require(name: str) -> str:
+    path = REPO / name
+    if not path.exists():
+        pytest.skip(f"{name} is not in the repository")
+    return str(path)
+
+
+@pytest.fixture(scope="session")
+def repo_file():
+    """Absolute path of a bundled PDF or JSON output; skips when it is missing"""
+    return _require
@@ -0,0 +1,38 @@
+"""Batch job discovery: output names of PDFs that share a type"""
+import json
+
+import pytest
+
+from mmel_batch import discover_jobs, load_manifest
+
+
+def test_shared_types_are_named_after_the_pdf(tmp_path):
+    # Only the file names are read when they give the type
+    for name in ("B-747-400_Rev_32.pdf", "B-747-400LCF_Rev 3.pdf", "B-767_Rev_41.pdf"):
+        (tmp_path / name).touch()
+    outputs = {job["pdf"]: job["output"] for job in discover_jobs(str(tmp_path))}
+    assert outputs == {
+        str(tmp_path / "B-747-400LCF_Rev 3.pdf"): str(tmp_path / "B-747-400LCF_Rev 3_MMEL.json"),
+        str(tmp_path / "B-747-400_Rev_32.pdf"): str(tmp_path / "B-747-400_Rev_32_MMEL.json"),
+        str(tmp_path / "B-767_Rev_41.pdf"): str(tmp_path / "B767MMEL.json"),
+    }
+
+
+def test_manifest_outputs_are_kept(tmp_path):
+    manifest = tmp_path / "mmel_manifest.json"
+    manifest.write_text(json.dumps([
+        {"pdf": "a.pdf", "aircraft_type": "B747-400", "output": "B744MMEL.json"},
+        {"pdf": "b.pdf", "aircraft_type": "B747-400"},
+    ]), encoding="utf-8")
+    assert [job["output"] for job in discover_jobs(str(tmp_path))] == \
+        [str(tmp_path / "B744MMEL.json"), str(tmp_path / "B747-400MMEL.json")]
+
+
+def test_duplicate_outputs_are_rejected(tmp_path):
+    manifest = tmp_path / "mmel_manifest.json"
+    manifest.write_text(json.dumps([
+        {"pdf": "a.pdf", "aircraft_type": "B748", "output": "fleet.json"},
+        {"pdf": "b.pdf", "aircraft_type": "B767", "output": "./fleet.json"},
+    ]), encoding="utf-8")
+    with pytest.raises(ValueError, match="a.pdf and b.pdf would both write"):
+        load_manifest(str(manifest))
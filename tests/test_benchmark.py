@@ -0,0 +1,24 @@
+"""Benchmark jobs: parser choice and jobs that failed before the run"""
+import pytest
+
+from mmel_benchmark import bench_file
+from mmel_grammar import A380Grammar, B747Grammar, FAAGrammar
+from mmel_parser import (parse_a380_mmel_entries, parse_b747_400_mmel_entries, parse_mmel_entries, select_grammar,
+                         select_parser)
+
+
+@pytest.mark.parametrize("aircraft_type, parser, grammar", [
+    ("A380", parse_a380_mmel_entries, A380Grammar),
+    ("B747-400", parse_b747_400_mmel_entries, B747Grammar),
+    ("B737", parse_mmel_entries, FAAGrammar),
+])
+def test_parser_matches_the_grammar(aircraft_type, parser, grammar):
+    assert select_parser(aircraft_type) is parser
+    assert select_grammar(aircraft_type) is grammar
+
+
+def test_failed_jobs_are_reported_not_benchmarked(tmp_path):
+    job = {"pdf": str(tmp_path / "missing.pdf"), "aircraft_type": "auto",
+           "output": str(tmp_path / "autoMMEL.json"), "error": "ValueError: no aircraft type detected"}
+    assert bench_file(job, repeat=1) == {"pdf": "missing.pdf", "aircraft_type": "auto",
+                                         "error": "ValueError: no aircraft type detected"}
@@ -0,0 +1,61 @@
+"""Round trips of the compact binary format"""
+import json
+import math
+
+import pytest
+
+import mmel_binary
+from mmel_entry import MMELEntry
+
+BUNDLED = ["A380MMEL.json", "B38MMMEL.json", "B737MMEL.json", "B748MMEL.json", "B767MMEL.json"]
+
+
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _same(a, b):
+    """Equal values of equal types, with key order, so 1 != 1.0 != True"""
+    if isinstance(a, dict):
+        return type(b) is dict and list(a) == list(b) and all(_same(a[k], b[k]) for k in a)
+    if isinstance(a, list):
+        return type(b) is list and len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    if isinstance(a, float) and math.isnan(a):
+        return isinstance(b, float) and math.isnan(b)
+    return type(a) is type(b) and a == b
+
+
+@pytest.mark.parametrize("name", BUNDLED)
+@pytest.mark.parametrize("compress", [False, True])
+def test_bundled_outputs_round_trip(tmp_path, repo_file, name, compress):
+    entries = _load_json(repo_file(name))
+    path = tmp_path / (name + ".mmelb")
+    assert mmel_binary.dump(entries, str(path), compress=compress) == len(entries)
+    assert _same(mmel_binary.load(str(path)), entries)
+
+
+def test_round_trip_through_entry_records(repo_file):
+    entries = _load_json(repo_file("B38MMMEL.json"))
+    records = [MMELEntry.from_dict(entry).to_dict() for entry in entries]
+    assert _same(mmel_binary.loads(mmel_binary.dumps(records)), entries)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_edge_values_round_trip(compress):
+    entries = [
+        {},
+        {"empty": "", "list": [], "nested": {"a": [1, [2, {"b": None}]]}},
+        {"ints": [0, -1, 1, 2 ** 28 - 1, -(2 ** 28), 2 ** 28, 2 ** 64, -(2 ** 70)]},
+        {"floats": [0.0, -0.0, 1.5, 1e300, float("inf"), float("nan")], "consts": [None, False, True]},
+        {"text": ["é", "日本語", "emoji 🛫", "a\x00b", "x" * 70000]},
+        {"same shape": 1, "other": "a"},
+        {"other": "a", "same shape": 1},
+    ]
+    assert _same(mmel_binary.loads(mmel_binary.dumps(entries, compress=compress)), entries)
+
+
+def test_empty_and_foreign_data():
+    assert mmel_binary.loads(mmel_binary.dumps([])) == []
+    with pytest.raises(ValueError):
+        mmel_binary.loads(b"{}")
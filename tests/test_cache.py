@@ -0,0 +1,98 @@
+"""Content-addressed cache: hits, invalidation and LRU eviction"""
+import itertools
+import shutil
+
+import pytest
+
+import mmel_cache
+import mmel_parser
+from mmel_cache import MMELCache
+from mmel_parser import convert_pdf
+
+PDF = "B-737_MAX_Rev_6.pdf"
+AIRCRAFT_TYPE = "B38M"
+GOLDEN = "B38MMMEL.json"
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    """Counts of PDF extractions and parses during a test"""
+    counts = {"extract": 0, "parse": 0}
+    extract = mmel_parser.extract_text_from_pdf
+    select = mmel_parser.select_entry_iterator
+
+    def counting_extract(*args, **kwargs):
+        counts["extract"] += 1
+        return extract(*args, **kwargs)
+
+    def counting_select(aircraft_type):
+        iter_entries = select(aircraft_type)
+
+        def counting_iter(*args, **kwargs):
+            counts["parse"] += 1
+            return iter_entries(*args, **kwargs)
+        return counting_iter
+
+    monkeypatch.setattr(mmel_parser, "extract_text_from_pdf", counting_extract)
+    monkeypatch.setattr(mmel_parser, "select_entry_iterator", counting_select)
+    return counts
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = MMELCache(str(tmp_path / "cache"))
+    yield cache
+    cache.close()
+
+
+def test_second_run_is_served_from_the_cache(tmp_path, repo_file, cache, calls):
+    first, second = tmp_path / "first.json", tmp_path / "second.json"
+    assert convert_pdf(repo_file(PDF), str(first), AIRCRAFT_TYPE, cache=cache) == \
+        convert_pdf(repo_file(PDF), str(second), AIRCRAFT_TYPE, cache=cache)
+    assert calls == {"extract": 1, "parse": 1}
+    assert _read(first) == _read(second) == _read(repo_file(GOLDEN))
+
+
+def test_parser_change_reparses_the_cached_text(tmp_path, repo_file, cache, calls):
+    output = tmp_path / "out.json"
+    convert_pdf(repo_file(PDF), str(output), AIRCRAFT_TYPE, cache=cache)
+    cache._parser_version = "edited parser"
+    convert_pdf(repo_file(PDF), str(output), AIRCRAFT_TYPE, cache=cache)
+    assert calls == {"extract": 1, "parse": 2}
+    assert _read(output) == _read(repo_file(GOLDEN))
+
+
+def test_changed_pdf_is_extracted_again(tmp_path, repo_file, cache, calls):
+    pdf = tmp_path / "revision.pdf"
+    shutil.copy(repo_file(PDF), pdf)
+    output = tmp_path / "out.json"
+    convert_pdf(str(pdf), str(output), AIRCRAFT_TYPE, cache=cache)
+    # Same path, other content: the remembered hash must not be reused
+    with open(pdf, "ab") as f:
+        f.write(b"\n% trailing comment\n")
+    convert_pdf(str(pdf), str(output), AIRCRAFT_TYPE, cache=cache)
+    assert calls["extract"] == 2
+
+
+def test_least_recently_used_blobs_are_evicted(tmp_path, monkeypatch):
+    clock = itertools.count()
+    monkeypatch.setattr(mmel_cache.time, "time", lambda: next(clock))
+    cache = MMELCache(str(tmp_path / "cache"), max_bytes=250)
+    try:
+        keys = [cache.text_key(f"pdf{n}", {}) for n in range(3)]
+        cache.put_text(keys[0], "a" * 100)
+        cache.put_text(keys[1], "b" * 100)
+        assert cache.get_text(keys[0])[0] == "a" * 100
+        # Over the cap: the blob read longest ago goes
+        cache.put_text(keys[2], "c" * 100)
+        assert cache.get_text(keys[1]) is None
+        assert cache.get_text(keys[0])[0] == "a" * 100
+        assert cache.get_text(keys[2])[0] == "c" * 100
+        assert cache.total_bytes() == 200
+    finally:
+        cache.close()
@@ -0,0 +1,91 @@
+"""FleetCatalog lookups and ranges against a scan of the JSON outputs"""
+import json
+import shutil
+
+import pytest
+
+from mmel_catalog import FleetCatalog
+
+JSON_FILES = ["A330MMEL.json", "B38MMMEL.json", "B737MMEL.json"]
+
+
+@pytest.fixture(scope="module")
+def fleet(tmp_path_factory, repo_file):
+    """Catalog of a directory of outputs, and the entries it was loaded from"""
+    directory = tmp_path_factory.mktemp("fleet")
+    entries = []
+    for name in JSON_FILES:
+        shutil.copy(repo_file(name), directory / name)
+        with open(directory / name, "r", encoding="utf-8") as f:
+            entries.extend(json.load(f))
+    return FleetCatalog.load(str(directory)), entries
+
+
+def _dicts(entries):
+    return [entry.to_dict() for entry in entries]
+
+
+def test_loads_every_type(fleet):
+    catalog, entries = fleet
+    assert catalog.aircraft_types == ["A330", "B38M", "B737"]
+    assert len(catalog) == len(entries)
+
+
+def test_item_lookups(fleet):
+    catalog, entries = fleet
+    for entry in entries:
+        expected = [e for e in entries
+                    if e["aircraftType"] == entry["aircraftType"] and e["itemNumber"] == entry["itemNumber"]]
+        assert _dicts(catalog.get(entry["aircraftType"], entry["itemNumber"])) == expected
+        assert catalog.item(entry["aircraftType"], entry["itemNumber"]).to_dict() == expected[0]
+    assert catalog.get("A330", "99-99-99") == [] and catalog.get("B999", "21-51-01") == []
+    assert catalog.item("A330", "99-99-99") is None
+
+
+@pytest.mark.parametrize("first, last, aircraft_type", [
+    ("21", None, None), ("21", "24", "B737"), ("30", "36", None), ("80", "99", None), ("22", "21", None),
+])
+def test_chapter_ranges(fleet, first, last, aircraft_type):
+    catalog, entries = fleet
+    last_chapter = first if last is None else last
+    expected = sorted((e for e in entries if first <= e["ataChapter"] <= last_chapter
+                       and aircraft_type in (None, e["aircraftType"])),
+                      key=lambda e: (e["aircraftType"], e["ataChapter"], e["itemNumber"]))
+    assert _dicts(catalog.chapters(first, last, aircraft_type)) == expected
+
+
+@pytest.mark.parametrize("category", ["A", "B", "C", "D", ""])
+def test_categories(fleet, category):
+    catalog, entries = fleet
+    expected = sorted((e for e in entries if e["deferralCategory"] == category),
+                      key=lambda e: e["aircraftType"])
+    assert _dicts(catalog.by_category(category)) == expected
+    assert _dicts(catalog.by_category(category, "A330")) == [e for e in expected if e["aircraftType"] == "A330"]
+
+
+def test_reload_rereads_one_type(tmp_path, repo_file):
+    for name in JSON_FILES:
+        shutil.copy(repo_file(name), tmp_path / name)
+    catalog = FleetCatalog.load(str(tmp_path))
+    others = catalog.get("A330", "21-51-01")
+
+    path = tmp_path / "B737MMEL.json"
+    with open(path, "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    entries[0]["title"] = "Reloaded title"
+    path.write_text(json.dumps(entries), encoding="utf-8")
+    catalog.reload("B737")
+
+    assert catalog.item("B737", entries[0]["itemNumber"]).title == "Reloaded title"
+    assert catalog.get("A330", "21-51-01") is others
+    with pytest.raises(KeyError):
+        catalog.reload("B999")
+
+
+def test_identical_files_are_loaded_once(tmp_path, repo_file):
+    for name in ("B748MMEL.json", "B74FMMEL.json"):
+        shutil.copy(repo_file(name), tmp_path / name)
+    catalog = FleetCatalog.load(str(tmp_path))
+    assert catalog.duplicates == {str(tmp_path / "B74FMMEL.json"): str(tmp_path / "B748MMEL.json")}
+    with open(tmp_path / "B748MMEL.json", "r", encoding="utf-8") as f:
+        assert len(catalog) == len(json.load(f))
@@ -0,0 +1,179 @@
+"""Bulk, JSON Lines and trigger loads against the row-by-row load"""
+import contextlib
+import io
+import json
+import shutil
+
+import pytest
+
+from create_enhanced_database import (
+    bulk_insert_enhanced_mmel_data,
+    create_enhanced_mmel_database,
+    create_mmel_indexes,
+    insert_enhanced_mmel_data,
+    install_summary_triggers,
+    set_bulk_load_pragmas,
+    stream_insert_mmel_jsonl,
+    update_enhanced_aircraft_summary,
+)
+from mmel_shards import FleetShards, build_shards
+
+# B74F holds the B748 entries again, so sequence numbers continue across files
+JSON_FILES = ["B737MMEL.json", "B38MMMEL.json", "B748MMEL.json", "B74FMMEL.json"]
+
+# Load timestamps and the summary row id differ between loads
+TABLES = {
+    "mmel_items": "id, aircraft_type, ata_chapter, item_number, sequence_number, title, deferral_category, "
+                  "quantity_installed, quantity_required, remarks_summary, source_file",
+    "maintenance_procedures": "*",
+    "operational_procedures": "*",
+    "remarks_steps": "*",
+    "aircraft_summary": "aircraft_type, total_items, unique_item_numbers, total_category_a, total_category_b, "
+                        "total_category_c, total_category_d, total_empty_category, "
+                        "items_with_maintenance_procedures, items_with_operational_procedures, "
+                        "items_with_remarks, source_file",
+}
+
+
+def _rows(conn):
+    return {table: conn.execute(f"SELECT {columns} FROM {table} ORDER BY 1").fetchall()
+            for table, columns in TABLES.items()}
+
+
+def _row_by_row(conn):
+    for name in JSON_FILES:
+        insert_enhanced_mmel_data(conn, name)
+    update_enhanced_aircraft_summary(conn)
+
+
+def _bulk(conn):
+    set_bulk_load_pragmas(conn, True)
+    for name in JSON_FILES:
+        bulk_insert_enhanced_mmel_data(conn, name)
+    create_mmel_indexes(conn)
+    set_bulk_load_pragmas(conn, False)
+    update_enhanced_aircraft_summary(conn)
+
+
+def _triggers(conn):
+    install_summary_triggers(conn)
+    for name in JSON_FILES:
+        insert_enhanced_mmel_data(conn, name)
+
+
+def _bulk_triggers(conn):
+    install_summary_triggers(conn)
+    for name in JSON_FILES:
+        bulk_insert_enhanced_mmel_data(conn, name)
+
+
+def _load(path, loader, create_indexes=True):
+    # The loaders print a progress line per file
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn = create_enhanced_mmel_database(str(path), create_indexes=create_indexes)
+        loader(conn)
+    return conn
+
+
+@pytest.fixture
+def json_dir(tmp_path, repo_file, monkeypatch):
+    """The JSON outputs under their bare names, as source_file records them"""
+    directory = tmp_path / "json"
+    directory.mkdir()
+    for name in JSON_FILES:
+        shutil.copy(repo_file(name), directory / name)
+    monkeypatch.chdir(directory)
+    return directory
+
+
+@pytest.fixture
+def expected(json_dir, tmp_path):
+    conn = _load(tmp_path / "row_by_row.db", _row_by_row)
+    try:
+        yield _rows(conn)
+    finally:
+        conn.close()
+
+
+@pytest.mark.parametrize("loader, create_indexes", [(_bulk, False), (_triggers, True), (_bulk_triggers, True)])
+def test_load_matches_row_by_row(tmp_path, expected, loader, create_indexes):
+    conn = _load(tmp_path / "load.db", loader, create_indexes)
+    try:
+        assert _rows(conn) == expected
+    finally:
+        conn.close()
+
+
+def test_jsonl_load_matches_row_by_row(tmp_path, json_dir, expected, monkeypatch):
+    # JSON Lines files under the same bare names, so source_file agrees
+    directory = tmp_path / "jsonl"
+    directory.mkdir()
+    for name in JSON_FILES:
+        with open(json_dir / name, "r", encoding="utf-8") as f:
+            entries = json.load(f)
+        with open(directory / name, "w", encoding="utf-8") as f:
+            for entry in entries:
+                f.write(json.dumps(entry) + "\n")
+    monkeypatch.chdir(directory)
+
+    def stream(conn):
+        for name in JSON_FILES:
+            stream_insert_mmel_jsonl(conn, name, batch_size=100)
+        update_enhanced_aircraft_summary(conn)
+
+    conn = _load(tmp_path / "jsonl.db", stream)
+    try:
+        assert _rows(conn) == expected
+    finally:
+        conn.close()
+
+
+def test_summary_triggers_follow_updates(tmp_path, json_dir):
+    conn = _load(tmp_path / "triggers.db", _triggers)
+    try:
+        conn.execute("UPDATE mmel_items SET deferral_category = 'A' WHERE deferral_category = 'C' AND id % 3 = 0")
+        conn.execute("UPDATE mmel_items SET remarks_summary = '' WHERE id % 7 = 0")
+        conn.execute("UPDATE mmel_items SET item_number = item_number || '-X' WHERE id % 11 = 0")
+        conn.execute("UPDATE mmel_items SET aircraft_type = 'B74F' WHERE aircraft_type = 'B748' AND id % 5 = 0")
+        conn.commit()
+        maintained = _rows(conn)["aircraft_summary"]
+
+        update_enhanced_aircraft_summary(conn)
+        assert maintained == _rows(conn)["aircraft_summary"]
+    finally:
+        conn.close()
+
+
+def test_shards_hold_the_rows_of_one_database(tmp_path, expected):
+    shard_dir = str(tmp_path / "shards")
+    build_shards(JSON_FILES, shard_dir, workers=1)
+    shards = FleetShards(shard_dir)
+    try:
+        # Shard ids are offset per shard; compare the rows without them
+        columns = TABLES["mmel_items"].replace("id, ", "", 1)
+        rows = shards.execute(f"SELECT {columns} FROM mmel_items "
+                              "ORDER BY aircraft_type, item_number, sequence_number").fetchall()
+        assert rows == sorted((row[1:] for row in expected["mmel_items"]), key=lambda r: (r[0], r[2], r[3]))
+        summary = shards.execute(f"SELECT {TABLES['aircraft_summary']} FROM aircraft_summary "
+                                 "ORDER BY aircraft_type").fetchall()
+        assert summary == expected["aircraft_summary"]
+        steps = shards.execute("SELECT COUNT(*) FROM remarks_steps").fetchone()[0]
+        assert steps == len(expected["remarks_steps"])
+    finally:
+        shards.close()
+
+
+def test_batched_shards_match_attached_shards(tmp_path, json_dir):
+    shard_dir = str(tmp_path / "shards")
+    build_shards(JSON_FILES, shard_dir, workers=1)
+    queries = [f"SELECT * FROM {table} ORDER BY 1" for table in TABLES]
+
+    attached = FleetShards(shard_dir)
+    copied = FleetShards(shard_dir, attach_limit=2)
+    try:
+        assert not attached.copied and copied.copied
+        for sql in queries:
+            assert copied.execute(sql).fetchall() == attached.execute(sql).fetchall()
+    finally:
+        attached.close()
+        copied.close()
@@ -0,0 +1,71 @@
+"""Equivalent items across aircraft types: pairs and groups"""
+import contextlib
+import io
+
+import pytest
+
+from create_enhanced_database import bulk_insert_enhanced_mmel_data, create_enhanced_mmel_database
+from mmel_equivalents import DEFAULT_THRESHOLD, build_equivalents, show_equivalents, title_tokens
+
+JSON_FILES = ["A320MMEL.json", "A330MMEL.json"]
+
+
+@pytest.fixture(scope="module")
+def conn(tmp_path_factory, repo_file):
+    path = tmp_path_factory.mktemp("equivalents") / "mmel_db.db"
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn = create_enhanced_mmel_database(str(path))
+        for name in JSON_FILES:
+            bulk_insert_enhanced_mmel_data(conn, repo_file(name))
+    build_equivalents(conn)
+    yield conn
+    conn.close()
+
+
+def test_title_tokens_drop_qualifiers_and_continuations():
+    assert title_tokens("Air Data Module (ADM) (Cont'd)") == {"air", "data", "module", "air data", "data module"}
+    assert title_tokens("Pack Flow Control Valves") == title_tokens("Pack Flow Control Valve")
+
+
+def test_same_item_is_found_on_the_other_type(conn):
+    found = show_equivalents(conn, "A320", "21-51-01", "A330")
+    assert found[0]["itemNumber"] == "21-51-01" and found[0]["title"] == "Pack Flow Control Valves"
+    assert all(r["aircraftType"] == "A330" for r in found)
+
+
+def test_pairs_are_symmetric_cross_type_and_above_the_threshold(conn):
+    pairs = conn.execute('''
+        SELECT e.mmel_item_id, e.equivalent_item_id, e.similarity, a.aircraft_type, b.aircraft_type
+        FROM mmel_equivalents e
+        JOIN mmel_items a ON a.id = e.mmel_item_id
+        JOIN mmel_items b ON b.id = e.equivalent_item_id
+    ''').fetchall()
+    assert pairs
+    similarities = {(a, b): s for a, b, s, _, _ in pairs}
+    for a, b, similarity, first_type, second_type in pairs:
+        assert similarities[(b, a)] == similarity
+        assert first_type != second_type
+        assert DEFAULT_THRESHOLD <= similarity <= 1
+
+
+def test_groups_are_the_connected_components(conn):
+    groups = dict(conn.execute('SELECT mmel_item_id, group_id FROM mmel_equivalence_groups'))
+    pairs = conn.execute('SELECT mmel_item_id, equivalent_item_id FROM mmel_equivalents').fetchall()
+    assert set(groups) == {a for a, _ in pairs}
+
+    # Components by flooding the pair graph; a group is named by its smallest item id
+    neighbours = {}
+    for a, b in pairs:
+        neighbours.setdefault(a, set()).add(b)
+    seen = set()
+    for start in sorted(neighbours):
+        if start in seen:
+            continue
+        component, todo = set(), [start]
+        while todo:
+            item = todo.pop()
+            if item not in component:
+                component.add(item)
+                todo.extend(neighbours[item])
+        seen |= component
+        assert {groups[item] for item in component} == {min(component)}
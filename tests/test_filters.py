@@ -0,0 +1,87 @@
+"""Filter profiles: compiled matchers, `extends` chains and layered files"""
+import json
+
+import pytest
+
+from mmel_filters import DEFAULT_PROFILES_PATH, LineFilter, ProfileRegistry
+
+
+def _registry(tmp_path, *files):
+    registry = ProfileRegistry()
+    for n, data in enumerate(files):
+        path = tmp_path / f"profiles{n}.json"
+        path.write_text(json.dumps(data), encoding="utf-8")
+        registry.load(path)
+    return registry
+
+
+def test_line_filter_matches_prefixes_lines_and_substrings():
+    matches = LineFilter(prefixes=["PAGE NO.", "DATE:"], lines=["Item"], substrings=["thru"])
+    assert matches("PAGE NO. 21-3")
+    assert matches("DATE: 01/02/2020")
+    assert matches("Item")
+    assert matches("21-1 thru 21-6")
+    assert not matches("Items")
+    assert not matches("21-51-01 Pack Flow Control Valves")
+    assert not matches("")
+
+
+def test_empty_prefix_is_rejected():
+    with pytest.raises(ValueError):
+        LineFilter(prefixes=[""])
+
+
+def test_extends_inherits_parent_filters_and_toc(tmp_path):
+    registry = _registry(tmp_path, {"profiles": {
+        "base": {"prefixes": ["BANNER"], "lines": ["Item"], "toc": {"prefixes": ["TABLE OF CONTENTS"]}},
+        "family": {"extends": ["base"], "substrings": ["(Continued)"]},
+        "manual": {"extends": ["family"], "prefixes": ["Airbus"], "toc": {"lines": ["SYSTEM"]}},
+    }})
+    family = registry.get("family")
+    assert family.headers("BANNER text") and family.headers("Item") and family.headers("x (Continued)")
+    assert family.toc("TABLE OF CONTENTS")
+
+    manual = registry.get("manual")
+    assert manual.headers("BANNER text") and manual.headers("x (Continued)") and manual.headers("Airbus A330")
+    # A profile's own toc filter replaces the inherited one
+    assert manual.toc("SYSTEM") and not manual.toc("TABLE OF CONTENTS")
+    assert not registry.get("base").headers("Airbus A330")
+
+
+def test_extends_cycles_and_unknown_profiles_raise(tmp_path):
+    registry = _registry(tmp_path, {"profiles": {
+        "a": {"extends": ["b"]},
+        "b": {"extends": ["a"]},
+        "c": {"extends": ["missing"]},
+    }})
+    with pytest.raises(ValueError):
+        registry.get("a")
+    with pytest.raises(KeyError):
+        registry.get("c")
+    with pytest.raises(KeyError):
+        registry.get("missing")
+
+
+def test_later_files_override_profiles_and_aircraft_types(tmp_path):
+    registry = _registry(
+        tmp_path,
+        {"profiles": {"faa": {"prefixes": ["OLD"]}}, "aircraft_types": {"B737": "faa", "A330": "faa"}},
+        {"profiles": {"faa": {"prefixes": ["NEW"]}, "custom": {"lines": ["x"]}}, "aircraft_types": {"B737": "custom"}},
+    )
+    assert registry.get("faa").headers("NEW line") and not registry.get("faa").headers("OLD line")
+    assert registry.name_for("B737", "faa") == "custom"
+    assert registry.name_for("A330", "custom") == "faa"
+    assert registry.name_for("B767", "faa") == "faa"
+    assert registry.names() == ["custom", "faa"]
+
+
+def test_bundled_profiles_resolve():
+    registry = ProfileRegistry()
+    registry.load(DEFAULT_PROFILES_PATH)
+    for name in registry.names():
+        registry.get(name)
+    airbus = registry.get(registry.name_for("A330", "faa-common"))
+    assert airbus.headers("U.S. DEPARTMENT OF TRANSPORTATION") and airbus.headers("Airbus A330")
+    boeing = registry.get(registry.name_for("B767", "faa-common"))
+    assert boeing.headers("PAGE NO. 21-3") and not boeing.headers("Airbus A330")
+    assert registry.get(registry.name_for("B747-400", "faa-common")).toc("21-1 thru 21-6")
@@ -0,0 +1,45 @@
+"""Parses of bundled PDFs against the bundled outputs (the golden files)"""
+import json
+
+import pytest
+
+from mmel_parser import convert_pdf
+
+# One manual per parser, smallest first
+GOLDEN = [
+    ("B-737_MAX_Rev_6.pdf", "B38M", "B38MMMEL.json"),
+    ("B-747-8_Rev 7.pdf", "B748", "B748MMEL.json"),
+    ("A-380 R0.pdf", "A380", "A380MMEL.json"),
+]
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("pdf, aircraft_type, golden", GOLDEN)
+def test_parse_matches_golden(tmp_path, repo_file, pdf, aircraft_type, golden):
+    output = tmp_path / golden
+    count = convert_pdf(repo_file(pdf), str(output), aircraft_type)
+    assert _read(output) == _read(repo_file(golden))
+    assert count == len(json.loads(_read(output)))
+
+
+@pytest.mark.parametrize("options", [{"workers": 2}, {"stream": True}])
+def test_run_options_match_golden(tmp_path, repo_file, options):
+    output = tmp_path / "B38MMMEL.json"
+    convert_pdf(repo_file("B-737_MAX_Rev_6.pdf"), str(output), "B38M", **options)
+    assert _read(output) == _read(repo_file("B38MMMEL.json"))
+
+
+def test_jsonl_has_the_golden_entries(tmp_path, repo_file):
+    output = tmp_path / "B38M.jsonl"
+    convert_pdf(repo_file("B-737_MAX_Rev_6.pdf"), str(output), "B38M", jsonl=True)
+    with open(output, "r", encoding="utf-8") as f:
+        entries = [json.loads(line) for line in f]
+    assert entries == json.loads(_read(repo_file("B38MMMEL.json")))
+
+
+def test_bundled_b74f_is_the_b748_parse(repo_file):
+    assert _read(repo_file("B74FMMEL.json")) == _read(repo_file("B748MMEL.json"))
@@ -0,0 +1,56 @@
+"""Layout mode: table rows read from word coordinates"""
+import pytest
+
+from mmel_parser import iter_layout_entries
+
+
+def _entries(pdf, aircraft_type):
+    return [entry.to_dict() for entry in iter_layout_entries(pdf, aircraft_type)]
+
+
+@pytest.fixture(scope="module")
+def a380(repo_file):
+    return _entries(repo_file("A-380 R0.pdf"), "A380")
+
+
+@pytest.fixture(scope="module")
+def b747_400(repo_file):
+    return _entries(repo_file("B-747-400_Rev_32.pdf"), "B747-400")
+
+
+def _conditions(entries, item_number):
+    return [(e["title"], e["deferralCategory"], e["quantityInstalled"], e["quantityRequired"])
+            for e in entries if e["itemNumber"] == item_number]
+
+
+def test_a380_gives_one_entry_per_condition(a380):
+    assert len(a380) == 1122
+    assert _conditions(a380, "23-10-01") == [("HF System", "D", 2, 0), ("HF System", "C", 2, 1)]
+    hf = [e for e in a380 if e["itemNumber"] == "23-10-01"]
+    assert hf[0]["remarks"]["summary"].startswith("Any in excess of those required")
+    assert hf[1]["remarks"]["summary"].startswith("(O)One may be inoperative")
+
+
+def test_a380_repeated_item_number_on_one_page_is_two_items(a380):
+    assert _conditions(a380, "33-20-03") == [("NO SMOKING Sign AUTO Function", "D", 1, 0),
+                                             ("NO PORTABLE EQPT Sign AUTO Function", "D", 1, 0)]
+
+
+def test_b747_400_rows_carry_the_sub_item_outline(b747_400):
+    assert len(b747_400) == 1143
+    first = b747_400[0]
+    assert (first["ataChapter"], first["itemNumber"], first["title"], first["deferralCategory"]) == \
+        ("21", "21-20-01", "A/C Ozone Converters 1) Passenger/Combi", "C")
+    assert first["remarks"]["summary"] == "As required by 14 CFR."
+
+
+@pytest.mark.parametrize("entries", ["a380", "b747_400"])
+def test_page_furniture_stays_out_of_titles(request, entries):
+    for entry in request.getfixturevalue(entries):
+        assert entry["title"]
+        assert "(Cont" not in entry["title"] and "***" not in entry["title"]
+
+
+def test_formats_without_a_template_are_rejected(repo_file):
+    with pytest.raises(ValueError):
+        next(iter_layout_entries(repo_file("B-737_MAX_Rev_6.pdf"), "B38M"))
@@ -0,0 +1,41 @@
+"""Load test clients survive connections the server drops"""
+import asyncio
+
+from mmel_loadtest import run_load
+
+RESPONSE = b"HTTP/1.1 200 OK\r\nContent-Length: 2\r\n\r\n{}"
+
+
+def test_dropped_connections_are_counted_and_reopened():
+    async def handle(reader, writer):
+        # One answer, then the next request is cut off
+        await reader.readuntil(b"\r\n\r\n")
+        writer.write(RESPONSE)
+        await writer.drain()
+        await reader.readuntil(b"\r\n\r\n")
+        writer.close()
+
+    async def main():
+        server = await asyncio.start_server(handle, "127.0.0.1", 0)
+        try:
+            return await run_load("127.0.0.1", server.sockets[0].getsockname()[1], ["/summary"], 2, 0.3)
+        finally:
+            server.close()
+            await server.wait_closed()
+
+    result = asyncio.run(main())
+    assert result["requests"] == result["statuses"][200] > 2
+    assert result["statuses"]["errors"] >= result["requests"] - 2
+
+
+def test_refused_connections_end_the_client():
+    async def main():
+        server = await asyncio.start_server(lambda r, w: None, "127.0.0.1", 0)
+        port = server.sockets[0].getsockname()[1]
+        server.close()
+        await server.wait_closed()
+        return await run_load("127.0.0.1", port, ["/summary"], 3, 5.0)
+
+    result = asyncio.run(main())
+    assert result["requests"] == 0 and result["statuses"] == {"errors": 3}
+    assert result["seconds"] < 5.0
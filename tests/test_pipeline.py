@@ -0,0 +1,32 @@
+"""Overlapped pipeline output against convert_pdf"""
+import pytest
+
+from mmel_parser import convert_pdf
+from mmel_pipeline import run_pipeline
+
+MANUALS = [("B-767_Rev_41.pdf", "B767"), ("A-380 R0.pdf", "A380")]
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return f.read()
+
+
+@pytest.mark.parametrize("pdf, aircraft_type", MANUALS)
+@pytest.mark.parametrize("jsonl", [False, True])
+def test_pipeline_output_is_byte_identical(tmp_path, repo_file, pdf, aircraft_type, jsonl):
+    expected, output = tmp_path / "convert.json", tmp_path / "pipeline.json"
+    count = convert_pdf(repo_file(pdf), str(expected), aircraft_type, jsonl=jsonl)
+    result = run_pipeline(repo_file(pdf), str(output), aircraft_type, jsonl=jsonl)
+    assert result["entries"] == count
+    assert _read(output) == _read(expected)
+
+
+def test_small_queues_only_slow_it_down(tmp_path, repo_file):
+    # Every stage blocks on its neighbours again and again
+    expected, output = tmp_path / "convert.json", tmp_path / "pipeline.json"
+    convert_pdf(repo_file("B-737_MAX_Rev_6.pdf"), str(expected), "B38M")
+    result = run_pipeline(repo_file("B-737_MAX_Rev_6.pdf"), str(output), "B38M",
+                          page_queue_size=1, batch_size=3, batch_queue_size=1)
+    assert _read(output) == _read(expected)
+    assert [stage["stage"] for stage in result["stages"]] == ["extract", "parse", "write"]
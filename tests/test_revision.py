@@ -0,0 +1,76 @@
+"""Chapter-level re-parse of a new revision against a full parse of it"""
+import json
+import shutil
+
+import fitz  # PyMuPDF
+import pytest
+
+from mmel_parser import convert_pdf
+from mmel_revision import sidecar_path, update_revision
+
+PDF = "B-737_MAX_Rev_6.pdf"
+AIRCRAFT_TYPE = "B38M"
+GOLDEN = "B38MMMEL.json"
+
+
+def _delete_page(doc):
+    doc.delete_page(60)
+
+
+def _edit_page(doc):
+    doc[100].insert_text((320, 420), "(M) Revised remark for the test revision.", fontsize=9)
+
+
+def _insert_page(doc):
+    # An inserted continuation page, inside its own chapter: the merge
+    # keeps chapters contiguous, as revisions do
+    doc.fullcopy_page(80, 81)
+
+
+def _load(path):
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def previous(tmp_path, repo_file):
+    """The bundled output as the previous revision, without a sidecar"""
+    path = tmp_path / "previous.json"
+    shutil.copy(repo_file(GOLDEN), path)
+    return str(path)
+
+
+def test_unchanged_revision_reparses_nothing(tmp_path, repo_file, previous):
+    output = tmp_path / "new.json"
+    report = update_revision(repo_file(PDF), previous, str(output), AIRCRAFT_TYPE, previous_pdf=repo_file(PDF))
+    assert report["reparsedChapters"] == []
+    assert report["changedPages"] == []
+    assert _load(output) == _load(previous)
+
+
+@pytest.mark.parametrize("change", [_delete_page, _edit_page, _insert_page])
+def test_chapter_reparse_matches_full_parse(tmp_path, repo_file, previous, change):
+    revised = tmp_path / "revised.pdf"
+    with fitz.open(repo_file(PDF)) as doc:
+        change(doc)
+        doc.save(str(revised))
+
+    output = tmp_path / "new.json"
+    report = update_revision(str(revised), previous, str(output), AIRCRAFT_TYPE, previous_pdf=repo_file(PDF))
+    full = tmp_path / "full.json"
+    convert_pdf(str(revised), str(full), AIRCRAFT_TYPE)
+
+    assert report["reparsedChapters"]
+    assert report["pagesExtracted"] < report["totalPages"]
+    assert _load(output) == _load(full)
+
+
+def test_sidecar_is_reused_for_the_next_revision(tmp_path, repo_file, previous):
+    first = tmp_path / "first.json"
+    update_revision(repo_file(PDF), previous, str(first), AIRCRAFT_TYPE, previous_pdf=repo_file(PDF))
+    assert _load(sidecar_path(str(first)))["pages"]
+
+    second = tmp_path / "second.json"
+    report = update_revision(repo_file(PDF), str(first), str(second), AIRCRAFT_TYPE)
+    assert report["pagesExtracted"] == 0
+    assert _load(second) == _load(first)
@@ -0,0 +1,43 @@
+"""Full-text search CLI errors"""
+import contextlib
+import io
+
+import pytest
+
+import search_mmel
+from create_enhanced_database import (
+    bulk_insert_enhanced_mmel_data, create_enhanced_mmel_database, create_search_index,
+)
+
+
+@pytest.fixture(scope="module")
+def db_path(tmp_path_factory, repo_file):
+    path = str(tmp_path_factory.mktemp("search") / "mmel_db.db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn = create_enhanced_mmel_database(path)
+        bulk_insert_enhanced_mmel_data(conn, repo_file("B38MMMEL.json"))
+        create_search_index(conn)
+    conn.close()
+    return path
+
+
+def test_queries(db_path, capsys):
+    assert search_mmel.main("pack", db_path=db_path) == 0
+    assert "items in" in capsys.readouterr().out
+    assert search_mmel.main("pack AND", db_path=db_path, raw=True) == 1
+    assert capsys.readouterr().out.startswith("❌ Invalid search syntax")
+
+
+def test_database_without_an_index(tmp_path, capsys):
+    path = str(tmp_path / "mmel_db.db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        create_enhanced_mmel_database(path).close()
+    assert search_mmel.main("pack", db_path=path) == 1
+    assert "has no search index" in capsys.readouterr().out
+
+
+def test_missing_database_is_not_created(tmp_path, capsys):
+    path = tmp_path / "mmel_db.db"
+    assert search_mmel.main("pack", db_path=str(path)) == 1
+    assert "Database not found" in capsys.readouterr().out
+    assert not path.exists()
@@ -0,0 +1,109 @@
+"""Lookup service endpoints, errors and cache invalidation"""
+import asyncio
+import contextlib
+import io
+import json
+import sqlite3
+
+import pytest
+
+from create_enhanced_database import (
+    bulk_insert_enhanced_mmel_data, create_enhanced_mmel_database, update_enhanced_aircraft_summary,
+)
+from mmel_service import MMELService, ReadOnlyPool
+
+JSON_FILE = "B38MMMEL.json"
+
+
+@pytest.fixture
+def db_path(tmp_path, repo_file):
+    path = str(tmp_path / "mmel_db.db")
+    with contextlib.redirect_stdout(io.StringIO()):
+        conn = create_enhanced_mmel_database(path)
+        bulk_insert_enhanced_mmel_data(conn, repo_file(JSON_FILE))
+        update_enhanced_aircraft_summary(conn)
+    conn.close()
+    return path
+
+
+async def _request(port, raw: bytes):
+    """(status, decoded JSON body) of one raw request on its own connection"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    try:
+        writer.write(raw)
+        await writer.drain()
+        head = await reader.readuntil(b"\r\n\r\n")
+        lines = head.decode("latin-1").split("\r\n")
+        headers = dict(line.split(": ", 1) for line in lines[1:] if line)
+        body = await reader.readexactly(int(headers["Content-Length"]))
+        return int(lines[0].split()[1]), json.loads(body)
+    finally:
+        writer.close()
+
+
+def _get(path):
+    return f"GET {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n\r\n".encode("ascii")
+
+
+def _serve(db_path, session):
+    """Run session(service, port) against a service on a free port"""
+    async def main():
+        service = MMELService(db_path, pool_size=2)
+        service.pool = ReadOnlyPool(db_path, 2)
+        server = await asyncio.start_server(service.handle, "127.0.0.1", 0)
+        try:
+            return await session(service, server.sockets[0].getsockname()[1])
+        finally:
+            server.close()
+            await server.wait_closed()
+            service.pool.close()
+    return asyncio.run(main())
+
+
+def test_endpoints_return_the_database_rows(db_path, repo_file):
+    with open(repo_file(JSON_FILE), "r", encoding="utf-8") as f:
+        entries = json.load(f)
+    entry = entries[0]
+    chapter = [e for e in entries if e["ataChapter"] == entry["ataChapter"]]
+
+    async def session(service, port):
+        return [await _request(port, _get(path)) for path in (
+            f"/items/B38M/{entry['itemNumber']}", f"/chapters/B38M/{entry['ataChapter']}",
+            "/summary", "/summary/B38M")]
+
+    (status, item), (_, listed), (_, summary), (_, one) = _serve(db_path, session)
+    assert status == 200
+    assert [{k: v for k, v in found.items() if k != "sequenceNumber"} for found in item] == \
+        [e for e in entries if e["itemNumber"] == entry["itemNumber"]]
+    assert [(e["itemNumber"], e["title"]) for e in listed] == [(e["itemNumber"], e["title"]) for e in chapter]
+    assert [row["aircraft_type"] for row in summary] == ["B38M"]
+    assert one == summary[0] and one["total_items"] == len(entries)
+
+
+def test_errors(db_path):
+    async def session(service, port):
+        return [await _request(port, raw) for raw in (
+            _get("/items/B38M/99-99-99"), _get("/summary/B999"), _get("/nowhere"),
+            b"POST /summary HTTP/1.1\r\nConnection: close\r\n\r\n", b"GET\r\n\r\n",
+            b"GET /summary HTTP/1.1\r\nContent-Length: many\r\n\r\n",
+            b"GET /summary HTTP/1.1\r\nContent-Length: -5\r\n\r\n")]
+
+    statuses = [status for status, _ in _serve(db_path, session)]
+    assert statuses == [404, 404, 404, 405, 400, 400, 400]
+
+
+def test_cached_responses_follow_database_changes(db_path):
+    async def session(service, port):
+        before = await _request(port, _get("/summary/B38M"))
+        again = await _request(port, _get("/summary/B38M"))
+        hits = service.cache.hits
+        conn = sqlite3.connect(db_path)
+        conn.execute("UPDATE aircraft_summary SET total_items = -1 WHERE aircraft_type = 'B38M'")
+        conn.commit()
+        conn.close()
+        after = await _request(port, _get("/summary/B38M"))
+        return before, again, hits, after
+
+    before, again, hits, after = _serve(db_path, session)
+    assert again == before and hits == 1
+    assert after[1]["total_items"] == -1
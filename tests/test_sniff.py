@@ -0,0 +1,49 @@
+"""Format and aircraft type sniffing from the first item pages"""
+import pytest
+
+from mmel_sniff import MIN_CONFIDENCE, check_aircraft_type, detect_aircraft_type, sniff_pdf
+
+DETECTED = [
+    ("A-330_Rev_22.pdf", "A330", "faa"),
+    ("A-380 R0.pdf", "A380", "a380"),
+    ("B-737_MAX_Rev_6.pdf", "B38M", "faa"),
+    ("B-737_Rev_62.pdf", "B737", "faa"),
+    ("B-747-8_Rev 7.pdf", "B748", "faa"),
+    ("B-767_Rev_41.pdf", "B767", "faa"),
+    ("B-777_Rev_23a.pdf", "B777", "faa"),
+    ("B787_Rev_19_5_20_2025.pdf", "B787", "faa"),
+]
+
+# Their "31-1" sequence numbers sit alone on a line that no grammar reads as an item
+UNPARSED = ["B-747-400_Rev_32.pdf", "B-747-400LCF_Rev 3.pdf"]
+
+
+@pytest.mark.parametrize("pdf, aircraft_type, grammar", DETECTED)
+def test_detects_type_and_grammar(repo_file, pdf, aircraft_type, grammar):
+    result = detect_aircraft_type(repo_file(pdf))
+    assert (result["aircraft_type"], result["grammar"]) == (aircraft_type, grammar)
+    assert result["confidence"] >= MIN_CONFIDENCE
+    assert result["item_lines"][grammar] > 0
+
+
+@pytest.mark.parametrize("pdf", UNPARSED)
+def test_unparsed_format_is_not_guessed(repo_file, pdf):
+    result = sniff_pdf(repo_file(pdf))
+    assert result["header_type"] == "B747-400"
+    assert result["confidence"] == 0
+    with pytest.raises(ValueError, match="best guess B747-400"):
+        detect_aircraft_type(repo_file(pdf))
+
+
+def test_check_aircraft_type(repo_file):
+    assert check_aircraft_type(repo_file("B-767_Rev_41.pdf"), "B767") is None
+    # Same grammar, other type: the parser fits
+    assert check_aircraft_type(repo_file("B-767_Rev_41.pdf"), "B777") is None
+    assert "looks like A380" in check_aircraft_type(repo_file("A-380 R0.pdf"), "B767")
+    assert "looks like B767" in check_aircraft_type(repo_file("B-767_Rev_41.pdf"), "A380")
+
+
+def test_check_requires_items_unless_layout(repo_file):
+    pdf = repo_file("B-747-400_Rev_32.pdf")
+    assert "reads no item number" in check_aircraft_type(pdf, "B747-400")
+    assert check_aircraft_type(pdf, "B747-400", require_items=False) is None